@@ -1,15 +1,24 @@
 # adapter_logging.py
 from __future__ import annotations
+import atexit
 import logging
+import logging.handlers
+import queue
+import sys
+import threading
 from abc import ABC, abstractmethod
+from typing import Dict
 
 class AppLogger(ABC):
+    """Mensagens no estilo %: logger.info("Sala %s criada", nome); args só são formatados se o nível estiver ativo."""
     @abstractmethod
-    def info(self, msg: str): ...
+    def info(self, msg: str, *args): ...
     @abstractmethod
-    def warning(self, msg: str): ...
+    def warning(self, msg: str, *args): ...
     @abstractmethod
-    def error(self, msg: str): ...
+    def error(self, msg: str, *args): ...
+
+_FORMATO = "[%(levelname)s] %(asctime)s - %(message)s"
 
 class PythonLoggingAdapter(AppLogger):
     """Adapter que converte nossa interface AppLogger na lib 'logging' do Python."""
@@ -17,11 +26,145 @@ class PythonLoggingAdapter(AppLogger):
         self._logger = logging.getLogger(name)
         if not self._logger.handlers:
             handler = logging.StreamHandler()
-            fmt = logging.Formatter("[%(levelname)s] %(asctime)s - %(message)s")
+            fmt = logging.Formatter(_FORMATO)
             handler.setFormatter(fmt)
             self._logger.addHandler(handler)
             self._logger.setLevel(logging.INFO)
 
-    def info(self, msg: str): self._logger.info(msg)
-    def warning(self, msg: str): self._logger.warning(msg)
-    def error(self, msg: str): self._logger.error(msg)
+    def info(self, msg: str, *args): self._logger.info(msg, *args)
+    def warning(self, msg: str, *args): self._logger.warning(msg, *args)
+    def error(self, msg: str, *args): self._logger.error(msg, *args)
+
+# ---------- Logging fora do caminho da requisição ----------
+class _FilaHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que NÃO formata no thread chamador (o padrão chama format() em prepare())
+    e aplica a política da fila limitada quando ela enche.
+    """
+    def __init__(self, fila: queue.Queue, politica: str, adapter: "QueueLoggingAdapter"):
+        super().__init__(fila)
+        self.politica = politica
+        self.adapter = adapter
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record   # msg + args seguem intactos; a formatação acontece no listener
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.politica == "bloquear":
+            self.queue.put(record)                 # backpressure: o chamador espera vaga
+            return
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if self.politica == "descartar_antigos":
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+        self.adapter._contar("descartadas")
+
+class _StreamEmLote(logging.StreamHandler):
+    """Acumula linhas já formatadas e as grava com um único write() por lote."""
+    def __init__(self, stream=None, lote: int = 64):
+        super().__init__(stream)
+        self.lote = lote
+        self._buffer: list[str] = []
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self._buffer.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self._buffer) >= self.lote:
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self._buffer and self.stream:
+                self.stream.write(self.terminator.join(self._buffer) + self.terminator)
+                self._buffer.clear()
+            super().flush()
+        finally:
+            self.release()
+
+class _OuvinteEmLote(logging.handlers.QueueListener):
+    """QueueListener que descarrega os handlers quando a fila esvazia (fim de rajada)."""
+    def handle(self, record: logging.LogRecord):
+        super().handle(record)
+        if self.queue.empty():
+            for h in self.handlers:
+                h.flush()
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)   # com a fila cheia, put_nowait perderia o sentinela
+
+class QueueLoggingAdapter(AppLogger):
+    """
+    AppLogger assíncrono: o chamador só testa o nível, aplica a amostragem e enfileira
+    o LogRecord (msg + args crus); formatação e escrita ficam num thread do QueueListener.
+
+    politica (fila cheia): "descartar_novos" (padrão), "descartar_antigos" ou "bloquear".
+    amostragem: {template: N} registra 1 a cada N mensagens daquele template, ex.:
+        {"Tentativa de login: %s -> %s": 10}
+    """
+    POLITICAS = ("descartar_novos", "descartar_antigos", "bloquear")
+
+    def __init__(self, name: str = "reserva_logger", tamanho_fila: int = 10_000, politica: str = "descartar_novos",
+                 lote: int = 64, amostragem: Dict[str, int] | None = None, stream=None):
+        if politica not in self.POLITICAS:
+            raise ValueError(f"Política de fila desconhecida: {politica}")
+        self._logger = logging.getLogger(name)
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        self._amostragem = dict(amostragem or {})
+        self._vistas: Dict[str, int] = {}
+        self._contadores = {"emitidas": 0, "descartadas": 0, "fora_da_amostra": 0}
+        self._lock = threading.Lock()
+
+        self._fila: queue.Queue = queue.Queue(maxsize=tamanho_fila)
+        destino = _StreamEmLote(stream or sys.stderr, lote=lote)
+        destino.setFormatter(logging.Formatter(_FORMATO))
+        self._handler = _FilaHandler(self._fila, politica, self)
+        for h in list(self._logger.handlers):
+            self._logger.removeHandler(h)
+        self._logger.addHandler(self._handler)
+        self._listener = _OuvinteEmLote(self._fila, destino)
+        self._listener.start()
+        atexit.register(self.fechar)
+
+    def _contar(self, chave: str):
+        with self._lock:
+            self._contadores[chave] += 1
+
+    def _log(self, nivel: int, msg: str, args: tuple):
+        if not self._logger.isEnabledFor(nivel):
+            return
+        n = self._amostragem.get(msg)
+        if n and n > 1:
+            with self._lock:
+                visto = self._vistas[msg] = self._vistas.get(msg, 0) + 1
+            if (visto - 1) % n:
+                self._contar("fora_da_amostra")
+                return
+        self._contar("emitidas")
+        self._logger.log(nivel, msg, *args)
+
+    def info(self, msg: str, *args): self._log(logging.INFO, msg, args)
+    def warning(self, msg: str, *args): self._log(logging.WARNING, msg, args)
+    def error(self, msg: str, *args): self._log(logging.ERROR, msg, args)
+
+    def fechar(self):
+        """Esvazia a fila e encerra o thread de escrita (chamado também no atexit)."""
+        if self._listener._thread is not None:
+            self._listener.stop()
+            for h in self._listener.handlers:
+                h.flush()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._contadores, pendentes=self._fila.qsize())
@@ -0,0 +1,224 @@
+# analytics.py — motor analítico colunar (NumPy) sobre as reservas
+#
+# As reservas são exportadas para colunas NumPy (sala_id, usuário, data, início,
+# fim, ativa). Com DAOs que aceitam observadores (RAM), as mudanças chegam por
+# evento e são aplicadas em lote no próximo atualizar(); nos demais (SQLite) as
+# colunas são recarregadas de list_all(). Os relatórios são operações vetorizadas
+# (bincount, unique, máscaras) em vez de laços Python sobre objetos Reserva.
+import threading
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from repository import ReservaDAO, EntradaReserva, ObservadorReservas
+
+_EPOCA_ORD = date(1970, 1, 1).toordinal()
+
+class AnaliseReservas(ObservadorReservas):
+    def __init__(self, reserva_dao: ReservaDAO, hora_abertura: int = 7, hora_fechamento: int = 22):
+        self.rdao = reserva_dao
+        self.abertura = hora_abertura * 60
+        self.fechamento = hora_fechamento * 60
+        self._logins: List[str] = []
+        self._codigo_login: Dict[str, int] = {}
+        self._linha: Dict[int, int] = {}                      # reserva_id -> linha
+        self._pendentes: Dict[int, Optional[EntradaReserva]] = {}  # None = removida
+        self._n = 0
+        self._lock = threading.Lock()   # eventos chegam do thread que escreve no DAO
+        self._alocar(1024)
+        self._incremental = hasattr(reserva_dao, "inscrever")
+        if self._incremental:
+            reserva_dao.inscrever(self)
+
+    # ---- Armazenamento colunar ----
+    def _alocar(self, capacidade: int) -> None:
+        antigas = getattr(self, "_cols", None)
+        self._cols = {
+            "sala": np.zeros(capacidade, np.int32),
+            "usuario": np.zeros(capacidade, np.int32),
+            "data": np.zeros(capacidade, np.int32),
+            "inicio": np.zeros(capacidade, np.int16),
+            "fim": np.zeros(capacidade, np.int16),
+            "ativa": np.zeros(capacidade, np.bool_),
+            "valida": np.zeros(capacidade, np.bool_),   # False = linha de reserva removida
+        }
+        if antigas is not None:
+            for nome, col in antigas.items():
+                self._cols[nome][:self._n] = col[:self._n]
+
+    def _codigo(self, login: str) -> int:
+        cod = self._codigo_login.get(login)
+        if cod is None:
+            cod = self._codigo_login[login] = len(self._logins)
+            self._logins.append(login)
+        return cod
+
+    # ---- ObservadorReservas: só enfileira; o trabalho é feito em lote em atualizar() ----
+    def reserva_indexada(self, e: EntradaReserva) -> None:
+        with self._lock:
+            self._pendentes[e.reserva_id] = e
+
+    def reserva_desindexada(self, e: EntradaReserva) -> None:
+        with self._lock:
+            self._pendentes[e.reserva_id] = None
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._limpar()
+
+    def _limpar(self) -> None:
+        self._linha.clear()
+        self._pendentes.clear()
+        self._n = 0
+        self._cols["valida"][:] = False
+
+    def _recarregar(self) -> None:
+        reservas = self.rdao.list_all()
+        with self._lock:
+            self._limpar()
+            for r in reservas:
+                self._pendentes[r.reserva_id] = EntradaReserva(r.reserva_id, r.login, r.sala_id,
+                                                               r.data_ord, r.inicio_min, r.fim_min, r.status == 'ativa')
+
+    def atualizar(self) -> None:
+        """Aplica as mudanças pendentes nas colunas (ou recarrega, se o DAO não tiver observadores)."""
+        if not self._incremental:
+            self._recarregar()
+        with self._lock:
+            self._aplicar_pendentes()
+
+    def _aplicar_pendentes(self) -> None:
+        if not self._pendentes:
+            return
+        linhas, entradas = [], []
+        for rid, e in self._pendentes.items():
+            linha = self._linha.get(rid)
+            if e is None:
+                if linha is not None:
+                    self._cols["valida"][linha] = False
+                    del self._linha[rid]
+                continue
+            if linha is None:
+                linha = self._linha[rid] = self._n
+                self._n += 1
+            linhas.append(linha)
+            entradas.append(e)
+        self._pendentes.clear()
+        if self._n > len(self._cols["sala"]):
+            self._alocar(max(self._n, 2 * len(self._cols["sala"])))
+        if entradas:
+            idx = np.fromiter(linhas, np.int64, len(linhas))
+            c = self._cols
+            c["sala"][idx] = [e.sala_id for e in entradas]
+            c["usuario"][idx] = [self._codigo(e.login) for e in entradas]
+            c["data"][idx] = [e.data_ord for e in entradas]
+            c["inicio"][idx] = [e.inicio_min for e in entradas]
+            c["fim"][idx] = [e.fim_min for e in entradas]
+            c["ativa"][idx] = [e.ativa for e in entradas]
+            c["valida"][idx] = True
+
+    def colunas(self, data_inicio: int | None = None, data_fim: int | None = None,
+                apenas_ativas: bool = True) -> Dict[str, np.ndarray]:
+        """Cópia das colunas filtradas (datas como ordinais, intervalo fechado)."""
+        self.atualizar()
+        with self._lock:
+            c = {nome: col[:self._n] for nome, col in self._cols.items()}
+            filtro = c["valida"].copy()
+            if apenas_ativas:
+                filtro &= c["ativa"]
+            if data_inicio is not None:
+                filtro &= c["data"] >= data_inicio
+            if data_fim is not None:
+                filtro &= c["data"] <= data_fim
+            return {nome: col[filtro] for nome, col in c.items()}
+
+    # ---- Relatórios ----
+    def _minutos_no_horario(self, c: Dict[str, np.ndarray]) -> np.ndarray:
+        ini = np.maximum(c["inicio"].astype(np.int32), self.abertura)
+        fim = np.minimum(c["fim"].astype(np.int32), self.fechamento)
+        return np.clip(fim - ini, 0, None)
+
+    def taxa_ocupacao_por_sala(self, data_inicio: int, data_fim: int) -> Dict[int, float]:
+        """Minutos reservados / minutos de funcionamento no período, por sala_id."""
+        c = self.colunas(data_inicio, data_fim)
+        if not len(c["sala"]):
+            return {}
+        minutos = np.bincount(c["sala"], weights=self._minutos_no_horario(c))
+        disponivel = (data_fim - data_inicio + 1) * (self.fechamento - self.abertura)
+        salas = np.nonzero(minutos)[0]
+        return {int(s): float(minutos[s] / disponivel) for s in salas}
+
+    def mapa_calor_horas(self, data_inicio: int | None = None, data_fim: int | None = None) -> Dict[int, List[int]]:
+        """Minutos ocupados em cada hora do dia (0..23), por sala_id."""
+        c = self.colunas(data_inicio, data_fim)
+        if not len(c["sala"]):
+            return {}
+        ini, fim = c["inicio"].astype(np.int32), c["fim"].astype(np.int32)
+        tamanho = int(c["sala"].max()) + 1
+        matriz = np.zeros((tamanho, 24), np.int64)
+        for h in range(24):
+            sobreposicao = np.clip(np.minimum(fim, (h + 1) * 60) - np.maximum(ini, h * 60), 0, None)
+            matriz[:, h] = np.bincount(c["sala"], weights=sobreposicao, minlength=tamanho)
+        return {int(s): matriz[s].tolist() for s in np.unique(c["sala"])}
+
+    def horario_de_pico(self, data_inicio: int | None = None, data_fim: int | None = None) -> Tuple[int, int] | None:
+        """(hora do dia, minutos ocupados somando todas as salas) com maior ocupação."""
+        return _pico(self.mapa_calor_horas(data_inicio, data_fim))
+
+    def utilizacao_por_usuario_mes(self, data_inicio: int | None = None,
+                                   data_fim: int | None = None) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """{login: {"AAAA-MM": {"reservas": n, "minutos": m}}} das reservas ativas."""
+        c = self.colunas(data_inicio, data_fim)
+        if not len(c["sala"]):
+            return {}
+        meses = (c["data"].astype(np.int64) - _EPOCA_ORD).astype("datetime64[D]").astype("datetime64[M]")
+        mes_idx = meses.astype(np.int64)
+        chaves, inversa = np.unique(np.stack([c["usuario"].astype(np.int64), mes_idx]), axis=1, return_inverse=True)
+        inversa = inversa.ravel()
+        qtd = np.bincount(inversa)
+        minutos = np.bincount(inversa, weights=(c["fim"].astype(np.int32) - c["inicio"].astype(np.int32)))
+        rel: Dict[str, Dict[str, Dict[str, int]]] = {}
+        for k in range(chaves.shape[1]):
+            login = self._logins[int(chaves[0, k])]
+            mes = str(np.datetime64(int(chaves[1, k]), "M"))
+            rel.setdefault(login, {})[mes] = {"reservas": int(qtd[k]), "minutos": int(minutos[k])}
+        return rel
+
+    def relatorio(self, data_inicio: int, data_fim: int) -> Dict[str, object]:
+        return {
+            "taxa_ocupacao": self.taxa_ocupacao_por_sala(data_inicio, data_fim),
+            "mapa_calor_horas": self.mapa_calor_horas(data_inicio, data_fim),
+            "horario_de_pico": self.horario_de_pico(data_inicio, data_fim),
+            "utilizacao_usuario_mes": self.utilizacao_por_usuario_mes(data_inicio, data_fim),
+        }
+
+def _pico(calor: Dict[int, List[int]]) -> Tuple[int, int] | None:
+    if not calor:
+        return None
+    total = np.sum(np.array(list(calor.values())), axis=0)
+    hora = int(np.argmax(total))
+    return hora, int(total[hora])
+
+def combinar_relatorios(partes: List[Dict[str, object]]) -> Dict[str, object]:
+    """
+    Junta os relatórios de partições com salas disjuntas (modo particionado):
+    taxa e mapa de calor são por sala, a utilização por usuário/mês é somada e o
+    horário de pico é recalculado sobre o mapa completo.
+    """
+    taxa: Dict[int, float] = {}
+    calor: Dict[int, List[int]] = {}
+    uso: Dict[str, Dict[str, Dict[str, int]]] = {}
+    for p in partes:
+        taxa.update(p["taxa_ocupacao"])
+        calor.update(p["mapa_calor_horas"])
+        for login, meses in p["utilizacao_usuario_mes"].items():
+            for mes, v in meses.items():
+                soma = uso.setdefault(login, {}).setdefault(mes, {"reservas": 0, "minutos": 0})
+                soma["reservas"] += v["reservas"]
+                soma["minutos"] += v["minutos"]
+    calor = dict(sorted(calor.items()))
+    return {
+        "taxa_ocupacao": dict(sorted(taxa.items())),
+        "mapa_calor_horas": calor,
+        "horario_de_pico": _pico(calor),
+        "utilizacao_usuario_mes": uso,
+    }
@@ -0,0 +1 @@
+# benchmarks — scripts de carga/medição (executar a partir da raiz: python -m benchmarks.<nome>)
@@ -0,0 +1,104 @@
+# benchmarks/carga_http.py — gerador de carga para o servidor_http
+#
+#   python -m benchmarks.carga_http --conexoes 32 --pedidos 200 --pipeline 4
+#   python -m benchmarks.carga_http --host 127.0.0.1 --porta 8080   (servidor já rodando)
+#
+# Sem --porta sobe um servidor no próprio processo (porta efêmera). Cada conexão
+# usa um usuário próprio e mistura consultas de disponibilidade com criação e
+# cancelamento de reservas; com --pipeline N envia N pedidos antes de ler as
+# respostas. Mede latência por pedido (p50/p90/p99/máx) e vazão total.
+import argparse
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.medicao import criar_fachada, percentil
+from cliente_http import ConexaoAssincrona
+
+DATAS = [f"2025-04-{d:02d}" for d in range(1, 29)]
+
+def _servidor_local(historico: str, backend: str) -> int:
+    from servidor_http import ServidorHTTP
+
+    controller = criar_fachada(modo_historico=historico, backend=backend,
+                               backend_opcoes={"caminho": ":memory:"} if backend == "sqlite" else None)
+    servidor = ServidorHTTP(controller, porta=0)
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(servidor.iniciar())
+    threading.Thread(target=loop.run_until_complete, args=(servidor.servir(),), daemon=True).start()
+    return servidor.porta
+
+async def _preparar(host: str, porta: int, conexoes: int, salas: int):
+    admin = await ConexaoAssincrona(host, porta).abrir()
+    await admin.login("admin", "admin")
+    existentes = (await admin.requisitar("GET", "/admin/salas"))[1]
+    for i in range(len(existentes), salas):
+        await admin.requisitar("POST", "/admin/salas", {"nome": f"Carga {i}", "capacidade": 10, "recursos": []})
+    for i in range(conexoes):
+        await admin.requisitar("POST", "/usuarios", {"nome": f"carga{i}", "login": f"carga{i}", "senha": "x"})
+    await admin.fechar()
+
+async def _cliente(host: str, porta: int, i: int, pedidos: int, profundidade: int, salas: int,
+                   fracao_escrita: float, latencias: List[float], status: dict):
+    rnd = random.Random(i)
+    con = await ConexaoAssincrona(host, porta).abrir()
+    await con.login(f"carga{i}", "x")
+    feitos = 0
+    while feitos < pedidos:
+        lote = []
+        for _ in range(min(profundidade, pedidos - feitos)):
+            if rnd.random() < fracao_escrita:
+                h = rnd.randint(7, 20)
+                lote.append(("POST", "/reservas", {"sala_id": rnd.randint(1, salas), "data": rnd.choice(DATAS),
+                                                   "hora_inicio": f"{h:02d}:00", "hora_fim": f"{h + 1:02d}:00"}))
+            else:
+                lote.append(("GET", f"/disponibilidade?data={rnd.choice(DATAS)}", None))
+        t = time.perf_counter()
+        respostas = await con.pipeline(lote)
+        dt = (time.perf_counter() - t) / len(lote)   # latência média do lote, por pedido
+        latencias.extend([dt] * len(lote))
+        for st, corpo in respostas:
+            status[st] = status.get(st, 0) + 1
+            if st == 201 and rnd.random() < 0.7:     # cancela a maioria p/ não travar no limite de ativas
+                await con.requisitar("DELETE", f"/reservas/{corpo['reserva_id']}")
+        feitos += len(lote)
+    await con.fechar()
+
+async def _carga(a, porta: int):
+    await _preparar(a.host, porta, a.conexoes, a.salas)
+    latencias: List[float] = []
+    status: dict = {}
+    inicio = time.perf_counter()
+    await asyncio.gather(*(_cliente(a.host, porta, i, a.pedidos, a.pipeline, a.salas, a.escrita, latencias, status)
+                           for i in range(a.conexoes)))
+    duracao = time.perf_counter() - inicio
+    ms = [x * 1000 for x in latencias]
+    print(f"{len(ms)} pedidos em {duracao:.2f}s -> {len(ms) / duracao:.0f} req/s "
+          f"({a.conexoes} conexões, pipeline {a.pipeline})")
+    print(f"latência ms: p50={percentil(ms, 50):.2f} p90={percentil(ms, 90):.2f} "
+          f"p99={percentil(ms, 99):.2f} máx={max(ms):.2f}")
+    print("status:", dict(sorted(status.items())))
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Gerador de carga HTTP do sistema de reservas.")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--porta", type=int, help="servidor já em execução; sem isto sobe um local")
+    p.add_argument("--conexoes", type=int, default=16)
+    p.add_argument("--pedidos", type=int, default=200, help="pedidos por conexão")
+    p.add_argument("--pipeline", type=int, default=1)
+    p.add_argument("--salas", type=int, default=32)
+    p.add_argument("--escrita", type=float, default=0.3, help="fração de pedidos que criam reserva")
+    p.add_argument("--backend", default="ram", choices=["ram", "sqlite"])
+    p.add_argument("--historico", default="delta", choices=["delta", "snapshot"])
+    a = p.parse_args(argv)
+    porta = a.porta or _servidor_local(a.historico, a.backend)
+    asyncio.run(_carga(a, porta))
+
+if __name__ == "__main__":
+    main()
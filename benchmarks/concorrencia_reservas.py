@@ -0,0 +1,112 @@
+# benchmarks/concorrencia_reservas.py — estresse de reservas concorrentes na fachada
+#
+#   python -m benchmarks.concorrencia_reservas --threads 1,2,4,8 --salas 64 --latencia-ms 1
+#
+# Cada thread reserva horários aleatórios (muitas colisões de propósito) com seus
+# próprios usuários. Ao final verifica que não há sobreposição de reservas ativas
+# na mesma sala/data nem usuário acima do limite. --latencia-ms simula E/S dentro
+# do DAO (o trecho crítico check-then-insert): com locks por (sala, data) a vazão
+# cresce com o número de threads; --listras 1 reproduz um lock global para comparar.
+# Sem latência o trabalho é só CPU e o GIL limita o paralelismo do CPython.
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.medicao import criar_fachada, encerrar_fachada
+from concorrencia import TravasListradas
+from exceptions import ConflitoDeReservaException, LimiteDeReservasException
+from managers import LIMITE_RESERVAS_ATIVAS
+
+DATAS = [f"2025-03-{d:02d}" for d in range(3, 8)]
+HORAS = range(7, 22)
+
+def _montar(salas: int, threads: int, usuarios_por_thread: int, latencia: float, listras: int, modo: str):
+    c = criar_fachada(modo_historico=modo)
+    _, admin = c.autenticar_usuario("admin", "admin")
+    for i in range(salas):
+        c.admin_cadastrar_sala(admin, f"Sala {i}", 10, [])
+    usuarios = [[c.cadastrar_usuario(f"t{t}u{k}", f"t{t}u{k}", "x") for k in range(usuarios_por_thread)]
+                for t in range(threads)]
+    c.reserva_manager.travas = TravasListradas(listras)
+    if latencia:
+        dao, add = c.reserva_dao, c.reserva_dao.add
+        def add_lento(r):
+            time.sleep(latencia)
+            return add(r)
+        dao.add = add_lento
+    return c, usuarios
+
+def _trabalhar(c, usuarios, salas: int, ops: int, semente: int, contagem: Dict[str, int]):
+    rnd = random.Random(semente)
+    for i in range(ops):
+        u = usuarios[i % len(usuarios)]
+        h = rnd.choice(HORAS)
+        try:
+            c.cadastrar_reserva(u, rnd.randint(1, salas), rnd.choice(DATAS), f"{h:02d}:00", f"{h + 1:02d}:00")
+            contagem["ok"] += 1
+        except ConflitoDeReservaException:
+            contagem["conflito"] += 1
+        except LimiteDeReservasException:
+            contagem["limite"] += 1
+
+def verificar(c) -> List[str]:
+    erros = []
+    por_chave = defaultdict(list)
+    ativas = defaultdict(int)
+    for r in c.reserva_dao.list_all():
+        if r.status == 'ativa':
+            por_chave[(r.sala_id, r.data_ord)].append((r.inicio_min, r.fim_min, r.reserva_id))
+            ativas[r.login] += 1
+    for chave, itens in por_chave.items():
+        itens.sort()
+        for a, b in zip(itens, itens[1:]):
+            if b[0] < a[1]:
+                erros.append(f"sobreposição em {chave}: {a} x {b}")
+    erros += [f"{login} com {n} ativas" for login, n in ativas.items() if n > LIMITE_RESERVAS_ATIVAS]
+    return erros
+
+def rodar(threads: int, salas: int, ops: int, latencia: float, listras: int, modo: str) -> Dict[str, float]:
+    c, usuarios = _montar(salas, threads, max(1, ops // (LIMITE_RESERVAS_ATIVAS + 1)), latencia, listras, modo)
+    contagens = [defaultdict(int) for _ in range(threads)]
+    ts = [threading.Thread(target=_trabalhar, args=(c, usuarios[t], salas, ops, t, contagens[t])) for t in range(threads)]
+    inicio = time.perf_counter()
+    for t in ts: t.start()
+    for t in ts: t.join()
+    duracao = time.perf_counter() - inicio
+    total = defaultdict(int)
+    for ct in contagens:
+        for k, v in ct.items():
+            total[k] += v
+    erros = verificar(c)
+    encerrar_fachada(c)
+    return {"threads": threads, "ops": threads * ops, "segundos": duracao, "ops_s": threads * ops / duracao,
+            "ok": total["ok"], "conflitos": total["conflito"], "limite": total["limite"], "erros": len(erros)}
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--threads", default="1,2,4,8")
+    p.add_argument("--salas", type=int, default=64)
+    p.add_argument("--ops", type=int, default=300, help="reservas tentadas por thread")
+    p.add_argument("--latencia-ms", type=float, default=1.0)
+    p.add_argument("--listras", type=int, default=256, help="1 = lock global (comparação)")
+    p.add_argument("--modo", default="delta", choices=["delta", "snapshot"])
+    a = p.parse_args(argv)
+    base = None
+    falhou = False
+    for n in map(int, a.threads.split(",")):
+        r = rodar(n, a.salas, a.ops, a.latencia_ms / 1000, a.listras, a.modo)
+        base = base or r["ops_s"]
+        falhou |= bool(r["erros"])
+        print(f"threads={r['threads']:>3}  {r['ops_s']:>9.0f} ops/s  (x{r['ops_s'] / base:.2f})  "
+              f"ok={r['ok']} conflitos={r['conflitos']} limite={r['limite']}  violações={r['erros']}")
+    return 1 if falhou else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
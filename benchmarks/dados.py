@@ -0,0 +1,44 @@
+# benchmarks/dados.py — gerador determinístico de cargas sintéticas
+#
+# Mesma semente + mesmos parâmetros => exatamente os mesmos usuários, salas e
+# pedidos, em qualquer máquina/backend. `contencao` (0..1) é a fração de pedidos
+# dirigida às salas "quentes" (10% das salas) no horário de pico (09h-12h); o
+# restante se espalha uniformemente por salas, dias e horários de funcionamento.
+import random
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import List, Tuple
+from models import PedidoReserva
+
+RECURSOS = ("projetor", "tv", "quadro", "videoconferencia", "ar-condicionado", "computadores", "som")
+
+@dataclass
+class DadosSinteticos:
+    usuarios: List[Tuple[str, str, str]]            # (nome, login, senha)
+    salas: List[Tuple[str, int, List[str]]]         # (nome, capacidade, recursos); ids 1..M na ordem
+    pedidos: List[PedidoReserva]
+    datas: List[str] = field(default_factory=list)
+
+def gerar(usuarios: int = 1000, salas: int = 50, reservas: int = 2000, dias: int = 20,
+          contencao: float = 0.2, semente: int = 42, data_inicial: str = "2025-03-03") -> DadosSinteticos:
+    rnd = random.Random(semente)
+    inicio = date.fromisoformat(data_inicial)
+    datas = [(inicio + timedelta(days=d)).isoformat() for d in range(dias)]
+    lista_usuarios = [(f"Usuário {i}", f"user{i:06d}", f"senha{i}") for i in range(usuarios)]
+    lista_salas = [(f"Sala {i + 1}", rnd.choice((6, 10, 20, 40, 80)), sorted(rnd.sample(RECURSOS, rnd.randint(0, 4))))
+                   for i in range(salas)]
+    quentes = max(1, salas // 10)
+    pedidos = []
+    for k in range(reservas):
+        login = lista_usuarios[k % usuarios][1]
+        if rnd.random() < contencao:
+            sala_id, hora = rnd.randint(1, quentes), rnd.randint(9, 11)
+        else:
+            sala_id, hora = rnd.randint(1, salas), rnd.randint(7, 20)
+        minuto = rnd.choice((0, 30))
+        duracao = rnd.choice((30, 60, 60, 90, 120))
+        ini = hora * 60 + minuto
+        fim = min(ini + duracao, 22 * 60)
+        pedidos.append(PedidoReserva(sala_id, rnd.choice(datas), f"{ini // 60:02d}:{ini % 60:02d}",
+                                     f"{fim // 60:02d}:{fim % 60:02d}", login))
+    return DadosSinteticos(lista_usuarios, lista_salas, pedidos, datas)
@@ -0,0 +1,84 @@
+# benchmarks/login.py — vazão de login (scrypt no pool) e de autenticação por token sob concorrência
+#
+#   python -m benchmarks.login --usuarios 64 --threads 1,4,16 --trabalhadores 1,4 --n 16384
+#
+# Para cada tamanho de pool do verificador e cada número de threads clientes, os
+# threads fazem logins (iniciar_sessao) em paralelo; depois resolvem os tokens
+# obtidos (usuario_por_token), que é o que cada requisição seguinte paga. Mostra
+# vazão e percentis de latência das duas operações.
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.medicao import criar_fachada, encerrar_fachada, resumir
+
+def _em_paralelo(fn: Callable[[Any], Any], itens: List[Any], threads: int) -> Dict[str, float]:
+    latencias: List[float] = []
+    lock = threading.Lock()
+    fatias = [itens[i::threads] for i in range(threads)]
+    barreira = threading.Barrier(threads + 1)
+
+    def trabalhar(fatia):
+        locais = []
+        barreira.wait()
+        for item in fatia:
+            t = time.perf_counter()
+            fn(item)
+            locais.append(time.perf_counter() - t)
+        with lock:
+            latencias.extend(locais)
+
+    ts = [threading.Thread(target=trabalhar, args=(f,)) for f in fatias]
+    for t in ts:
+        t.start()
+    barreira.wait()
+    inicio = time.perf_counter()
+    for t in ts:
+        t.join()
+    return resumir(latencias, time.perf_counter() - inicio)
+
+def executar(usuarios: int, threads: int, trabalhadores: int, n: int, repeticoes: int) -> Dict[str, Any]:
+    c = criar_fachada(senha_opcoes={"trabalhadores": trabalhadores, "n": n})
+    logins = [f"u{k}" for k in range(usuarios)]
+    with ThreadPoolExecutor(trabalhadores) as pool:
+        list(pool.map(lambda l: c.cadastrar_usuario(l, l, f"senha-{l}"), logins))
+
+    tokens: List[str] = []
+
+    def entrar(login):
+        token, _ = c.iniciar_sessao(login, f"senha-{login}")
+        tokens.append(token)
+
+    res = {"login": _em_paralelo(entrar, logins, threads)}
+    assert all(tokens) and len(tokens) == usuarios
+    res["usuario_por_token"] = _em_paralelo(c.usuario_por_token, tokens * repeticoes, threads)
+    encerrar_fachada(c)
+    return res
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Vazão de login e de autenticação por token.")
+    p.add_argument("--usuarios", type=int, default=64)
+    p.add_argument("--threads", default="1,4,16")
+    p.add_argument("--trabalhadores", default="1,4", help="tamanhos do pool do KDF")
+    p.add_argument("--n", type=int, default=2 ** 14, help="custo do scrypt")
+    p.add_argument("--repeticoes", type=int, default=200, help="resoluções de token por usuário")
+    a = p.parse_args(argv)
+    resultados = []
+    for trab in (int(x) for x in a.trabalhadores.split(",")):
+        for threads in (int(x) for x in a.threads.split(",")):
+            r = executar(a.usuarios, threads, trab, a.n, a.repeticoes)
+            resultados.append({"trabalhadores": trab, "threads": threads, **r})
+            print(f"pool={trab:<3} threads={threads:<3} login {r['login']['ops_s']:>9} ops/s "
+                  f"(p99 {r['login']['p99_us']} µs)   token {r['usuario_por_token']['ops_s']:>10} ops/s "
+                  f"(p99 {r['usuario_por_token']['p99_us']} µs)")
+    print(json.dumps(resultados, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
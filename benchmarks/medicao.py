@@ -0,0 +1,71 @@
+# benchmarks/medicao.py — utilitários comuns: fachada "silenciosa", percentis e cronômetro por operação
+import os
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, List
+from controller import FacadeSingletonController
+from notificacoes import Remetente
+
+class SemEnvio(Remetente):
+    """Descarta notificações: o benchmark mede o caminho da reserva, não o console."""
+    def enviar(self, lote): pass
+
+def criar_fachada(**config) -> FacadeSingletonController:
+    """
+    Instância nova (fora do singleton), com log e notificações descartados e um
+    scrypt barato: o custo do KDF só interessa ao benchmark de login.
+    """
+    config.setdefault("log_opcoes", {"stream": open(os.devnull, "w")})
+    config.setdefault("senha_opcoes", {"n": 2 ** 4})
+    config.setdefault("remetentes_notificacao", [SemEnvio()])
+    return FacadeSingletonController(**config)
+
+def encerrar_fachada(c: FacadeSingletonController) -> None:
+    if hasattr(c.logger, "fechar"):
+        c.logger.fechar()
+    c.notificador.fechar()
+    c.verificador.fechar()
+    if c.particoes:
+        c.particoes.encerrar()
+
+def percentil(amostras: List[float], p: float) -> float:
+    if not amostras:
+        return 0.0
+    ordenadas = sorted(amostras)
+    return ordenadas[min(len(ordenadas) - 1, int(round(p / 100 * (len(ordenadas) - 1))))]
+
+def resumir(latencias_s: List[float], total_s: float) -> Dict[str, float]:
+    us = [x * 1e6 for x in latencias_s]
+    return {
+        "n": len(us),
+        "total_s": round(total_s, 6),
+        "ops_s": round(len(us) / total_s, 1) if total_s else 0.0,
+        "p50_us": round(percentil(us, 50), 1),
+        "p90_us": round(percentil(us, 90), 1),
+        "p99_us": round(percentil(us, 99), 1),
+        "max_us": round(max(us), 1) if us else 0.0,
+    }
+
+def cronometrar(fn: Callable[[Any], Any], itens: Iterable[Any], memoria: bool = False) -> Dict[str, float]:
+    """
+    Chama fn(item) para cada item. Com memoria=True mede só o pico de alocação
+    (tracemalloc distorce a latência, por isso é uma passada separada).
+    """
+    itens = list(itens)
+    if memoria:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        for item in itens:
+            fn(item)
+        pico = tracemalloc.get_traced_memory()[1] - base
+        tracemalloc.stop()
+        return {"pico_kib": round(pico / 1024, 1)}
+    latencias = []
+    relogio = time.perf_counter
+    inicio = relogio()
+    for item in itens:
+        t = relogio()
+        fn(item)
+        latencias.append(relogio() - t)
+    return resumir(latencias, relogio() - inicio)
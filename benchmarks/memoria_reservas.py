@@ -0,0 +1,105 @@
+# benchmarks/memoria_reservas.py — memória por reserva: layout antigo x layout compacto atual
+#
+#   python -m benchmarks.memoria_reservas --quantidade 1000000
+#
+# Monta `quantidade` reservas nos dois layouts e mede com tracemalloc quanto cada
+# um ocupa, e quanto ocupa o snapshot serializado (pickle) do memento:
+#   antigo — dataclass com __dict__, referências a Usuario/Sala e data/horários
+#            guardados também como texto (três str novas por reserva);
+#   atual  — models.Reserva: __slots__, login/sala_id como referência, textos
+#            derivados sob demanda, logins internados e inteiros compartilhados.
+import argparse
+import gc
+import json
+import os
+import pickle
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import (Reserva, Sala, Usuario, data_para_ordinal, hora_para_minutos, minutos_para_hora,
+                    ordinal_para_data)
+
+@dataclass
+class ReservaAntiga:
+    """Layout anterior de models.Reserva, reproduzido aqui só para comparação."""
+    reserva_id: int
+    usuario: Usuario
+    sala: Sala
+    data: str
+    hora_inicio: str
+    hora_fim: str
+    status: str = 'ativa'
+    serie_id: Optional[int] = None
+    data_ord: int = field(init=False, repr=False, compare=False)
+    inicio_min: int = field(init=False, repr=False, compare=False)
+    fim_min: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.data_ord = data_para_ordinal(self.data)
+        self.inicio_min = hora_para_minutos(self.hora_inicio)
+        self.fim_min = hora_para_minutos(self.hora_fim)
+        self.data = ordinal_para_data(self.data_ord)
+        self.hora_inicio = minutos_para_hora(self.inicio_min)
+        self.hora_fim = minutos_para_hora(self.fim_min)
+
+def _pedidos(quantidade: int, usuarios: List[Usuario], salas: List[Sala], semente: int):
+    """(usuário, sala, data, início, fim) em texto, como chegam do cadastro."""
+    rnd = random.Random(semente)
+    base = data_para_ordinal("2025-01-01")
+    for _ in range(quantidade):
+        inicio = rnd.randrange(7 * 60, 21 * 60, 30)
+        yield (rnd.choice(usuarios), rnd.choice(salas), ordinal_para_data(base + rnd.randrange(365)),
+               minutos_para_hora(inicio), minutos_para_hora(inicio + rnd.choice((30, 60, 90, 120))))
+
+def _medir(construir: Callable[[], List[Any]]) -> Dict[str, Any]:
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    t = time.perf_counter()
+    itens = construir()
+    duracao = time.perf_counter() - t
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    n = len(itens)
+    bytes_ = depois - antes
+    pickle_ = len(pickle.dumps(itens, pickle.HIGHEST_PROTOCOL))
+    del itens
+    gc.collect()
+    return {"reservas": n, "bytes": bytes_, "bytes_por_reserva": round(bytes_ / n, 1),
+            "pickle_bytes_por_reserva": round(pickle_ / n, 1), "construcao_s": round(duracao, 3)}
+
+def executar(quantidade: int, usuarios: int, salas: int, semente: int) -> Dict[str, Any]:
+    us = [Usuario(f"Usuário {k}", f"u{k}", "x") for k in range(usuarios)]
+    ss = [Sala(k, f"Sala {k}", 10) for k in range(1, salas + 1)]
+    pedidos = list(_pedidos(quantidade, us, ss, semente))   # entrada comum, fora da medição
+
+    antigo = _medir(lambda: [ReservaAntiga(i, u, s, d, hi, hf) for i, (u, s, d, hi, hf) in enumerate(pedidos, 1)])
+    atual = _medir(lambda: [Reserva.nova(i, u.login, s.sala_id, d, hi, hf)
+                            for i, (u, s, d, hi, hf) in enumerate(pedidos, 1)])
+    return {"antigo": antigo, "atual": atual,
+            "reducao": round(1 - atual["bytes"] / antigo["bytes"], 3),
+            "reducao_pickle": round(1 - atual["pickle_bytes_por_reserva"] / antigo["pickle_bytes_por_reserva"], 3)}
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Memória por reserva: layout antigo x compacto.")
+    p.add_argument("--quantidade", type=int, default=1_000_000)
+    p.add_argument("--usuarios", type=int, default=5000)
+    p.add_argument("--salas", type=int, default=200)
+    p.add_argument("--semente", type=int, default=7)
+    a = p.parse_args(argv)
+    r = executar(a.quantidade, a.usuarios, a.salas, a.semente)
+    for nome in ("antigo", "atual"):
+        m = r[nome]
+        print(f"{nome:<7} {m['bytes'] / 2 ** 20:>9.1f} MiB  {m['bytes_por_reserva']:>7} B/reserva  "
+              f"pickle {m['pickle_bytes_por_reserva']:>6} B/reserva  ({m['construcao_s']} s)")
+    print(f"redução: {r['reducao']:.1%} em memória, {r['reducao_pickle']:.1%} no snapshot serializado")
+    print(json.dumps(r, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
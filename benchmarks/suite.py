@@ -0,0 +1,117 @@
+# benchmarks/suite.py — suíte de desempenho dos caminhos críticos sobre dados sintéticos
+#
+#   python -m benchmarks.suite --usuarios 1000 --salas 50 --reservas 2000 --dias 20 \
+#          --backends ram,sqlite --estrategias estrito,leniente --historicos delta,snapshot \
+#          --saida benchmarks/resultados.json
+#
+# Para cada combinação backend x estratégia x histórico monta uma fachada nova,
+# carrega o mesmo conjunto determinístico (benchmarks.dados) e mede:
+#   cadastrar_reserva, consultar_disponibilidade, gerar_relatorio_uso_salas,
+#   _snapshot, desfazer e refazer
+# com percentis de latência, vazão e (numa segunda passada, com tracemalloc) pico
+# de memória. O JSON de saída traz a configuração e o commit, para comparar versões.
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.dados import gerar, DadosSinteticos
+from benchmarks.medicao import criar_fachada, encerrar_fachada, cronometrar
+from exceptions import ConflitoDeReservaException, LimiteDeReservasException
+
+def _preparar(dados: DadosSinteticos, backend: str, estrategia: str, historico: str, sqlite_caminho: str):
+    opcoes = {"caminho": sqlite_caminho} if backend == "sqlite" else None
+    c = criar_fachada(modo_historico=historico, backend=backend, backend_opcoes=opcoes)
+    c.definir_estrategia_conflito(estrategia)
+    _, admin = c.autenticar_usuario("admin", "admin")
+    for nome, capacidade, recursos in dados.salas:
+        c.admin_cadastrar_sala(admin, nome, capacidade, recursos)
+    usuarios = {login: c.cadastrar_usuario(nome, login, senha) for nome, login, senha in dados.usuarios}
+    return c, admin, usuarios
+
+def executar_cenario(dados: DadosSinteticos, backend: str, estrategia: str, historico: str,
+                     repeticoes: int, desfazer: int, memoria: bool, sqlite_caminho: str) -> Dict[str, Any]:
+    c, admin, usuarios = _preparar(dados, backend, estrategia, historico, sqlite_caminho)
+    contagem = {"aceitas": 0, "conflitos": 0, "limite": 0}
+
+    def reservar(p):
+        try:
+            c.cadastrar_reserva(usuarios[p.login], p.sala_id, p.data, p.hora_inicio, p.hora_fim)
+            contagem["aceitas"] += 1
+        except ConflitoDeReservaException:
+            contagem["conflitos"] += 1
+        except LimiteDeReservasException:
+            contagem["limite"] += 1
+
+    ops: Dict[str, Dict[str, Any]] = {}
+    ops["cadastrar_reserva"] = cronometrar(reservar, dados.pedidos, memoria)
+    ops["consultar_disponibilidade"] = cronometrar(c.consultar_disponibilidade, dados.datas * repeticoes, memoria)
+    ops["gerar_relatorio_uso_salas"] = cronometrar(lambda _: c.admin_gerar_relatorio_uso(admin), range(repeticoes), memoria)
+    ops["_snapshot"] = cronometrar(lambda _: c.reserva_manager._snapshot(), range(min(repeticoes, 10)), memoria)
+    ops["desfazer"] = cronometrar(lambda _: c.desfazer(), range(desfazer), memoria)
+    ops["refazer"] = cronometrar(lambda _: c.refazer(), range(desfazer), memoria)
+    encerrar_fachada(c)
+    return {"operacoes": ops, "reservas": contagem}
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Suíte de benchmarks do sistema de reservas.")
+    p.add_argument("--usuarios", type=int, default=1000)
+    p.add_argument("--salas", type=int, default=50)
+    p.add_argument("--reservas", type=int, default=2000)
+    p.add_argument("--dias", type=int, default=20)
+    p.add_argument("--contencao", type=float, default=0.2)
+    p.add_argument("--semente", type=int, default=42)
+    p.add_argument("--repeticoes", type=int, default=20, help="repetições das consultas/relatórios")
+    p.add_argument("--desfazer", type=int, default=50, help="quantos undo (e redo) medir")
+    p.add_argument("--backends", default="ram")
+    p.add_argument("--estrategias", default="estrito")
+    p.add_argument("--historicos", default="delta,snapshot")
+    p.add_argument("--sqlite-caminho", default=":memory:")
+    p.add_argument("--sem-memoria", action="store_true", help="pula a passada com tracemalloc")
+    p.add_argument("--saida", default="benchmarks/resultados.json")
+    a = p.parse_args(argv)
+
+    dados = gerar(a.usuarios, a.salas, a.reservas, a.dias, a.contencao, a.semente)
+    resultados: List[Dict[str, Any]] = []
+    for backend in a.backends.split(","):
+        for estrategia in a.estrategias.split(","):
+            for historico in a.historicos.split(","):
+                args = (dados, backend, estrategia, historico, a.repeticoes, a.desfazer)
+                r = executar_cenario(*args, memoria=False, sqlite_caminho=a.sqlite_caminho)
+                if not a.sem_memoria:
+                    picos = executar_cenario(*args, memoria=True, sqlite_caminho=a.sqlite_caminho)["operacoes"]
+                    for op, m in picos.items():
+                        r["operacoes"][op].update(m)
+                r.update(backend=backend, estrategia=estrategia, historico=historico)
+                resultados.append(r)
+                print(f"\n== backend={backend} estrategia={estrategia} historico={historico}  {r['reservas']}")
+                for op, m in r["operacoes"].items():
+                    print(f"  {op:<28} {m['ops_s']:>10.0f} ops/s  p50={m['p50_us']:>9.1f}us  "
+                          f"p99={m['p99_us']:>9.1f}us  pico={m.get('pico_kib', '-')} KiB")
+
+    saida = {
+        "meta": {"quando": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": _commit(),
+                 "python": platform.python_version(), "plataforma": platform.platform()},
+        "config": {k: v for k, v in vars(a).items() if k != "saida"},
+        "resultados": resultados,
+    }
+    os.makedirs(os.path.dirname(a.saida) or ".", exist_ok=True)
+    with open(a.saida, "w", encoding="utf-8") as f:
+        json.dump(saida, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados gravados em {a.saida}")
+
+if __name__ == "__main__":
+    main()
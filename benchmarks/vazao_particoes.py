@@ -0,0 +1,108 @@
+# benchmarks/vazao_particoes.py — vazão do modo particionado (salas em vários processos) x processo único
+#
+#   python -m benchmarks.vazao_particoes --particoes 0,1,2,4 --threads 16 --reservas 6000
+#
+# Para cada número de partições (0 = processo único, histórico "delta") mede:
+#   reservar         — threads clientes chamando cadastrar_reserva, sem colisões;
+#   lote             — um cadastrar_reservas_em_lote grande (cada partição valida a sua parte);
+#   disponibilidade  — threads chamando consultar_disponibilidade (fan-out para todas as partições).
+# O ganho depende de núcleos livres: com uma CPU só aparece o custo do roteamento
+# (serialização + pipe); com N núcleos as partições validam e gravam em paralelo.
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.medicao import criar_fachada, encerrar_fachada, resumir
+from managers import LIMITE_RESERVAS_ATIVAS
+from models import PedidoReserva
+
+DIAS = [f"2025-03-{d:02d}" for d in range(3, 29)]
+HORAS = range(7, 22)
+
+def _em_paralelo(fn: Callable[[Any], Any], itens: List[Any], threads: int) -> Dict[str, float]:
+    latencias: List[float] = []
+    lock = threading.Lock()
+    fatias = [itens[i::threads] for i in range(threads)]
+    barreira = threading.Barrier(threads + 1)
+
+    def trabalhar(fatia):
+        locais = []
+        barreira.wait()
+        for item in fatia:
+            t = time.perf_counter()
+            fn(item)
+            locais.append(time.perf_counter() - t)
+        with lock:
+            latencias.extend(locais)
+
+    ts = [threading.Thread(target=trabalhar, args=(f,)) for f in fatias]
+    for t in ts:
+        t.start()
+    barreira.wait()
+    inicio = time.perf_counter()
+    for t in ts:
+        t.join()
+    return resumir(latencias, time.perf_counter() - inicio)
+
+def executar(particoes: int, threads: int, salas: int, reservas: int, lote: int, consultas: int,
+             semente: int) -> Dict[str, Any]:
+    c = criar_fachada(modo_historico="delta", particoes=particoes)
+    _, admin = c.autenticar_usuario("admin", "admin")
+    ids = [s.sala_id for s in c.sala_manager.cadastrar_salas_em_lote([(f"Sala {i}", 20, []) for i in range(salas)])]
+    # cada usuário cabe no limite: LIMITE_RESERVAS_ATIVAS pedidos por login
+    total = reservas + lote
+    logins = [f"u{k}" for k in range(-(-total // LIMITE_RESERVAS_ATIVAS))]
+    c.user_manager.cadastrar_usuarios_em_lote([(l, l, "x", "usuario") for l in logins])
+    usuarios = {l: c.user_dao.get_by_login(l) for l in logins}
+
+    # horários distintos (sala, dia, hora): o benchmark mede o caminho feliz, sem conflitos
+    vagas = list(itertools.product(ids, DIAS, HORAS))
+    if len(vagas) < total:
+        raise SystemExit(f"Poucas vagas ({len(vagas)}) para {total} reservas: aumente --salas.")
+    random.Random(semente).shuffle(vagas)
+    pedidos = [PedidoReserva(sid, dia, f"{h:02d}:00", f"{h + 1:02d}:00", logins[i // LIMITE_RESERVAS_ATIVAS])
+               for i, (sid, dia, h) in enumerate(vagas[:total])]
+
+    res: Dict[str, Any] = {}
+    res["reservar"] = _em_paralelo(lambda p: c.cadastrar_reserva(usuarios[p.login], p.sala_id, p.data, p.hora_inicio,
+                                                                 p.hora_fim), pedidos[:reservas], threads)
+    t = time.perf_counter()
+    resultados = c.cadastrar_reservas_em_lote(admin, pedidos[reservas:])
+    duracao = time.perf_counter() - t
+    res["lote"] = {"n": len(resultados), "total_s": round(duracao, 6),
+                   "ops_s": round(len(resultados) / duracao, 1) if duracao else 0.0,
+                   "aceitos": sum(r.ok for r in resultados)}
+    res["disponibilidade"] = _em_paralelo(c.consultar_disponibilidade, [DIAS[i % len(DIAS)] for i in range(consultas)],
+                                          threads)
+    encerrar_fachada(c)
+    return res
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Vazão com salas particionadas entre processos.")
+    p.add_argument("--particoes", default="0,1,2,4", help="0 = processo único")
+    p.add_argument("--threads", type=int, default=16)
+    p.add_argument("--salas", type=int, default=64)
+    p.add_argument("--reservas", type=int, default=6000, help="reservas individuais (threads)")
+    p.add_argument("--lote", type=int, default=6000, help="tamanho do lote")
+    p.add_argument("--consultas", type=int, default=400)
+    p.add_argument("--semente", type=int, default=7)
+    a = p.parse_args(argv)
+    resultados = []
+    for n in (int(x) for x in a.particoes.split(",")):
+        r = executar(n, a.threads, a.salas, a.reservas, a.lote, a.consultas, a.semente)
+        resultados.append({"particoes": n, **r})
+        print(f"particoes={n:<3} reservar {r['reservar']['ops_s']:>9} ops/s (p99 {r['reservar']['p99_us']} µs)   "
+              f"lote {r['lote']['ops_s']:>9} pedidos/s   disponibilidade {r['disponibilidade']['ops_s']:>8} ops/s")
+    print(f"núcleos: {os.cpu_count()}")
+    print(json.dumps(resultados, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
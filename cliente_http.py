@@ -0,0 +1,97 @@
+# cliente_http.py — clientes locais do servidor_http (testes manuais e gerador de carga)
+#
+# ClienteReservas: síncrono, http.client com conexão persistente (keep-alive).
+# ConexaoAssincrona: asyncio, permite enviar vários pedidos de uma vez (pipelining)
+# e ler as respostas na mesma ordem.
+import asyncio
+import http.client
+import json
+from typing import Any, List, Optional, Tuple
+
+Resposta = Tuple[int, Any]
+
+def _pedido_bytes(metodo: str, caminho: str, corpo: Any = None, token: Optional[str] = None,
+                  host: str = "localhost") -> bytes:
+    dados = b"" if corpo is None else json.dumps(corpo).encode("utf-8")
+    linhas = [f"{metodo} {caminho} HTTP/1.1", f"Host: {host}", f"Content-Length: {len(dados)}"]
+    if dados:
+        linhas.append("Content-Type: application/json")
+    if token:
+        linhas.append(f"Authorization: Bearer {token}")
+    return ("\r\n".join(linhas) + "\r\n\r\n").encode("latin-1") + dados
+
+class ClienteReservas:
+    def __init__(self, host: str = "127.0.0.1", porta: int = 8080, timeout: float = 10.0):
+        self._conn = http.client.HTTPConnection(host, porta, timeout=timeout)
+        self.token: Optional[str] = None
+
+    def requisitar(self, metodo: str, caminho: str, corpo: Any = None) -> Resposta:
+        cabecalhos = {"Content-Type": "application/json"} if corpo is not None else {}
+        if self.token:
+            cabecalhos["Authorization"] = f"Bearer {self.token}"
+        dados = json.dumps(corpo) if corpo is not None else None
+        self._conn.request(metodo, caminho, body=dados, headers=cabecalhos)
+        resp = self._conn.getresponse()
+        bruto = resp.read()
+        return resp.status, (json.loads(bruto) if bruto else None)
+
+    def login(self, login: str, senha: str) -> Resposta:
+        status, corpo = self.requisitar("POST", "/login", {"login": login, "senha": senha})
+        if status == 200:
+            self.token = corpo["token"]
+        return status, corpo
+
+    def reservar(self, sala_id: int, data: str, hora_inicio: str, hora_fim: str) -> Resposta:
+        return self.requisitar("POST", "/reservas", {"sala_id": sala_id, "data": data,
+                                                     "hora_inicio": hora_inicio, "hora_fim": hora_fim})
+
+    def cancelar(self, reserva_id: int) -> Resposta:
+        return self.requisitar("DELETE", f"/reservas/{reserva_id}")
+
+    def disponibilidade(self, data: str) -> Resposta:
+        return self.requisitar("GET", f"/disponibilidade?data={data}")
+
+    def fechar(self):
+        self._conn.close()
+
+class ConexaoAssincrona:
+    def __init__(self, host: str = "127.0.0.1", porta: int = 8080):
+        self.host, self.porta = host, porta
+        self.token: Optional[str] = None
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def abrir(self) -> "ConexaoAssincrona":
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.porta)
+        return self
+
+    async def _ler_resposta(self) -> Resposta:
+        cabecalho = (await self._reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+        status = int(cabecalho.split(" ", 2)[1])
+        tamanho = 0
+        for linha in cabecalho.split("\r\n")[1:]:
+            nome, _, valor = linha.partition(":")
+            if nome.strip().lower() == "content-length":
+                tamanho = int(valor)
+        bruto = await self._reader.readexactly(tamanho) if tamanho else b""
+        return status, (json.loads(bruto) if bruto else None)
+
+    async def pipeline(self, pedidos: List[Tuple[str, str, Any]]) -> List[Resposta]:
+        """Envia todos os pedidos (metodo, caminho, corpo) de uma vez e lê as respostas em ordem."""
+        self._writer.write(b"".join(_pedido_bytes(m, c, b, self.token, self.host) for m, c, b in pedidos))
+        await self._writer.drain()
+        return [await self._ler_resposta() for _ in pedidos]
+
+    async def requisitar(self, metodo: str, caminho: str, corpo: Any = None) -> Resposta:
+        return (await self.pipeline([(metodo, caminho, corpo)]))[0]
+
+    async def login(self, login: str, senha: str) -> Resposta:
+        status, corpo = await self.requisitar("POST", "/login", {"login": login, "senha": senha})
+        if status == 200:
+            self.token = corpo["token"]
+        return status, corpo
+
+    async def fechar(self):
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
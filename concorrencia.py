@@ -0,0 +1,66 @@
+# concorrencia.py — primitivas de sincronização usadas pela fachada e pelos managers
+#
+# - TravasListradas: conjunto fixo de locks; cada chave (ex.: ("sala", 3, data_ord)
+#   ou ("usuario", "ana")) cai numa "listra" por hash. Operações em chaves diferentes
+#   quase sempre pegam locks diferentes e seguem em paralelo; várias chaves são
+#   travadas em ordem crescente de listra, o que evita deadlock.
+# - TravaLeituraEscrita: muitos leitores OU um escritor (com preferência ao escritor).
+#   A fachada usa o modo compartilhado nas reservas e o exclusivo em undo/redo,
+#   operações administrativas e no histórico por snapshots.
+import threading
+from contextlib import contextmanager
+from typing import Hashable, Iterable, Iterator
+
+class TravasListradas:
+    def __init__(self, listras: int = 256):
+        self._travas = [threading.Lock() for _ in range(listras)]
+
+    def _indice(self, chave: Hashable) -> int:
+        return hash(chave) % len(self._travas)
+
+    @contextmanager
+    def travar(self, chaves: Iterable[Hashable]) -> Iterator[None]:
+        indices = sorted({self._indice(c) for c in chaves})
+        for i in indices:
+            self._travas[i].acquire()
+        try:
+            yield
+        finally:
+            for i in reversed(indices):
+                self._travas[i].release()
+
+class TravaLeituraEscrita:
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._leitores = 0
+        self._escritor = False
+        self._escritores_esperando = 0
+
+    @contextmanager
+    def leitura(self) -> Iterator[None]:
+        with self._cond:
+            while self._escritor or self._escritores_esperando:
+                self._cond.wait()
+            self._leitores += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._leitores -= 1
+                if not self._leitores:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def escrita(self) -> Iterator[None]:
+        with self._cond:
+            self._escritores_esperando += 1
+            while self._escritor or self._leitores:
+                self._cond.wait()
+            self._escritores_esperando -= 1
+            self._escritor = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._escritor = False
+                self._cond.notify_all()
@@ -1,69 +1,235 @@
 # controller.py — Memento + Strategy + Logger Adapter (SEM Template Method)
-from typing import Tuple, Optional, List, Dict
-from models import Usuario, Reserva, Sala
-from managers import UserManager, ReservaManager, SalaManager
+import threading
+from typing import Tuple, Optional, List, Dict, Iterable, Iterator
+from dataclasses import replace
+from models import (Usuario, Reserva, Sala, SerieReserva, RegraRecorrencia, PedidoReserva, ResultadoLote,
+                    Pagina, data_para_ordinal)
+from managers import UserManager, ReservaManager, SalaManager, HORA_ABERTURA, HORA_FECHAMENTO
 from exceptions import *
-from dao_factory import RAMDAOFactory
-from memento import HistoryService
+from dao_factory import criar_dao_factory
+from memento import HistoryService, DeltaHistoryService
 from strategy_conflict import LenientConflictStrategy, StrictConflictStrategy
-from adapter_logging import PythonLoggingAdapter
+from adapter_logging import PythonLoggingAdapter, QueueLoggingAdapter
+from notificacoes import NotificadorAssincrono, Remetente, ConsoleRemetente
+from concorrencia import TravaLeituraEscrita
+from seguranca import VerificadorSenhas, CacheSessoes
+from importador import Importador, ResumoImportacao
+from instrumentacao import Metricas, EscritorPrometheus, instrumentar, instrumentar_snapshot
+from particoes import GrupoParticoes, SalaManagerParticionado, ReservaManagerParticionado, SemHistorico
 
 class FacadeSingletonController:
+    """
+    Segura para uso por vários threads: reservas e cancelamentos rodam em paralelo
+    (modo compartilhado de `_estado`; o manager trava por sala/data e por usuário),
+    enquanto undo/redo e operações administrativas pegam o modo exclusivo. No
+    histórico por snapshots toda mutação é exclusiva, já que cada uma copia o
+    estado inteiro. Consultas não travam.
+
+    Com particoes=N (N >= 1) as reservas saem deste processo: as salas são
+    distribuídas por hash entre N processos (ver particoes.py) e reserva_manager
+    vira um roteador. Usuários e o catálogo de salas continuam aqui; desfazer e
+    refazer não são suportados nesse modo.
+    """
     _instance = None
+    _instance_lock = threading.Lock()
 
     @classmethod
-    def get_instance(cls):
+    def get_instance(cls, **config):
+        """A configuração (ex.: modo_historico="delta") só vale na primeira chamada."""
         if cls._instance is None:
-            cls._instance = cls()
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls(**config)
         return cls._instance
 
-    def __init__(self):
+    def __init__(self, modo_historico: str = "snapshot", historico_max_bytes: int | None = None,
+                 backend: str = "ram", backend_opcoes: Dict[str, object] | None = None,
+                 log_assincrono: bool = True, log_opcoes: Dict[str, object] | None = None,
+                 remetentes_notificacao: List[Remetente] | None = None, instrumentacao: bool = False,
+                 senha_opcoes: Dict[str, int] | None = None, sessao_opcoes: Dict[str, float] | None = None,
+                 particoes: int = 0):
         if FacadeSingletonController._instance is not None:
             raise Exception("Esta é uma classe Singleton! Use o método get_instance().")
 
-        factory = RAMDAOFactory()
+        # backend="ram" (padrão) ou "sqlite" (backend_opcoes={"caminho": "reservas.db"})
+        factory = criar_dao_factory(backend, **(backend_opcoes or {}))
         self.user_dao = factory.users()
         self.sala_dao = factory.salas()
         self.reserva_dao = factory.reservas()
+        self.serie_dao = factory.series()
+
+        # Adapter de logging: por padrão assíncrono (fila + thread), fora da latência das reservas;
+        # log_opcoes repassa tamanho_fila, politica, lote e amostragem ao QueueLoggingAdapter
+        if log_assincrono:
+            self.logger = QueueLoggingAdapter("app", **(log_opcoes or {}))
+        else:
+            self.logger = PythonLoggingAdapter("app")
+
+        # Avisos de reserva saem por uma outbox assíncrona (padrão: console)
+        self.notificador = NotificadorAssincrono(remetentes_notificacao or [ConsoleRemetente()])
 
-        # Adapter de logging
-        self.logger = PythonLoggingAdapter("app")
+        # Senhas com scrypt num pool limitado (senha_opcoes: trabalhadores, n, r, p);
+        # sessões por token opaco com TTL/LRU (sessao_opcoes: ttl_s, capacidade)
+        self.verificador = VerificadorSenhas(**(senha_opcoes or {}))
+        self.sessoes = CacheSessoes(**(sessao_opcoes or {}))
 
         # Managers recebem logger
-        self.user_manager = UserManager(self.user_dao, logger=self.logger)
-        self.sala_manager = SalaManager(self.sala_dao, logger=self.logger)
-        self.reserva_manager = ReservaManager(self.reserva_dao, self.user_dao, self.sala_dao, logger=self.logger)
+        self.user_manager = UserManager(self.user_dao, logger=self.logger, verificador=self.verificador)
+        self.particoes: GrupoParticoes | None = None
+        if particoes:
+            # cada partição abre seus próprios DAOs (caminho/diretório derivado do backend_opcoes)
+            self.particoes = GrupoParticoes(particoes, backend, backend_opcoes)
+            self.reserva_dao = self.serie_dao = None
+            self.sala_manager = SalaManagerParticionado(self.sala_dao, self.particoes, logger=self.logger)
+            self.reserva_manager = ReservaManagerParticionado(self.particoes, self.user_dao, self.sala_dao,
+                                                              logger=self.logger, notificador=self.notificador)
+        else:
+            self.sala_manager = SalaManager(self.sala_dao, logger=self.logger, reserva_dao=self.reserva_dao,
+                                            serie_dao=self.serie_dao)
+            self.reserva_manager = ReservaManager(self.reserva_dao, self.user_dao, self.sala_dao, logger=self.logger,
+                                                  notificador=self.notificador, serie_dao=self.serie_dao)
+
+        # Caretaker do Memento: "snapshot" (cópia completa) ou "delta" (comandos inversos);
+        # historico_max_bytes limita a memória dos snapshots (entradas antigas ficam comprimidas)
+        if particoes:
+            self.history = SemHistorico()
+        elif modo_historico == "delta":
+            self.history = DeltaHistoryService(capacity=100)
+        else:
+            self.history = HistoryService(capacity=100, max_bytes=historico_max_bytes)
+        self._estado = TravaLeituraEscrita()
+        self._mutacao = self._estado.leitura if particoes or modo_historico == "delta" else self._estado.escrita
 
-        # Caretaker do Memento (histórico de estados)
-        self.history = HistoryService(capacity=100)
+        # Instrumentação opcional: desligada, nenhum método é embrulhado
+        self.metricas: Metricas | None = None
+        if instrumentacao:
+            self._instrumentar()
+
+        # Motor analítico (NumPy) criado só no primeiro relatório analítico
+        self._analise = None
 
         # Admin padrão
         if not list(self.user_manager.listar_usuarios()):
             self.user_manager.cadastrar_usuario("Admin Padrão", "admin", "admin", "admin")
 
+    def _instrumentar(self):
+        m = self.metricas = Metricas()
+        instrumentar(self, "fachada", m, ignorar={"get_instance"})
+        instrumentar(self.user_manager, "user_manager", m)
+        instrumentar(self.sala_manager, "sala_manager", m)
+        instrumentar(self.reserva_manager, "reserva_manager", m)
+        instrumentar(self.user_dao, "dao.usuarios", m)
+        instrumentar(self.sala_dao, "dao.salas", m)
+        if self.particoes:
+            return   # DAOs de reservas e séries estão nas partições; não há histórico a medir
+        instrumentar(self.reserva_dao, "dao.reservas", m)
+        instrumentar(self.serie_dao, "dao.series", m)
+        instrumentar_snapshot(self.reserva_manager, m)
+        m.adicionar_coletor(lambda: {f"historico_{k}": v for k, v in self.history.stats().items()
+                                     if isinstance(v, (int, float))})
+
     # --- Usuário ---
     def cadastrar_usuario(self, nome: str, login: str, senha: str) -> Usuario:
-        return self.user_manager.cadastrar_usuario(nome, login, senha)
+        senha_hash = self.verificador.gerar(senha) if senha else None   # KDF fora do lock exclusivo
+        with self._estado.escrita():
+            return self.user_manager.cadastrar_usuario(nome, login, senha, senha_hash=senha_hash)
 
     def autenticar_usuario(self, login: str, senha: str) -> Tuple[bool, Optional[Usuario]]:
         return self.user_manager.autenticar(login, senha)
 
+    def iniciar_sessao(self, login: str, senha: str) -> Tuple[Optional[str], Optional[Usuario]]:
+        """Autentica (KDF) uma vez e devolve um token para as chamadas seguintes, ou (None, None)."""
+        ok, u = self.user_manager.autenticar(login, senha)
+        return (self.sessoes.criar(u.login), u) if ok else (None, None)
+
+    def usuario_por_token(self, token: str) -> Optional[Usuario]:
+        login = self.sessoes.obter(token)
+        return self.user_dao.get_by_login(login) if login else None
+
+    def encerrar_sessao(self, token: str) -> None:
+        self.sessoes.remover(token)
+
     # --- Reserva ---
     def cadastrar_reserva(self, usuario: Usuario, sala_id: int, data: str, hora_inicio: str, hora_fim: str) -> Reserva:
         sala = self.sala_dao.get_by_id(sala_id)
         if not sala:
             raise EntidadeNaoEncontradaException(f"Sala com ID {sala_id} não encontrada.")
-        return self.reserva_manager.cadastrar_reserva(usuario, sala, data, hora_inicio, hora_fim, history=self.history)
+        # relê o usuário: em backends persistentes o objeto da sessão pode estar desatualizado (ex.: bloqueio)
+        usuario = self.user_dao.get_by_login(usuario.login) or usuario
+        with self._mutacao():
+            return self.reserva_manager.cadastrar_reserva(usuario, sala, data, hora_inicio, hora_fim, history=self.history)
+
+    def cadastrar_reservas_em_lote(self, usuario_logado: Usuario, pedidos: List[PedidoReserva],
+                                   tudo_ou_nada: bool = False) -> List[ResultadoLote]:
+        """Pedidos sem login são do usuário logado; reservar para outros exige perfil admin."""
+        pedidos = [p if p.login else replace(p, login=usuario_logado.login) for p in pedidos]
+        if usuario_logado.perfil != 'admin' and any(p.login != usuario_logado.login for p in pedidos):
+            raise PermissaoNegadaException("Você só pode reservar em lote para si mesmo.")
+        with self._mutacao():
+            return self.reserva_manager.cadastrar_reservas_em_lote(pedidos, history=self.history, tudo_ou_nada=tudo_ou_nada)
 
     def cancelar_reserva(self, reserva_id: int, usuario_logado: Usuario) -> Reserva:
-        self.history.push(self.reserva_manager._snapshot())
-        return self.reserva_manager.cancelar_reserva(reserva_id, usuario_logado)
+        with self._mutacao():
+            self.history.capturar(self.reserva_manager)
+            return self.reserva_manager.cancelar_reserva(reserva_id, usuario_logado, history=self.history)
+
+    # --- Séries recorrentes ---
+    def cadastrar_serie(self, usuario: Usuario, sala_id: int, dias_semana: Iterable[int], hora_inicio: str,
+                        hora_fim: str, data_inicio: str, data_fim: str, excecoes: Iterable[str] = ()) -> SerieReserva:
+        """Reserva semanal (dias_semana: 0 = segunda ... 6 = domingo) entre data_inicio e data_fim."""
+        sala = self.sala_dao.get_by_id(sala_id)
+        if not sala:
+            raise EntidadeNaoEncontradaException(f"Sala com ID {sala_id} não encontrada.")
+        regra = RegraRecorrencia(tuple(dias_semana), hora_inicio, hora_fim, data_inicio, data_fim, tuple(excecoes))
+        usuario = self.user_dao.get_by_login(usuario.login) or usuario
+        with self._mutacao():
+            return self.reserva_manager.cadastrar_serie(usuario, sala, regra, history=self.history)
+
+    def cancelar_serie(self, serie_id: int, usuario_logado: Usuario) -> SerieReserva:
+        with self._mutacao():
+            self.history.capturar(self.reserva_manager)
+            return self.reserva_manager.cancelar_serie(serie_id, usuario_logado, history=self.history)
+
+    def cancelar_ocorrencia(self, serie_id: int, data: str, usuario_logado: Usuario) -> SerieReserva:
+        with self._mutacao():
+            self.history.capturar(self.reserva_manager)
+            return self.reserva_manager.cancelar_ocorrencia(serie_id, data, usuario_logado, history=self.history)
+
+    def listar_minhas_series(self, usuario_logado: Usuario) -> List[SerieReserva]:
+        return self.reserva_manager.listar_series_por_usuario(usuario_logado.login)
+
+    def listar_ocorrencias_serie(self, serie_id: int, usuario_logado: Usuario, data_inicio: str | None = None,
+                                 data_fim: str | None = None) -> Iterator[Reserva]:
+        """Gerador das ocorrências (opcionalmente só entre as datas); nada é materializado antes do consumo."""
+        return self.reserva_manager.ocorrencias_da_serie(serie_id, usuario_logado, data_inicio, data_fim)
 
     def consultar_disponibilidade(self, data: str) -> Dict[str, List[str]]:
         return self.reserva_manager.consultar_disponibilidade(data)
 
+    def consultar_janelas_livres(self, data: str, sala_ids: List[int] | None = None) -> Dict[int, List[str]]:
+        return self.reserva_manager.consultar_janelas_livres(data, sala_ids)
+
+    def sala_livre(self, sala_id: int, data: str, hora_inicio: str, hora_fim: str) -> bool:
+        return self.reserva_manager.sala_livre(sala_id, data, hora_inicio, hora_fim)
+
+    def buscar_salas_disponiveis(self, capacidade_min: int = 0, recursos: List[str] | None = None,
+                                 data: str | None = None, hora_inicio: str | None = None,
+                                 hora_fim: str | None = None) -> List[Sala]:
+        return self.sala_manager.buscar_salas(capacidade_min, recursos, data, hora_inicio, hora_fim)
+
+    def nome_da_sala(self, sala_id: int) -> str:
+        return self.sala_manager.nome_da_sala(sala_id)
+
     def listar_minhas_reservas(self, usuario: Usuario) -> List[Reserva]:
-        return [r for r in self.reserva_dao.list_all() if r.usuario.login == usuario.login]
+        return self.reserva_manager.listar_reservas_por_usuario(usuario.login)
+
+    # Variantes paginadas (limite + cursor opaco devolvido em Pagina.proximo) e
+    # iteradores preguiçosos, que leem o DAO uma página por vez.
+    def paginar_minhas_reservas(self, usuario: Usuario, limite: int = 50, cursor: str | None = None) -> Pagina:
+        return self.reserva_manager.paginar_reservas_por_usuario(usuario.login, limite, cursor)
+
+    def iterar_minhas_reservas(self, usuario: Usuario) -> Iterator[Reserva]:
+        return self.reserva_manager.iterar_reservas_por_usuario(usuario.login)
 
     # --- ADMIN ---
     def _check_admin(self, usuario: Usuario):
@@ -72,13 +238,15 @@ class FacadeSingletonController:
 
     def admin_cadastrar_sala(self, usuario_logado: Usuario, nome: str, capacidade: int, recursos: List[str]) -> Sala:
         self._check_admin(usuario_logado)
-        self.history.push(self.reserva_manager._snapshot())
-        return self.sala_manager.cadastrar_sala(nome, capacidade, recursos)
+        with self._estado.escrita():
+            self.history.capturar(self.reserva_manager)
+            return self.sala_manager.cadastrar_sala(nome, capacidade, recursos, history=self.history)
 
     def admin_excluir_sala(self, usuario_logado: Usuario, sala_id: int):
         self._check_admin(usuario_logado)
-        self.history.push(self.reserva_manager._snapshot())
-        self.sala_manager.excluir_sala(sala_id)
+        with self._estado.escrita():
+            self.history.capturar(self.reserva_manager)
+            self.sala_manager.excluir_sala(sala_id, history=self.history)
 
     def admin_listar_salas(self, usuario_logado: Usuario) -> List[Sala]:
         self._check_admin(usuario_logado)
@@ -88,36 +256,120 @@ class FacadeSingletonController:
         self._check_admin(usuario_logado)
         return self.user_manager.listar_usuarios()
 
+    def admin_paginar_salas(self, usuario_logado: Usuario, limite: int = 50, cursor: str | None = None) -> Pagina:
+        self._check_admin(usuario_logado)
+        return self.sala_manager.paginar_salas(limite, cursor)
+
+    def admin_iterar_salas(self, usuario_logado: Usuario) -> Iterator[Sala]:
+        self._check_admin(usuario_logado)
+        return self.sala_manager.iterar_salas()
+
+    def admin_paginar_usuarios(self, usuario_logado: Usuario, limite: int = 50, cursor: str | None = None) -> Pagina:
+        self._check_admin(usuario_logado)
+        return self.user_manager.paginar_usuarios(limite, cursor)
+
+    def admin_iterar_usuarios(self, usuario_logado: Usuario) -> Iterator[Usuario]:
+        self._check_admin(usuario_logado)
+        return self.user_manager.iterar_usuarios()
+
     def admin_bloquear_usuario(self, usuario_logado: Usuario, login_alvo: str):
         self._check_admin(usuario_logado)
         if usuario_logado.login == login_alvo:
             raise ValidarCamposException("Administrador não pode bloquear a si mesmo.")
-        self.history.push(self.reserva_manager._snapshot())
-        self.user_manager.bloquear_usuario(login_alvo)
+        with self._estado.escrita():
+            self.history.capturar(self.reserva_manager)
+            self.user_manager.bloquear_usuario(login_alvo, history=self.history)
+        self.sessoes.remover_login(login_alvo)
+
+    def admin_excluir_usuario(self, usuario_logado: Usuario, login_alvo: str):
+        self._check_admin(usuario_logado)
+        if usuario_logado.login == login_alvo:
+            raise ValidarCamposException("Administrador não pode excluir a si mesmo.")
+        with self._estado.escrita():
+            self.history.capturar(self.reserva_manager)
+            self.reserva_manager.excluir_usuario(login_alvo, history=self.history)
+        self.sessoes.remover_login(login_alvo)
 
-    def admin_gerar_relatorio_uso(self, usuario_logado: Usuario) -> Dict[str, int]:
+    def admin_importar_dados(self, usuario_logado: Usuario, usuarios: str | None = None, salas: str | None = None,
+                             reservas: str | None = None, relatorio_erros: str = "erros_importacao.csv",
+                             bloco: int = 1000) -> ResumoImportacao:
+        """Importa arquivos CSV/JSONL em blocos; a importação inteira é desfeita com um único desfazer()."""
+        self._check_admin(usuario_logado)
+        if not (usuarios or salas or reservas):
+            raise ValidarCamposException("Informe ao menos um arquivo para importar.")
+        if bloco <= 0:
+            raise ValidarCamposException("O tamanho do bloco deve ser maior que zero.")
+        importador = Importador(self.user_manager, self.sala_manager, self.reserva_manager, self.history, bloco)
+        with self._estado.escrita():
+            return importador.importar(usuarios, salas, reservas, relatorio_erros)
+
+    def admin_gerar_relatorio_uso(self, usuario_logado: Usuario) -> Dict[int, int]:
         self._check_admin(usuario_logado)
         return self.reserva_manager.gerar_relatorio_uso_salas()
 
+    def admin_gerar_relatorio_uso_por_periodo(self, usuario_logado: Usuario, periodo: str) -> Dict[int, Dict[str, int]]:
+        self._check_admin(usuario_logado)
+        return self.reserva_manager.gerar_relatorio_uso_por_periodo(periodo)
+
+    def admin_gerar_relatorio_analitico(self, usuario_logado: Usuario, data_inicio: str, data_fim: str) -> Dict[str, object]:
+        """Taxa de ocupação, mapa de calor por hora, horário de pico e uso por usuário/mês (via NumPy)."""
+        self._check_admin(usuario_logado)
+        ini, fim = data_para_ordinal(data_inicio), data_para_ordinal(data_fim)
+        if fim < ini:
+            raise ValidarCamposException("A data final deve ser igual ou posterior à data inicial.")
+        if self.particoes:
+            return self.reserva_manager.gerar_relatorio_analitico(ini, fim)   # cada partição calcula a sua parte
+        if self._analise is None:
+            from analytics import AnaliseReservas  # NumPy só é exigido por este relatório
+            self._analise = AnaliseReservas(self.reserva_dao, HORA_ABERTURA, HORA_FECHAMENTO)
+        return self._analise.relatorio(ini, fim)
+
     def admin_listar_reservas_usuario(self, usuario_logado: Usuario, login_alvo: str) -> List[Reserva]:
         self._check_admin(usuario_logado)
         return self.reserva_manager.listar_reservas_por_usuario(login_alvo)
 
+    def admin_paginar_reservas_usuario(self, usuario_logado: Usuario, login_alvo: str, limite: int = 50,
+                                       cursor: str | None = None) -> Pagina:
+        self._check_admin(usuario_logado)
+        return self.reserva_manager.paginar_reservas_por_usuario(login_alvo, limite, cursor)
+
+    def admin_listar_reservas_por_periodo(self, usuario_logado: Usuario, data_inicio: str, data_fim: str,
+                                          sala_id: int | None = None) -> List[Reserva]:
+        """Reservas ativas (inclusive ocorrências de séries) entre as datas, em ordem cronológica."""
+        self._check_admin(usuario_logado)
+        return self.reserva_manager.listar_reservas_por_periodo(data_inicio, data_fim, sala_id)
+
     # --- MEMENTO: Undo/Redo ---
     def desfazer(self) -> str:
-        snap = self.history.undo(self.reserva_manager._snapshot())
-        if not snap:
-            return "Nada para desfazer."
-        self.reserva_manager.restore_from(snap)
+        with self._estado.escrita():
+            if not self.history.desfazer(self.reserva_manager):
+                return "Nada para desfazer."
         return "Operação desfeita com sucesso."
 
     def refazer(self) -> str:
-        snap = self.history.redo(self.reserva_manager._snapshot())
-        if not snap:
-            return "Nada para refazer."
-        self.reserva_manager.restore_from(snap)
+        with self._estado.escrita():
+            if not self.history.refazer(self.reserva_manager):
+                return "Nada para refazer."
         return "Operação refeita com sucesso."
 
+    def admin_estatisticas_historico(self, usuario_logado: Usuario) -> Dict[str, object]:
+        self._check_admin(usuario_logado)
+        if not hasattr(self.history, "stats"):
+            return {}
+        return self.history.stats()
+
+    # --- Instrumentação ---
+    def admin_metricas(self, usuario_logado: Usuario) -> Dict[str, object]:
+        """Chamadas, erros por tipo e percentis de latência (µs) por operação; vazio se desligada."""
+        self._check_admin(usuario_logado)
+        return self.metricas.exportar() if self.metricas else {}
+
+    def admin_exportar_metricas_prometheus(self, usuario_logado: Usuario, caminho: str) -> str:
+        self._check_admin(usuario_logado)
+        if not self.metricas:
+            raise ValidarCamposException("Instrumentação desligada (use instrumentacao=True).")
+        return EscritorPrometheus(self.metricas, caminho).escrever()
+
     # --- STRATEGY: alternar política de conflito ---
     def definir_estrategia_conflito(self, modo: str) -> str:
         if modo.lower().startswith("leni"):
@@ -1,7 +1,12 @@
 # dao_factory.py (Abstract Factory)
+import os
 from abc import ABC, abstractmethod
-from repository import UserDAO, SalaDAO, ReservaDAO
-from infra_ram import UserDAORAM, SalaDAORAM, ReservaDAORAM
+from typing import Any, Dict
+from repository import UserDAO, SalaDAO, ReservaDAO, SerieDAO
+from infra_ram import UserDAORAM, SalaDAORAM, ReservaDAORAM, SerieDAORAM
+from infra_journal import (Journal, JournalRecovery, UserDAOJournal, SalaDAOJournal, ReservaDAOJournal,
+                           SerieDAOJournal)
+from infra_sqlite import SQLiteDatabase, UserDAOSQLite, SalaDAOSQLite, ReservaDAOSQLite, SerieDAOSQLite
 
 class DAOFactory(ABC):
     @abstractmethod
@@ -10,13 +15,81 @@ class DAOFactory(ABC):
     def salas(self) -> SalaDAO: ...
     @abstractmethod
     def reservas(self) -> ReservaDAO: ...
+    @abstractmethod
+    def series(self) -> SerieDAO: ...
 
 class RAMDAOFactory(DAOFactory):
     def __init__(self):
         self._user = UserDAORAM()
         self._sala = SalaDAORAM()
         self._reserva = ReservaDAORAM()
+        self._serie = SerieDAORAM()
+
+    def users(self) -> UserDAO: return self._user
+    def salas(self) -> SalaDAO: return self._sala
+    def reservas(self) -> ReservaDAO: return self._reserva
+    def series(self) -> SerieDAO: return self._serie
+
+class SQLiteDAOFactory(DAOFactory):
+    """DAOs persistentes em SQLite (WAL + pool de leitores) compartilhando um único banco."""
+    def __init__(self, caminho: str = "reservas.db", leitores: int = 4):
+        self.db = SQLiteDatabase(caminho, leitores=leitores)
+        self._user = UserDAOSQLite(self.db)
+        self._sala = SalaDAOSQLite(self.db)
+        self._reserva = ReservaDAOSQLite(self.db)
+        self._serie = SerieDAOSQLite(self.db)
 
     def users(self) -> UserDAO: return self._user
     def salas(self) -> SalaDAO: return self._sala
     def reservas(self) -> ReservaDAO: return self._reserva
+    def series(self) -> SerieDAO: return self._serie
+
+class JournaledRAMDAOFactory(DAOFactory):
+    """
+    DAOs em RAM com durabilidade: cada mutação é anexada a um journal binário
+    (fsync em grupo a cada `intervalo_flush` s ou `lote` registros; 0 = fsync por
+    operação). Na criação, o estado é reconstruído a partir do checkpoint + journal;
+    a cada `checkpoint_registros` registros um novo checkpoint trunca o log.
+    """
+    def __init__(self, diretorio: str = "dados", intervalo_flush: float = 0.05, lote: int = 256,
+                 checkpoint_registros: int = 100_000):
+        os.makedirs(diretorio, exist_ok=True)
+        self._user = UserDAOJournal()
+        self._sala = SalaDAOJournal()
+        self._reserva = ReservaDAOJournal()
+        self._serie = SerieDAOJournal()
+        self._recovery = JournalRecovery(diretorio)
+        self.recuperacao = self._recovery.recuperar(self._user, self._sala, self._reserva, self._serie)
+        self.journal = Journal(self._recovery.caminho_journal, proximo_lsn=self.recuperacao["proximo_lsn"],
+                               intervalo_flush=intervalo_flush, lote=lote,
+                               ao_atingir_checkpoint=self.checkpoint, checkpoint_registros=checkpoint_registros)
+        for dao in (self._user, self._sala, self._reserva, self._serie):
+            dao.journal = self.journal
+
+    def users(self) -> UserDAO: return self._user
+    def salas(self) -> SalaDAO: return self._sala
+    def reservas(self) -> ReservaDAO: return self._reserva
+    def series(self) -> SerieDAO: return self._serie
+
+    def checkpoint(self) -> None:
+        self._recovery.gravar_checkpoint(self.journal, self._user, self._sala, self._reserva, self._serie)
+
+    def fechar(self) -> None:
+        self.journal.fechar()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"journal": self.journal.stats(), "recuperacao": self.recuperacao}
+
+def criar_dao_factory(backend: str = "ram", **opcoes) -> DAOFactory:
+    """
+    Seleciona a fábrica pela configuração: "ram" (padrão), "ram-journal"
+    (opções: diretorio, intervalo_flush, lote, checkpoint_registros) ou
+    "sqlite" (opções: caminho, leitores).
+    """
+    if backend == "sqlite":
+        return SQLiteDAOFactory(**opcoes)
+    if backend == "ram-journal":
+        return JournaledRAMDAOFactory(**opcoes)
+    if backend == "ram":
+        return RAMDAOFactory()
+    raise ValueError(f"Backend de persistência desconhecido: '{backend}'.")
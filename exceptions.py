@@ -22,4 +22,8 @@ class LimiteDeReservasException(Exception):
 
 class UsuarioBloqueadoException(Exception):
     """Exceção para quando um usuário bloqueado tenta fazer uma reserva."""
+    pass
+
+class ParticaoIndisponivelException(Exception):
+    """Exceção para quando o processo de uma partição (modo particionado) deixa de responder."""
     pass
\ No newline at end of file
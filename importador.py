@@ -0,0 +1,199 @@
+# importador.py — importação em massa de usuários, salas e reservas (CSV ou JSONL)
+#
+# Os arquivos são lidos por geradores e processados em blocos de `bloco` linhas,
+# então a memória não cresce com o tamanho do arquivo. Cada bloco passa pelas
+# operações em lote dos managers (mesmas validações do cadastro unitário, gravação
+# com add_many) e as linhas rejeitadas vão para um CSV de erros escrito aos poucos.
+# A importação inteira vira UMA entrada de histórico: um snapshot antes de começar
+# (modo "snapshot") ou um DeltaComposto com tudo o que foi criado (modo "delta").
+#
+# Colunas (cabeçalho no CSV, chaves no JSONL):
+#   usuários: nome, login, senha[, perfil]
+#   salas:    nome, capacidade[, recursos]   (recursos separados por ";" no CSV, ou lista no JSONL)
+#   reservas: login, sala_id OU sala (nome), data, hora_inicio, hora_fim
+import csv
+import json
+import os
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from models import PedidoReserva
+from exceptions import ValidarCamposException
+from memento import Delta, DeltaComposto
+
+Registro = Tuple[int, Dict[str, Any]]   # (linha no arquivo, campos)
+
+def ler_registros(caminho: str, formato: str | None = None) -> Iterator[Registro]:
+    """Gera os registros um a um; o formato sai da extensão (.csv / .jsonl) se não for informado."""
+    formato = formato or os.path.splitext(caminho)[1].lstrip(".").lower()
+    with open(caminho, newline="", encoding="utf-8-sig") as f:
+        if formato == "csv":
+            leitor = csv.DictReader(f)
+            for reg in leitor:
+                yield leitor.line_num, reg
+        elif formato in ("jsonl", "ndjson"):
+            for n, linha in enumerate(f, 1):
+                if not linha.strip():
+                    continue
+                try:
+                    reg = json.loads(linha)
+                except json.JSONDecodeError as e:
+                    reg = {"_erro": f"JSON inválido: {e.msg}"}
+                yield n, reg if isinstance(reg, dict) else {"_erro": "Cada linha deve ser um objeto JSON."}
+        else:
+            raise ValidarCamposException(f"Formato de importação não suportado: '{formato}' (use csv ou jsonl).")
+
+def em_blocos(itens: Iterable[Any], tamanho: int) -> Iterator[List[Any]]:
+    it = iter(itens)
+    while bloco := list(islice(it, tamanho)):
+        yield bloco
+
+def _texto(reg: Dict[str, Any], campo: str, padrao: str | None = None) -> str:
+    if "_erro" in reg:
+        raise ValidarCamposException(reg["_erro"])
+    valor = reg.get(campo)
+    if valor is None or str(valor).strip() == "":
+        if padrao is not None:
+            return padrao
+        raise ValidarCamposException(f"Campo obrigatório ausente: '{campo}'.")
+    return str(valor).strip()
+
+def _inteiro(reg: Dict[str, Any], campo: str) -> int:
+    valor = _texto(reg, campo)
+    try:
+        return int(valor)
+    except ValueError:
+        raise ValidarCamposException(f"Campo '{campo}' deve ser um número inteiro: '{valor}'.")
+
+def _recursos(reg: Dict[str, Any]) -> List[str]:
+    valor = reg.get("recursos") or []
+    if isinstance(valor, str):
+        valor = valor.replace(",", ";").split(";")
+    return [str(r).strip() for r in valor if str(r).strip()]
+
+@dataclass
+class ResumoImportacao:
+    criados: Dict[str, int] = field(default_factory=lambda: {"usuarios": 0, "salas": 0, "reservas": 0})
+    rejeitados: Dict[str, int] = field(default_factory=lambda: {"usuarios": 0, "salas": 0, "reservas": 0})
+    relatorio_erros: Optional[str] = None   # None = nenhuma linha rejeitada
+
+    def __str__(self):
+        partes = [f"{tipo}: {self.criados[tipo]} criados, {self.rejeitados[tipo]} rejeitados" for tipo in self.criados]
+        texto = " | ".join(partes)
+        return texto + (f" (erros em {self.relatorio_erros})" if self.relatorio_erros else "")
+
+class _HistoricoDaImportacao:
+    """Recebe os deltas de cada bloco; a importação registra todos juntos no fim."""
+    def __init__(self):
+        self.deltas: List[Delta] = []
+
+    def capturar(self, originator):
+        pass
+
+    def registrar(self, delta: Delta):
+        self.deltas.append(delta)
+
+class _RelatorioErros:
+    """CSV de linhas rejeitadas, aberto só no primeiro erro."""
+    COLUNAS = ["tipo", "arquivo", "linha", "erro", "mensagem", "registro"]
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self._arquivo = None
+        self._escritor = None
+
+    def anotar(self, tipo: str, arquivo: str, linha: int, reg: Dict[str, Any], erro: Exception) -> None:
+        if self._escritor is None:
+            self._arquivo = open(self.caminho, "w", newline="", encoding="utf-8")
+            self._escritor = csv.writer(self._arquivo)
+            self._escritor.writerow(self.COLUNAS)
+        reg = {k: ("***" if k == "senha" else v) for k, v in reg.items()}   # o relatório não guarda senhas
+        self._escritor.writerow([tipo, arquivo, linha, type(erro).__name__, str(erro),
+                                 json.dumps(reg, ensure_ascii=False, default=str)])
+
+    def fechar(self) -> Optional[str]:
+        if self._arquivo is None:
+            return None
+        self._arquivo.close()
+        return self.caminho
+
+class Importador:
+    def __init__(self, user_manager, sala_manager, reserva_manager, history, bloco: int = 1000):
+        self.um = user_manager
+        self.sm = sala_manager
+        self.rm = reserva_manager
+        self.history = history
+        self.bloco = bloco
+
+    def importar(self, usuarios: str | None = None, salas: str | None = None, reservas: str | None = None,
+                 relatorio_erros: str = "erros_importacao.csv") -> ResumoImportacao:
+        """Importa na ordem usuários -> salas -> reservas (as reservas podem citar os recém-criados)."""
+        resumo = ResumoImportacao()
+        erros = _RelatorioErros(relatorio_erros)
+        acumulado = _HistoricoDaImportacao()
+        self.history.capturar(self.rm)
+        try:
+            if usuarios:
+                self._usuarios(usuarios, acumulado, erros, resumo)
+            if salas:
+                self._salas(salas, acumulado, erros, resumo)
+            if reservas:
+                self._reservas(reservas, acumulado, erros, resumo)
+        finally:
+            if acumulado.deltas:
+                self.history.registrar(DeltaComposto(acumulado.deltas))
+            resumo.relatorio_erros = erros.fechar()
+        return resumo
+
+    def _processar(self, tipo: str, caminho: str, converter, gravar, erros: _RelatorioErros,
+                   resumo: ResumoImportacao) -> None:
+        """converter(reg) -> item ou exceção; gravar(itens) -> lista alinhada de criado/exceção."""
+        for bloco in em_blocos(ler_registros(caminho), self.bloco):
+            validos: List[Tuple[int, Dict[str, Any], Any]] = []
+            rejeitados: List[Tuple[int, Dict[str, Any], Exception]] = []
+            for linha, reg in bloco:
+                try:
+                    validos.append((linha, reg, converter(reg)))
+                except ValidarCamposException as e:
+                    rejeitados.append((linha, reg, e))
+            resultados = gravar([item for _, _, item in validos]) if validos else []
+            for (linha, reg, _), res in zip(validos, resultados):
+                if isinstance(res, Exception):
+                    rejeitados.append((linha, reg, res))
+            resumo.criados[tipo] += len(bloco) - len(rejeitados)
+            resumo.rejeitados[tipo] += len(rejeitados)
+            for linha, reg, e in sorted(rejeitados, key=lambda t: t[0]):
+                erros.anotar(tipo, caminho, linha, reg, e)
+
+    def _usuarios(self, caminho, acumulado, erros, resumo):
+        def converter(reg):
+            return (_texto(reg, "nome"), _texto(reg, "login"), _texto(reg, "senha"), _texto(reg, "perfil", "usuario"))
+        self._processar("usuarios", caminho, converter,
+                        lambda itens: self.um.cadastrar_usuarios_em_lote(itens, history=acumulado), erros, resumo)
+
+    def _salas(self, caminho, acumulado, erros, resumo):
+        def converter(reg):
+            return _texto(reg, "nome"), _inteiro(reg, "capacidade"), _recursos(reg)
+        self._processar("salas", caminho, converter,
+                        lambda itens: self.sm.cadastrar_salas_em_lote(itens, history=acumulado), erros, resumo)
+
+    def _reservas(self, caminho, acumulado, erros, resumo):
+        por_nome: Dict[str, int] = {}
+        for s in self.sm.listar_salas():
+            por_nome.setdefault(s.nome, s.sala_id)
+
+        def converter(reg):
+            if reg.get("sala_id") not in (None, ""):
+                sala_id = _inteiro(reg, "sala_id")
+            else:
+                nome = _texto(reg, "sala")
+                if nome not in por_nome:
+                    raise ValidarCamposException(f"Sala '{nome}' não encontrada.")
+                sala_id = por_nome[nome]
+            return PedidoReserva(sala_id=sala_id, data=_texto(reg, "data"), hora_inicio=_texto(reg, "hora_inicio"),
+                                 hora_fim=_texto(reg, "hora_fim"), login=_texto(reg, "login"))
+
+        def gravar(pedidos):
+            return [res.reserva if res.ok else res.erro
+                    for res in self.rm.cadastrar_reservas_em_lote(pedidos, history=acumulado)]
+        self._processar("reservas", caminho, converter, gravar, erros, resumo)
@@ -0,0 +1,399 @@
+# infra_journal.py (Durabilidade opcional p/ os DAOs em RAM) — journal append-only + checkpoint
+#
+# Cada mutação vira um registro binário compacto:
+#   cabeçalho <IQBI> = (tamanho do payload, LSN, operação, crc32 do payload) + payload (marshal)
+# Os registros vão para um buffer e são gravados/fsync em grupo (group commit) a cada
+# `intervalo_flush` segundos ou quando `lote` registros se acumulam. Na inicialização o
+# estado em RAM é reconstruído a partir do último checkpoint + replay do journal.
+import marshal
+import os
+import struct
+import threading
+import time
+import zlib
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from models import Usuario, Sala, Reserva, SerieReserva, RegraRecorrencia, ordinal_para_data, minutos_para_hora
+from infra_ram import UserDAORAM, SalaDAORAM, ReservaDAORAM, SerieDAORAM
+
+_CABECALHO = struct.Struct("<IQBI")
+_MAGICO_CHECKPOINT = b"RSVCKP01"
+
+# Operações registradas
+U_PUT, U_DEL, U_ALL = 1, 2, 3
+S_PUT, S_DEL, S_ALL = 11, 12, 13
+R_PUT, R_DEL, R_ALL = 21, 22, 23
+T_PUT, T_DEL, T_ALL = 31, 32, 33
+
+# ---------- (de)serialização compacta das entidades ----------
+def _u(u: Usuario) -> Tuple:
+    return (u.nome, u.login, u.senha, u.perfil, u.bloqueado)
+
+def _usuario(t: Tuple) -> Usuario:
+    return Usuario(nome=t[0], login=t[1], senha=t[2], perfil=t[3], bloqueado=t[4])
+
+def _s(s: Sala) -> Tuple:
+    return (s.sala_id, s.nome, s.capacidade, tuple(s.recursos))
+
+def _sala(t: Tuple) -> Sala:
+    return Sala(sala_id=t[0], nome=t[1], capacidade=t[2], recursos=list(t[3]))
+
+def _r(r: Reserva) -> Tuple:
+    return (r.reserva_id, r.login, r.sala_id, r.data_ord, r.inicio_min, r.fim_min, r.status)
+
+# Registros antigos traziam o usuário e a sala inteiros (tuplas _u/_s) no lugar de login/sala_id.
+def _ref_usuario(v: Any) -> str:
+    return v[1] if isinstance(v, tuple) else v
+
+def _ref_sala(v: Any) -> int:
+    return v[0] if isinstance(v, tuple) else v
+
+def _reserva(t: Tuple) -> Reserva:
+    return Reserva(t[0], _ref_usuario(t[1]), _ref_sala(t[2]), t[3], t[4], t[5], t[6])
+
+def _t(t: SerieReserva) -> Tuple:
+    g = t.regra
+    return (t.serie_id, t.login, t.sala_id, g.dias_semana, g.inicio_ord, g.fim_ord, g.inicio_min, g.fim_min,
+            tuple(sorted(g.excecoes_ord)), t.status)
+
+def _serie(t: Tuple) -> SerieReserva:
+    regra = RegraRecorrencia(dias_semana=t[3], data_inicio=ordinal_para_data(t[4]), data_fim=ordinal_para_data(t[5]),
+                             hora_inicio=minutos_para_hora(t[6]), hora_fim=minutos_para_hora(t[7]),
+                             excecoes=tuple(ordinal_para_data(o) for o in t[8]))
+    return SerieReserva(serie_id=t[0], login=_ref_usuario(t[1]), sala_id=_ref_sala(t[2]), regra=regra, status=t[9])
+
+def _codificar(lsn: int, op: int, payload: Any) -> bytes:
+    corpo = marshal.dumps(payload)
+    return _CABECALHO.pack(len(corpo), lsn, op, zlib.crc32(corpo)) + corpo
+
+def ler_registros(caminho: str) -> Iterator[Tuple[int, int, Any, int]]:
+    """
+    Gera (lsn, op, payload, offset_final) dos registros íntegros. Para no primeiro
+    registro truncado/corrompido (cauda de uma gravação interrompida por queda).
+    """
+    if not os.path.exists(caminho):
+        return
+    with open(caminho, "rb") as f:
+        offset = 0
+        while True:
+            cab = f.read(_CABECALHO.size)
+            if len(cab) < _CABECALHO.size:
+                return
+            tamanho, lsn, op, crc = _CABECALHO.unpack(cab)
+            corpo = f.read(tamanho)
+            if len(corpo) < tamanho or zlib.crc32(corpo) != crc:
+                return
+            offset += _CABECALHO.size + tamanho
+            yield lsn, op, marshal.loads(corpo), offset
+
+class Journal:
+    """Arquivo append-only com group commit feito por uma thread de flush."""
+    def __init__(self, caminho: str, proximo_lsn: int = 1, intervalo_flush: float = 0.05, lote: int = 256,
+                 ao_atingir_checkpoint: Callable[[], None] | None = None, checkpoint_registros: int = 0):
+        self.caminho = caminho
+        self.lock = threading.RLock()           # mutação em RAM + registro são atômicos
+        self._cond = threading.Condition(threading.Lock())
+        self._arquivo = open(caminho, "ab", buffering=0)
+        self._buffer = bytearray()
+        self._pendentes = 0
+        self._lsn = proximo_lsn
+        self._intervalo = intervalo_flush
+        self._lote = lote
+        self._ao_atingir_checkpoint = ao_atingir_checkpoint
+        self._checkpoint_registros = checkpoint_registros
+        self._desde_checkpoint = 0
+        self._fechado = False
+        # métricas
+        self.registros = 0
+        self.bytes_gravados = 0
+        self.fsyncs = 0
+        self.ns_registro = 0
+        self._thread: Optional[threading.Thread] = None
+        if intervalo_flush > 0:
+            self._thread = threading.Thread(target=self._loop_flush, name="journal-flush", daemon=True)
+            self._thread.start()
+
+    @property
+    def ultimo_lsn(self) -> int:
+        return self._lsn - 1
+
+    def registrar(self, op: int, payload: Any) -> None:
+        t0 = time.perf_counter_ns()
+        with self._cond:
+            self._buffer += _codificar(self._lsn, op, payload)
+            self._lsn += 1
+            self._pendentes += 1
+            self.registros += 1
+            self._desde_checkpoint += 1
+            if self._pendentes >= self._lote:
+                self._cond.notify()
+        if self._intervalo <= 0:
+            self.flush()
+        self.ns_registro += time.perf_counter_ns() - t0
+
+    def flush(self) -> None:
+        with self._cond:
+            dados, self._buffer = bytes(self._buffer), bytearray()
+            self._pendentes = 0
+            if dados:
+                self._arquivo.write(dados)
+                os.fsync(self._arquivo.fileno())
+                self.bytes_gravados += len(dados)
+                self.fsyncs += 1
+
+    def _loop_flush(self) -> None:
+        while True:
+            with self._cond:
+                if self._pendentes < self._lote and not self._fechado:
+                    self._cond.wait(self._intervalo)
+                fechado = self._fechado
+            self.flush()
+            if (self._ao_atingir_checkpoint and self._checkpoint_registros
+                    and self._desde_checkpoint >= self._checkpoint_registros):
+                self._ao_atingir_checkpoint()
+            if fechado:
+                return
+
+    def truncar(self) -> None:
+        """Descarta o conteúdo do journal (chamado com self.lock após um checkpoint)."""
+        with self._cond:
+            self._buffer.clear()
+            self._pendentes = 0
+            self._arquivo.truncate(0)
+            os.fsync(self._arquivo.fileno())
+            self._desde_checkpoint = 0
+
+    def fechar(self) -> None:
+        with self._cond:
+            self._fechado = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join()
+        self.flush()
+        self._arquivo.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "registros": self.registros,
+            "bytes_gravados": self.bytes_gravados,
+            "fsyncs": self.fsyncs,
+            "registros_por_fsync": (self.registros / self.fsyncs) if self.fsyncs else 0.0,
+            "ns_medio_por_registro": (self.ns_registro / self.registros) if self.registros else 0.0,
+            "ultimo_lsn": self.ultimo_lsn,
+        }
+
+# ---------- DAOs em RAM que registram cada mutação ----------
+class _JournalMixin:
+    journal: Optional[Journal] = None   # None durante o replay: nada é registrado
+
+    def _lock(self):
+        return self.journal.lock if self.journal is not None else nullcontext()
+
+    def _registrar(self, op: int, payload: Any) -> None:
+        if self.journal is not None:
+            self.journal.registrar(op, payload)
+
+class UserDAOJournal(_JournalMixin, UserDAORAM):
+    # delete_by_login/remover/reinserir passam por delete/add e já ficam registrados
+    def add(self, u: Usuario) -> None:
+        with self._lock():
+            super().add(u)
+            self._registrar(U_PUT, _u(u))
+
+    def update(self, u: Usuario) -> None:
+        with self._lock():
+            super().update(u)
+            self._registrar(U_PUT, _u(u))
+
+    def delete(self, uid: int) -> None:
+        with self._lock():
+            u = self._by_id.get(uid)
+            super().delete(uid)
+            if u:
+                self._registrar(U_DEL, u.login)
+
+    def replace_all(self, new_items: List[Usuario]) -> None:
+        with self._lock():
+            super().replace_all(new_items)
+            self._registrar(U_ALL, [_u(u) for u in new_items])
+
+    def _aplicar(self, op: int, p: Any) -> None:
+        if op == U_PUT:
+            u = _usuario(p)
+            if self.get_by_login(u.login):
+                UserDAORAM.update(self, u)
+            else:
+                UserDAORAM.add(self, u)
+        elif op == U_DEL:
+            self.delete_by_login(p)
+        elif op == U_ALL:
+            UserDAORAM.replace_all(self, [_usuario(t) for t in p])
+
+class SalaDAOJournal(_JournalMixin, SalaDAORAM):
+    def add(self, s: Sala) -> Sala:
+        with self._lock():
+            super().add(s)
+            self._registrar(S_PUT, _s(s))
+            return s
+
+    def delete(self, sala_id: int) -> bool:
+        with self._lock():
+            ok = super().delete(sala_id)
+            if ok:
+                self._registrar(S_DEL, sala_id)
+            return ok
+
+    def replace_all(self, new_items: List[Sala]) -> None:
+        with self._lock():
+            super().replace_all(new_items)
+            self._registrar(S_ALL, [_s(s) for s in new_items])
+
+    def reinserir(self, s: Sala) -> None:
+        with self._lock():
+            super().reinserir(s)
+            self._registrar(S_PUT, _s(s))
+
+    def _aplicar(self, op: int, p: Any) -> None:
+        if op == S_PUT:
+            SalaDAORAM.reinserir(self, _sala(p))
+        elif op == S_DEL:
+            SalaDAORAM.delete(self, p)
+        elif op == S_ALL:
+            SalaDAORAM.replace_all(self, [_sala(t) for t in p])
+
+class ReservaDAOJournal(_JournalMixin, ReservaDAORAM):
+    # delete_by_usuario/remover passam por delete e já ficam registrados
+    def add(self, r: Reserva) -> Reserva:
+        with self._lock():
+            super().add(r)
+            self._registrar(R_PUT, _r(r))
+            return r
+
+    def update(self, r: Reserva) -> None:
+        with self._lock():
+            super().update(r)
+            self._registrar(R_PUT, _r(r))
+
+    def delete(self, rid: int) -> None:
+        with self._lock():
+            existia = rid in self._reservas
+            super().delete(rid)
+            if existia:
+                self._registrar(R_DEL, rid)
+
+    def replace_all(self, new_items: List[Reserva]) -> None:
+        with self._lock():
+            super().replace_all(new_items)
+            self._registrar(R_ALL, [_r(r) for r in new_items])
+
+    def reinserir(self, r: Reserva) -> None:
+        with self._lock():
+            super().reinserir(r)
+            self._registrar(R_PUT, _r(r))
+
+    def _aplicar(self, op: int, p: Any) -> None:
+        if op == R_PUT:
+            ReservaDAORAM.reinserir(self, _reserva(p))
+        elif op == R_DEL:
+            ReservaDAORAM.delete(self, p)
+        elif op == R_ALL:
+            ReservaDAORAM.replace_all(self, [_reserva(t) for t in p])
+
+class SerieDAOJournal(_JournalMixin, SerieDAORAM):
+    # delete_by_usuario/remover passam por delete e já ficam registrados
+    def add(self, t: SerieReserva) -> SerieReserva:
+        with self._lock():
+            super().add(t)
+            self._registrar(T_PUT, _t(t))
+            return t
+
+    def update(self, t: SerieReserva) -> None:
+        with self._lock():
+            super().update(t)
+            self._registrar(T_PUT, _t(t))
+
+    def delete(self, serie_id: int) -> None:
+        with self._lock():
+            existia = serie_id in self._series
+            super().delete(serie_id)
+            if existia:
+                self._registrar(T_DEL, serie_id)
+
+    def replace_all(self, new_items: List[SerieReserva]) -> None:
+        with self._lock():
+            super().replace_all(new_items)
+            self._registrar(T_ALL, [_t(t) for t in new_items])
+
+    def reinserir(self, t: SerieReserva) -> None:
+        with self._lock():
+            super().reinserir(t)
+            self._registrar(T_PUT, _t(t))
+
+    def _aplicar(self, op: int, p: Any) -> None:
+        if op == T_PUT:
+            SerieDAORAM.reinserir(self, _serie(p))
+        elif op == T_DEL:
+            SerieDAORAM.delete(self, p)
+        elif op == T_ALL:
+            SerieDAORAM.replace_all(self, [_serie(t) for t in p])
+
+class JournalRecovery:
+    """Lê checkpoint + journal de um diretório, reaplica nos DAOs e grava novos checkpoints."""
+    def __init__(self, diretorio: str):
+        self.diretorio = diretorio
+        self.caminho_journal = os.path.join(diretorio, "journal.bin")
+        self.caminho_checkpoint = os.path.join(diretorio, "checkpoint.bin")
+
+    def recuperar(self, users: UserDAOJournal, salas: SalaDAOJournal, reservas: ReservaDAOJournal,
+                  series: SerieDAOJournal) -> Dict[str, Any]:
+        t0 = time.perf_counter()
+        lsn_checkpoint, aplicados = 0, 0
+        alvo = {U_PUT: users, U_DEL: users, U_ALL: users,
+                S_PUT: salas, S_DEL: salas, S_ALL: salas,
+                R_PUT: reservas, R_DEL: reservas, R_ALL: reservas,
+                T_PUT: series, T_DEL: series, T_ALL: series}
+        if os.path.exists(self.caminho_checkpoint):
+            with open(self.caminho_checkpoint, "rb") as f:
+                if f.read(len(_MAGICO_CHECKPOINT)) == _MAGICO_CHECKPOINT:
+                    estado = marshal.loads(zlib.decompress(f.read()))
+                    lsn_checkpoint = estado["lsn"]
+                    users._aplicar(U_ALL, estado["users"])
+                    salas._aplicar(S_ALL, estado["salas"])
+                    reservas._aplicar(R_ALL, estado["reservas"])
+                    series._aplicar(T_ALL, estado.get("series", []))   # checkpoints anteriores às séries
+        ultimo_lsn, fim_valido = lsn_checkpoint, 0
+        for lsn, op, payload, fim_valido in ler_registros(self.caminho_journal):
+            if lsn <= lsn_checkpoint:
+                continue   # já contido no checkpoint (queda entre checkpoint e truncamento)
+            alvo[op]._aplicar(op, payload)
+            ultimo_lsn = lsn
+            aplicados += 1
+        # corta uma eventual cauda corrompida para que novos registros não fiquem atrás dela
+        if os.path.exists(self.caminho_journal) and os.path.getsize(self.caminho_journal) > fim_valido:
+            with open(self.caminho_journal, "r+b") as f:
+                f.truncate(fim_valido)
+        segundos = time.perf_counter() - t0
+        return {
+            "registros_reaplicados": aplicados,
+            "segundos": segundos,
+            "registros_por_segundo": (aplicados / segundos) if segundos else 0.0,
+            "proximo_lsn": ultimo_lsn + 1,
+        }
+
+    def gravar_checkpoint(self, journal: Journal, users: UserDAORAM, salas: SalaDAORAM,
+                          reservas: ReservaDAORAM, series: SerieDAORAM) -> None:
+        with journal.lock:   # nenhuma mutação entre a foto do estado e o truncamento
+            estado = {
+                "lsn": journal.ultimo_lsn,
+                "users": [_u(u) for u in users.all()],
+                "salas": [_s(s) for s in salas.all()],
+                "reservas": [_r(r) for r in reservas.all()],
+                "series": [_t(t) for t in series.all()],
+            }
+            temporario = self.caminho_checkpoint + ".tmp"
+            with open(temporario, "wb") as f:
+                f.write(_MAGICO_CHECKPOINT + zlib.compress(marshal.dumps(estado)))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporario, self.caminho_checkpoint)
+            journal.truncar()
@@ -1,14 +1,47 @@
 # infra_ram.py (Implementações em memória) — agora com all()/replace_all() p/ snapshots
-from typing import Dict, Iterable, Optional, List
-from models import Usuario, Sala, Reserva
-from repository import UserDAO, SalaDAO, ReservaDAO
+#
+# Concorrência: cada DAO serializa suas mutações (e a alocação de ids) num RLock
+# próprio, `_escrita`. Leituras pontuais não travam: os índices por (sala, data)
+# guardam tuplas imutáveis substituídas a cada mudança (copy-on-write), então um
+# leitor sempre enxerga uma versão completa da lista daquela chave.
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, Optional, List, Set, Tuple
+from models import Usuario, Sala, Reserva, SerieReserva, data_para_ordinal, dia_da_semana, normalizar_recurso
+from repository import UserDAO, SalaDAO, ReservaDAO, SerieDAO, Chave, EntradaReserva, ObservadorReservas
+from ocupacao import MapaOcupacao
+from relatorios import RelatorioUso
+
+def _com_item(tupla: Tuple, item) -> Tuple:
+    """Cópia ordenada da tupla com `item` inserido (copy-on-write)."""
+    pos = bisect_left(tupla, item)
+    return tupla[:pos] + (item,) + tupla[pos:]
+
+def _sem_item(tupla: Tuple, item) -> Tuple:
+    pos = bisect_left(tupla, item)
+    return tupla[:pos] + tupla[pos + 1:]
+
+def _pagina(ids: List[int], limite: int, apos: Chave) -> Tuple[List[int], Chave]:
+    """Até `limite` ids depois de `apos` numa lista ordenada e a chave para continuar (None = acabou)."""
+    pos = 0 if apos is None else bisect_right(ids, apos)
+    fatia = ids[pos:pos + limite + 1]
+    if len(fatia) > limite:
+        return fatia[:limite], fatia[limite - 1]
+    return fatia, None
+
+def _remover_id(ids: List[int], i: int) -> None:
+    pos = bisect_left(ids, i)
+    if pos < len(ids) and ids[pos] == i:
+        del ids[pos]
 
 # --------- USERS ----------
 class UserDAORAM(UserDAO):
     def __init__(self):
         self._by_id: Dict[int, Usuario] = {}
         self._id_of_login: Dict[str, int] = {}
+        self._ids: List[int] = []   # ids em ordem (paginação por chave); novos ids vão sempre para o fim
         self._next_id = 1
+        self._escrita = threading.RLock()
 
     def _alloc_id(self) -> int:
         nid = self._next_id
@@ -16,9 +49,11 @@ class UserDAORAM(UserDAO):
         return nid
 
     def add(self, u: Usuario) -> None:
-        uid = self._alloc_id()
-        self._by_id[uid] = u
-        self._id_of_login[u.login] = uid
+        with self._escrita:
+            uid = self._alloc_id()
+            self._by_id[uid] = u
+            self._id_of_login[u.login] = uid
+            self._ids.append(uid)
 
     def get_by_login(self, login: str) -> Optional[Usuario]:
         uid = self._id_of_login.get(login)
@@ -30,39 +65,98 @@ class UserDAORAM(UserDAO):
     def list_all(self) -> Iterable[Usuario]:
         return list(self._by_id.values())
 
+    def list_page(self, limite: int, apos: Chave = None) -> Tuple[List[Usuario], Chave]:
+        with self._escrita:
+            ids, proxima = _pagina(self._ids, limite, apos)
+            return [self._by_id[uid] for uid in ids], proxima
+
     def update(self, u: Usuario) -> None:
-        uid = self._id_of_login.get(u.login)
-        if uid:
-            self._by_id[uid] = u
+        with self._escrita:
+            uid = self._id_of_login.get(u.login)
+            if uid:
+                self._by_id[uid] = u
 
     def delete(self, uid: int) -> None:
-        u = self._by_id.pop(uid, None)
-        if u:
-            self._id_of_login.pop(u.login, None)
+        with self._escrita:
+            u = self._by_id.pop(uid, None)
+            if u:
+                self._id_of_login.pop(u.login, None)
+                _remover_id(self._ids, uid)
+
+    def delete_by_login(self, login: str) -> bool:
+        uid = self._id_of_login.get(login)
+        if not uid:
+            return False
+        self.delete(uid)
+        return True
 
     # ---- Suporte a Memento ----
     def all(self) -> List[Usuario]:
         return list(self._by_id.values())
 
     def replace_all(self, new_items: List[Usuario]) -> None:
-        self._by_id.clear()
-        self._id_of_login.clear()
-        self._next_id = 1
-        for u in new_items:
-            uid = self._alloc_id()
-            self._by_id[uid] = u
-            self._id_of_login[u.login] = uid
+        with self._escrita:
+            self._by_id.clear()
+            self._id_of_login.clear()
+            self._next_id = 1
+            for u in new_items:
+                uid = self._alloc_id()
+                self._by_id[uid] = u
+                self._id_of_login[u.login] = uid
+            self._ids = list(self._by_id)
+
+    # ---- Suporte a Deltas (undo/redo incremental) ----
+    def remover(self, u: Usuario) -> None:
+        self.delete_by_login(u.login)
+
+    def reinserir(self, u: Usuario) -> None:
+        self.add(u)
 
 # --------- SALAS ----------
 class SalaDAORAM(SalaDAO):
+    """
+    Índices para a busca por critérios: lista (capacidade, sala_id) ordenada
+    (bisect), índice invertido recurso normalizado -> ids das salas e a lista
+    ordenada dos ids, usada na paginação por chave.
+    """
     def __init__(self):
         self._salas: Dict[int, Sala] = {}
         self._next_id = 1
+        self._por_capacidade: List[Tuple[int, int]] = []
+        self._ids: List[int] = []
+        self._por_recurso: Dict[str, Set[int]] = {}
+        # sala_id -> (capacidade, recursos normalizados) efetivamente indexados
+        self._indexado: Dict[int, Tuple[int, Set[str]]] = {}
+        self._escrita = threading.RLock()
+
+    # ---- Índices ----
+    def _indexar(self, s: Sala) -> None:
+        recursos = {normalizar_recurso(r) for r in s.recursos if r.strip()}
+        insort(self._por_capacidade, (s.capacidade, s.sala_id))
+        insort(self._ids, s.sala_id)
+        for r in recursos:
+            self._por_recurso.setdefault(r, set()).add(s.sala_id)
+        self._indexado[s.sala_id] = (s.capacidade, recursos)
+
+    def _desindexar(self, sala_id: int) -> None:
+        item = self._indexado.pop(sala_id, None)
+        if item is None:
+            return
+        capacidade, recursos = item
+        del self._por_capacidade[bisect_left(self._por_capacidade, (capacidade, sala_id))]
+        _remover_id(self._ids, sala_id)
+        for r in recursos:
+            ids = self._por_recurso[r]
+            ids.discard(sala_id)
+            if not ids:
+                del self._por_recurso[r]
 
     def add(self, s: Sala) -> Sala:
-        s.sala_id = self._next_id
-        self._salas[s.sala_id] = s
-        self._next_id += 1
+        with self._escrita:
+            s.sala_id = self._next_id
+            self._salas[s.sala_id] = s
+            self._next_id += 1
+            self._indexar(s)
         return s
 
     def get_by_id(self, sala_id: int) -> Optional[Sala]:
@@ -71,53 +165,411 @@ class SalaDAORAM(SalaDAO):
     def list_all(self) -> Iterable[Sala]:
         return list(self._salas.values())
 
+    def list_page(self, limite: int, apos: Chave = None) -> Tuple[List[Sala], Chave]:
+        with self._escrita:
+            ids, proxima = _pagina(self._ids, limite, apos)
+            return [self._salas[sid] for sid in ids], proxima
+
     def delete(self, sala_id: int) -> bool:
-        return self._salas.pop(sala_id, None) is not None
+        with self._escrita:
+            self._desindexar(sala_id)
+            return self._salas.pop(sala_id, None) is not None
+
+    def find_by_criterios(self, capacidade_min: int = 0, recursos: Iterable[str] = ()) -> List[Sala]:
+        with self._escrita:   # os índices de salas mudam in-place; salas mudam raramente
+            return self._find_by_criterios(capacidade_min, recursos)
+
+    def _find_by_criterios(self, capacidade_min: int, recursos: Iterable[str]) -> List[Sala]:
+        chaves = {normalizar_recurso(r) for r in recursos if r.strip()}
+        pos = bisect_left(self._por_capacidade, (capacidade_min,))
+        if not chaves:
+            return [self._salas[sid] for _, sid in self._por_capacidade[pos:]]
+        conjuntos = sorted((self._por_recurso.get(r, set()) for r in chaves), key=len)
+        # parte do menor conjunto candidato: capacidade ou o recurso mais raro
+        if len(self._por_capacidade) - pos < len(conjuntos[0]):
+            ids = [sid for _, sid in self._por_capacidade[pos:] if all(sid in c for c in conjuntos)]
+        else:
+            ids = [sid for sid in conjuntos[0].intersection(*conjuntos[1:])
+                   if self._indexado[sid][0] >= capacidade_min]
+            ids.sort(key=lambda sid: (self._indexado[sid][0], sid))
+        return [self._salas[sid] for sid in ids]
 
     # ---- Suporte a Memento ----
     def all(self) -> List[Sala]:
         return list(self._salas.values())
 
     def replace_all(self, new_items: List[Sala]) -> None:
-        self._salas = {s.sala_id: s for s in new_items}
-        # recalcula próximo id (máximo existente + 1; se vazio, volta a 1)
-        self._next_id = (max(self._salas.keys()) + 1) if self._salas else 1
+        with self._escrita:
+            self._salas = {s.sala_id: s for s in new_items}
+            # recalcula próximo id (máximo existente + 1; se vazio, volta a 1)
+            self._next_id = (max(self._salas.keys()) + 1) if self._salas else 1
+            self._por_capacidade.clear()
+            self._ids.clear()
+            self._por_recurso.clear()
+            self._indexado.clear()
+            for s in self._salas.values():
+                self._indexar(s)
+
+    # ---- Suporte a Deltas (undo/redo incremental) ----
+    def remover(self, s: Sala) -> None:
+        self.delete(s.sala_id)
+
+    def reinserir(self, s: Sala) -> None:
+        """Recoloca a sala com o MESMO id (desfazer exclusão / refazer cadastro)."""
+        with self._escrita:
+            self._desindexar(s.sala_id)
+            self._salas[s.sala_id] = s
+            self._next_id = max(self._next_id, s.sala_id + 1)
+            self._indexar(s)
 
 # --------- RESERVAS ----------
 class ReservaDAORAM(ReservaDAO):
-    def __init__(self):
+    """
+    Além do dicionário principal, mantém índices secundários:
+    - por (sala_id, data): reservas ATIVAS ordenadas pelo início, para consultas
+      de sobreposição via bisect em vez de varrer todas as reservas;
+    - por data: ordinais (globais e por sala) das datas com reservas ATIVAS, em
+      tuplas ordenadas, para consultas por intervalo de datas via bisect; o
+      índice global guarda as reservas de cada data ordenadas pelo início;
+    - por login: ids das reservas do usuário e contador das ativas;
+    - lista ordenada de todos os ids, para a paginação por chave;
+    - observadores (ObservadorReservas) avisados a cada mudança, como o mapa de
+      ocupação em bitmaps usado nas consultas de disponibilidade e as contagens
+      do relatório de uso.
+    """
+    def __init__(self, slot_minutos: int = 1):
         self._reservas: Dict[int, Reserva] = {}
+        self._ids: List[int] = []
         self._next_id = 1
+        # (sala_id, data_ord) -> ((inicio_min, fim_min, reserva_id), ...) ordenado; tupla trocada a cada mudança
+        self._por_sala_data: Dict[Tuple[int, int], Tuple[Tuple[int, int, int], ...]] = {}
+        # maior duração já indexada por chave (limita a busca para trás no bisect)
+        self._maior_duracao: Dict[Tuple[int, int], int] = {}
+        # datas (ordinais) com reservas ativas: todas e por sala; data -> ((inicio, fim, sala_id, id), ...)
+        self._datas: Tuple[int, ...] = ()
+        self._datas_por_sala: Dict[int, Tuple[int, ...]] = {}
+        self._por_data: Dict[int, Tuple[Tuple[int, int, int, int], ...]] = {}
+        # login -> {reserva_id: None} (dict como conjunto ordenado por inserção)
+        self._por_usuario: Dict[str, Dict[int, None]] = {}
+        self._ativas_por_usuario: Dict[str, int] = {}
+        # reserva_id -> estado efetivamente indexado (os objetos são alterados in-place antes do update)
+        self._indexado: Dict[int, EntradaReserva] = {}
+        self.ocupacao = MapaOcupacao(slot_minutos)
+        self.uso = RelatorioUso()
+        self._observadores: List[ObservadorReservas] = [self.ocupacao, self.uso]
+        self._escrita = threading.RLock()
 
+    def inscrever(self, obs: ObservadorReservas) -> None:
+        """Registra uma visão derivada e a alimenta com o estado atual."""
+        with self._escrita:
+            self._observadores.append(obs)
+            for e in self._indexado.values():
+                obs.reserva_indexada(e)
+
+    # ---- Índices ----
+    def _indexar(self, r: Reserva) -> None:
+        e = EntradaReserva(r.reserva_id, r.login, r.sala_id, r.data_ord,
+                           r.inicio_min, r.fim_min, r.status == 'ativa')
+        self._por_usuario.setdefault(e.login, {})[e.reserva_id] = None
+        if e.ativa:
+            lista = self._por_sala_data.get(e.chave, ())
+            if not lista:
+                self._datas_por_sala[e.sala_id] = _com_item(self._datas_por_sala.get(e.sala_id, ()), e.data_ord)
+            self._por_sala_data[e.chave] = _com_item(lista, e.intervalo)
+            do_dia = self._por_data.get(e.data_ord, ())
+            if not do_dia:
+                self._datas = _com_item(self._datas, e.data_ord)
+            self._por_data[e.data_ord] = _com_item(do_dia, (e.inicio_min, e.fim_min, e.sala_id, e.reserva_id))
+            duracao = e.fim_min - e.inicio_min
+            if duracao > self._maior_duracao.get(e.chave, 0):
+                self._maior_duracao[e.chave] = duracao
+            self._ativas_por_usuario[e.login] = self._ativas_por_usuario.get(e.login, 0) + 1
+        self._indexado[e.reserva_id] = e
+        for obs in self._observadores:
+            obs.reserva_indexada(e)
+
+    def _desindexar(self, rid: int) -> None:
+        e = self._indexado.pop(rid, None)
+        if e is None:
+            return
+        do_usuario = self._por_usuario[e.login]
+        do_usuario.pop(rid, None)
+        if not do_usuario:
+            del self._por_usuario[e.login]
+        if e.ativa:
+            lista = _sem_item(self._por_sala_data[e.chave], e.intervalo)
+            if lista:
+                self._por_sala_data[e.chave] = lista
+            else:
+                del self._por_sala_data[e.chave]
+                self._maior_duracao.pop(e.chave, None)
+                datas = _sem_item(self._datas_por_sala[e.sala_id], e.data_ord)
+                if datas:
+                    self._datas_por_sala[e.sala_id] = datas
+                else:
+                    del self._datas_por_sala[e.sala_id]
+            do_dia = _sem_item(self._por_data[e.data_ord], (e.inicio_min, e.fim_min, e.sala_id, e.reserva_id))
+            if do_dia:
+                self._por_data[e.data_ord] = do_dia
+            else:
+                del self._por_data[e.data_ord]
+                self._datas = _sem_item(self._datas, e.data_ord)
+            restantes = self._ativas_por_usuario[e.login] - 1
+            if restantes:
+                self._ativas_por_usuario[e.login] = restantes
+            else:
+                del self._ativas_por_usuario[e.login]
+        for obs in self._observadores:
+            obs.reserva_desindexada(e)
+
+    def _reindexar_tudo(self) -> None:
+        self._por_sala_data.clear()
+        self._maior_duracao.clear()
+        self._datas = ()
+        self._datas_por_sala.clear()
+        self._por_data.clear()
+        self._por_usuario.clear()
+        self._ativas_por_usuario.clear()
+        self._indexado.clear()
+        for obs in self._observadores:
+            obs.limpar()
+        for r in self._reservas.values():
+            self._indexar(r)
+
+    # ---- CRUD ----
     def add(self, r: Reserva) -> Reserva:
-        r.reserva_id = self._next_id
-        self._reservas[r.reserva_id] = r
-        self._next_id += 1
+        with self._escrita:
+            r.reserva_id = self._next_id
+            self._reservas[r.reserva_id] = r
+            self._ids.append(r.reserva_id)
+            self._next_id += 1
+            self._indexar(r)
         return r
 
     def get_by_id(self, rid: int) -> Optional[Reserva]:
         return self._reservas.get(rid)
 
     def list_all(self) -> Iterable[Reserva]:
-        return list(self._reservas.values())
+        with self._escrita:
+            return list(self._reservas.values())
+
+    def list_page(self, limite: int, apos: Chave = None) -> Tuple[List[Reserva], Chave]:
+        with self._escrita:
+            rids, proxima = _pagina(self._ids, limite, apos)
+            return [self._reservas[rid] for rid in rids], proxima
+
+    def _resolver(self, rids: Iterable[int]) -> List[Reserva]:
+        # uma reserva pode ter sido excluída entre a leitura do índice e a do dicionário
+        return [r for r in map(self._reservas.get, rids) if r is not None]
 
     def list_by_sala_data(self, sala_id: int, data: str) -> List[Reserva]:
-        return [
-            r for r in self._reservas.values()
-            if r.sala.sala_id == sala_id and r.data == data and r.status == 'ativa'
-        ]
+        lista = self._por_sala_data.get((sala_id, data_para_ordinal(data)), ())
+        return self._resolver(rid for _, _, rid in lista)
+
+    def list_by_periodo(self, de_ord: int, ate_ord: int, sala_id: Optional[int] = None) -> List[Reserva]:
+        datas = self._datas if sala_id is None else self._datas_por_sala.get(sala_id, ())
+        datas = datas[bisect_left(datas, de_ord):bisect_left(datas, ate_ord + 1)]
+        if sala_id is None:
+            return self._resolver(rid for d in datas for *_, rid in self._por_data.get(d, ()))
+        return self._resolver(rid for d in datas for *_, rid in self._por_sala_data.get((sala_id, d), ()))
+
+    def find_overlapping(self, sala_id: int, data_ord: int, inicio: int, fim: int) -> List[Reserva]:
+        chave = (sala_id, data_ord)
+        lista = self._por_sala_data.get(chave)
+        if not lista:
+            return []
+        # só podem sobrepor entradas com início em (inicio - maior_duracao, fim);
+        # sem a duração (chave esvaziada em paralelo) usa o dia inteiro, que é sempre seguro
+        lo = bisect_left(lista, (inicio - self._maior_duracao.get(chave, 24 * 60) + 1,))
+        hi = bisect_left(lista, (fim,))
+        return self._resolver(rid for ini, f, rid in lista[lo:hi] if f > inicio)
+
+    def sala_livre(self, sala_id: int, data_ord: int, inicio: int, fim: int) -> bool:
+        return self.ocupacao.livre(sala_id, data_ord, inicio, fim)
+
+    def janelas_livres(self, sala_id: int, data_ord: int, inicio: int, fim: int) -> List[Tuple[int, int]]:
+        return self.ocupacao.janelas_livres(sala_id, data_ord, inicio, fim)
+
+    def contagem_ativas_por_sala(self) -> Dict[int, int]:
+        return dict(self.uso.por_sala)
+
+    def contagem_ativas_por_periodo(self, periodo: str) -> Dict[Tuple[int, int], int]:
+        return dict(self.uso.por_periodo[periodo])
+
+    def list_by_usuario(self, login: str) -> List[Reserva]:
+        with self._escrita:
+            # ordem de reserva_id, como no SQLite (o índice segue a ordem de (re)indexação)
+            return [self._reservas[rid] for rid in sorted(self._por_usuario.get(login, ()))]
+
+    def list_page_by_usuario(self, login: str, limite: int, apos: Chave = None) -> Tuple[List[Reserva], Chave]:
+        with self._escrita:
+            # poucas reservas por usuário: ordenar os ids dele a cada página é barato
+            rids, proxima = _pagina(sorted(self._por_usuario.get(login, ())), limite, apos)
+            return [self._reservas[rid] for rid in rids], proxima
+
+    def count_ativas_by_usuario(self, login: str) -> int:
+        return self._ativas_por_usuario.get(login, 0)
 
     def update(self, r: Reserva) -> None:
-        if r.reserva_id in self._reservas:
-            self._reservas[r.reserva_id] = r
+        with self._escrita:
+            if r.reserva_id in self._reservas:
+                self._desindexar(r.reserva_id)
+                self._reservas[r.reserva_id] = r
+                self._indexar(r)
 
     def delete(self, rid: int) -> None:
-        self._reservas.pop(rid, None)
+        with self._escrita:
+            self._desindexar(rid)
+            if self._reservas.pop(rid, None) is not None:
+                _remover_id(self._ids, rid)
+
+    def delete_by_usuario(self, login: str) -> int:
+        with self._escrita:
+            rids = list(self._por_usuario.get(login, ()))
+            for rid in rids:
+                self.delete(rid)
+        return len(rids)
 
     # ---- Suporte a Memento ----
     def all(self) -> List[Reserva]:
-        return list(self._reservas.values())
+        with self._escrita:
+            return list(self._reservas.values())
 
     def replace_all(self, new_items: List[Reserva]) -> None:
-        self._reservas = {r.reserva_id: r for r in new_items}
-        self._next_id = (max(self._reservas.keys()) + 1) if self._reservas else 1
+        with self._escrita:
+            self._reservas = {r.reserva_id: r for r in new_items}
+            self._next_id = (max(self._reservas.keys()) + 1) if self._reservas else 1
+            self._ids = sorted(self._reservas)
+            self._reindexar_tudo()
+
+    # ---- Suporte a Deltas (undo/redo incremental) ----
+    def remover(self, r: Reserva) -> None:
+        self.delete(r.reserva_id)
+
+    def reinserir(self, r: Reserva) -> None:
+        """Recoloca a reserva com o MESMO id (desfazer exclusão / refazer cadastro)."""
+        with self._escrita:
+            self._desindexar(r.reserva_id)
+            if r.reserva_id not in self._reservas:
+                insort(self._ids, r.reserva_id)
+            self._reservas[r.reserva_id] = r
+            self._next_id = max(self._next_id, r.reserva_id + 1)
+            self._indexar(r)
+
+# --------- SÉRIES ----------
+class SerieDAORAM(SerieDAO):
+    """
+    Séries ativas indexadas por (sala_id, dia da semana): a checagem de conflito de
+    um dia olha só as séries daquela sala que caem naquele dia da semana e confere
+    vigência, exceções e horário de cada uma.
+    """
+    def __init__(self):
+        self._series: Dict[int, SerieReserva] = {}
+        self._next_id = 1
+        # (sala_id, dia_semana) -> (serie_id, ...) das ativas; tupla trocada a cada mudança
+        self._por_sala_dia: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+        self._por_usuario: Dict[str, Dict[int, None]] = {}
+        # serie_id -> (login, sala_id, dias, ativa) efetivamente indexado
+        self._indexado: Dict[int, Tuple[str, int, Tuple[int, ...], bool]] = {}
+        self._escrita = threading.RLock()
+
+    def _indexar(self, s: SerieReserva) -> None:
+        e = (s.login, s.sala_id, s.regra.dias_semana, s.status == 'ativa')
+        login, sala_id, dias, ativa = e
+        self._por_usuario.setdefault(login, {})[s.serie_id] = None
+        if ativa:
+            for d in dias:
+                self._por_sala_dia[(sala_id, d)] = self._por_sala_dia.get((sala_id, d), ()) + (s.serie_id,)
+        self._indexado[s.serie_id] = e
+
+    def _desindexar(self, serie_id: int) -> None:
+        e = self._indexado.pop(serie_id, None)
+        if e is None:
+            return
+        login, sala_id, dias, ativa = e
+        do_usuario = self._por_usuario[login]
+        do_usuario.pop(serie_id, None)
+        if not do_usuario:
+            del self._por_usuario[login]
+        if ativa:
+            for d in dias:
+                restantes = tuple(i for i in self._por_sala_dia[(sala_id, d)] if i != serie_id)
+                if restantes:
+                    self._por_sala_dia[(sala_id, d)] = restantes
+                else:
+                    del self._por_sala_dia[(sala_id, d)]
+
+    def add(self, s: SerieReserva) -> SerieReserva:
+        with self._escrita:
+            s.serie_id = self._next_id
+            self._next_id += 1
+            self._series[s.serie_id] = s
+            self._indexar(s)
+        return s
+
+    def get_by_id(self, serie_id: int) -> Optional[SerieReserva]:
+        return self._series.get(serie_id)
+
+    def list_all(self) -> Iterable[SerieReserva]:
+        with self._escrita:
+            return list(self._series.values())
+
+    def list_by_usuario(self, login: str) -> List[SerieReserva]:
+        with self._escrita:
+            return [self._series[i] for i in sorted(self._por_usuario.get(login, ()))]
+
+    def count_ativas_by_usuario(self, login: str) -> int:
+        with self._escrita:
+            return sum(1 for i in self._por_usuario.get(login, ()) if self._indexado[i][3])
+
+    def find_overlapping(self, sala_id: int, data_ord: int, inicio: int, fim: int) -> List[SerieReserva]:
+        encontradas = []
+        for i in self._por_sala_dia.get((sala_id, dia_da_semana(data_ord)), ()):
+            s = self._series.get(i)
+            if s is not None and s.regra.ocorre_em(data_ord) and s.regra.inicio_min < fim and inicio < s.regra.fim_min:
+                encontradas.append(s)
+        return encontradas
+
+    def update(self, s: SerieReserva) -> None:
+        with self._escrita:
+            if s.serie_id in self._series:
+                self._desindexar(s.serie_id)
+                self._series[s.serie_id] = s
+                self._indexar(s)
+
+    def delete(self, serie_id: int) -> None:
+        with self._escrita:
+            self._desindexar(serie_id)
+            self._series.pop(serie_id, None)
+
+    def delete_by_usuario(self, login: str) -> int:
+        with self._escrita:
+            ids = list(self._por_usuario.get(login, ()))
+            for i in ids:
+                self.delete(i)
+        return len(ids)
+
+    # ---- Suporte a Memento ----
+    def all(self) -> List[SerieReserva]:
+        return list(self.list_all())
+
+    def replace_all(self, new_items: List[SerieReserva]) -> None:
+        with self._escrita:
+            self._series = {s.serie_id: s for s in new_items}
+            self._next_id = (max(self._series) + 1) if self._series else 1
+            self._por_sala_dia.clear()
+            self._por_usuario.clear()
+            self._indexado.clear()
+            for s in self._series.values():
+                self._indexar(s)
+
+    # ---- Suporte a Deltas ----
+    def remover(self, s: SerieReserva) -> None:
+        self.delete(s.serie_id)
+
+    def reinserir(self, s: SerieReserva) -> None:
+        with self._escrita:
+            self._desindexar(s.serie_id)
+            self._series[s.serie_id] = s
+            self._next_id = max(self._next_id, s.serie_id + 1)
+            self._indexar(s)
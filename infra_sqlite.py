@@ -0,0 +1,528 @@
+# infra_sqlite.py (Implementações persistentes em SQLite) — mesma interface dos DAOs em RAM
+import json
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from itertools import count
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from models import (Usuario, Sala, Reserva, SerieReserva, RegraRecorrencia, minutos_para_hora, ordinal_para_data,
+                    data_para_ordinal, dia_da_semana, normalizar_recurso)
+from repository import UserDAO, SalaDAO, ReservaDAO, SerieDAO, Chave
+from ocupacao import mascara_de, janelas_livres_da_mascara
+from relatorios import inicio_da_semana, horas_tocadas
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usuarios (
+    id        INTEGER PRIMARY KEY,
+    nome      TEXT NOT NULL,
+    login     TEXT NOT NULL UNIQUE,
+    senha     TEXT NOT NULL,
+    perfil    TEXT NOT NULL,
+    bloqueado INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS salas (
+    sala_id    INTEGER PRIMARY KEY,
+    nome       TEXT NOT NULL,
+    capacidade INTEGER NOT NULL,
+    recursos   TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_salas_capacidade ON salas (capacidade);
+-- índice invertido recurso normalizado -> sala
+CREATE TABLE IF NOT EXISTS sala_recursos (
+    recurso TEXT NOT NULL,
+    sala_id INTEGER NOT NULL,
+    PRIMARY KEY (recurso, sala_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS reservas (
+    reserva_id    INTEGER PRIMARY KEY,
+    usuario_login TEXT NOT NULL,
+    sala_id       INTEGER NOT NULL,
+    data_ord      INTEGER NOT NULL,
+    inicio_min    INTEGER NOT NULL,
+    fim_min       INTEGER NOT NULL,
+    status        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_reservas_sala_data ON reservas (sala_id, data_ord, status, inicio_min);
+CREATE INDEX IF NOT EXISTS ix_reservas_usuario ON reservas (usuario_login, status);
+CREATE INDEX IF NOT EXISTS ix_reservas_data ON reservas (data_ord, status, inicio_min);
+-- séries recorrentes: só a regra; dias_mascara tem o bit d ligado para cada dia da semana d
+CREATE TABLE IF NOT EXISTS series (
+    serie_id      INTEGER PRIMARY KEY,
+    usuario_login TEXT NOT NULL,
+    sala_id       INTEGER NOT NULL,
+    dias_mascara  INTEGER NOT NULL,
+    inicio_ord    INTEGER NOT NULL,
+    fim_ord       INTEGER NOT NULL,
+    inicio_min    INTEGER NOT NULL,
+    fim_min       INTEGER NOT NULL,
+    excecoes      TEXT NOT NULL,
+    status        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_series_sala ON series (sala_id, status, inicio_ord, fim_ord);
+CREATE INDEX IF NOT EXISTS ix_series_usuario ON series (usuario_login, status);
+"""
+
+_contador_memoria = count(1)
+
+class SQLiteDatabase:
+    """
+    Conexões compartilhadas pelos DAOs: uma de escrita (serializada por lock) e
+    um pool pequeno de leitoras. Em arquivo usa WAL, para que leitores não
+    bloqueiem o escritor; ":memory:" vira um banco em memória com cache compartilhado.
+    """
+    def __init__(self, caminho: str = "reservas.db", leitores: int = 4):
+        self._memoria = caminho == ":memory:"
+        if self._memoria:
+            self._uri = f"file:reservas_mem_{next(_contador_memoria)}?mode=memory&cache=shared"
+        else:
+            self._uri = f"file:{caminho}"
+        self._escritor = self._conectar()
+        if not self._memoria:
+            self._escritor.execute("PRAGMA journal_mode=WAL")
+            self._escritor.execute("PRAGMA synchronous=NORMAL")
+        self._escritor.executescript(_SCHEMA)
+        self._migrar_recursos()
+        self._lock_escrita = threading.Lock()
+        self._leitores: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(leitores):
+            self._leitores.put(self._conectar())
+
+    def _migrar_recursos(self) -> None:
+        """Bancos criados antes do índice invertido: popula sala_recursos a partir de salas.recursos."""
+        c = self._escritor
+        if c.execute("SELECT 1 FROM sala_recursos LIMIT 1").fetchone() is None:
+            with c:
+                c.executemany("INSERT OR IGNORE INTO sala_recursos (recurso, sala_id) VALUES (?, ?)",
+                              ((normalizar_recurso(r), sala_id)
+                               for sala_id, recursos in c.execute("SELECT sala_id, recursos FROM salas").fetchall()
+                               for r in json.loads(recursos) if r.strip()))
+
+    def _conectar(self) -> sqlite3.Connection:
+        # check_same_thread=False: as conexões circulam entre threads via pool/lock
+        conn = sqlite3.connect(self._uri, uri=True, check_same_thread=False, cached_statements=256)
+        if self._memoria:
+            # com cache compartilhado não há WAL; evita que leitores esperem por locks de tabela
+            conn.execute("PRAGMA read_uncommitted=1")
+        return conn
+
+    @contextmanager
+    def leitura(self) -> Iterator[sqlite3.Connection]:
+        conn = self._leitores.get()
+        try:
+            yield conn
+        finally:
+            self._leitores.put(conn)
+
+    @contextmanager
+    def escrita(self) -> Iterator[sqlite3.Connection]:
+        with self._lock_escrita:
+            with self._escritor:  # commit/rollback automático
+                yield self._escritor
+
+    def fechar(self) -> None:
+        self._escritor.close()
+        while not self._leitores.empty():
+            self._leitores.get_nowait().close()
+
+def _fatiar(itens: List, limite: int, chave_de) -> Tuple[List, Chave]:
+    """Recebe até limite + 1 itens (LIMIT ?+1): o excedente só indica que há próxima página."""
+    if len(itens) > limite:
+        return itens[:limite], chave_de(itens[limite - 1])
+    return itens, None
+
+# --------- USERS ----------
+_SQL_USUARIO = "SELECT nome, login, senha, perfil, bloqueado FROM usuarios"
+
+def _usuario(row) -> Usuario:
+    return Usuario(nome=row[0], login=row[1], senha=row[2], perfil=row[3], bloqueado=bool(row[4]))
+
+class UserDAOSQLite(UserDAO):
+    def __init__(self, db: SQLiteDatabase):
+        self._db = db
+
+    def add(self, u: Usuario) -> None:
+        with self._db.escrita() as c:
+            c.execute("INSERT INTO usuarios (nome, login, senha, perfil, bloqueado) VALUES (?, ?, ?, ?, ?)",
+                      (u.nome, u.login, u.senha, u.perfil, int(u.bloqueado)))
+
+    def add_many(self, usuarios: Iterable[Usuario]) -> None:
+        with self._db.escrita() as c:
+            c.executemany("INSERT INTO usuarios (nome, login, senha, perfil, bloqueado) VALUES (?, ?, ?, ?, ?)",
+                          ((u.nome, u.login, u.senha, u.perfil, int(u.bloqueado)) for u in usuarios))
+
+    def get_by_login(self, login: str) -> Optional[Usuario]:
+        with self._db.leitura() as c:
+            row = c.execute(_SQL_USUARIO + " WHERE login = ?", (login,)).fetchone()
+        return _usuario(row) if row else None
+
+    def get_by_id(self, uid: int) -> Optional[Usuario]:
+        with self._db.leitura() as c:
+            row = c.execute(_SQL_USUARIO + " WHERE id = ?", (uid,)).fetchone()
+        return _usuario(row) if row else None
+
+    def list_all(self) -> Iterable[Usuario]:
+        with self._db.leitura() as c:
+            return [_usuario(row) for row in c.execute(_SQL_USUARIO + " ORDER BY id")]
+
+    def list_page(self, limite: int, apos: Chave = None) -> Tuple[List[Usuario], Chave]:
+        with self._db.leitura() as c:
+            linhas = c.execute("SELECT nome, login, senha, perfil, bloqueado, id FROM usuarios "
+                               "WHERE id > ? ORDER BY id LIMIT ?", (apos or 0, limite + 1)).fetchall()
+        linhas, proxima = _fatiar(linhas, limite, lambda row: row[5])
+        return [_usuario(row) for row in linhas], proxima
+
+    def update(self, u: Usuario) -> None:
+        with self._db.escrita() as c:
+            c.execute("UPDATE usuarios SET nome = ?, senha = ?, perfil = ?, bloqueado = ? WHERE login = ?",
+                      (u.nome, u.senha, u.perfil, int(u.bloqueado), u.login))
+
+    def delete(self, uid: int) -> None:
+        with self._db.escrita() as c:
+            c.execute("DELETE FROM usuarios WHERE id = ?", (uid,))
+
+    def delete_by_login(self, login: str) -> bool:
+        with self._db.escrita() as c:
+            return c.execute("DELETE FROM usuarios WHERE login = ?", (login,)).rowcount > 0
+
+    # ---- Suporte a Memento ----
+    def all(self) -> List[Usuario]:
+        return list(self.list_all())
+
+    def replace_all(self, new_items: List[Usuario]) -> None:
+        with self._db.escrita() as c:
+            c.execute("DELETE FROM usuarios")
+            c.executemany("INSERT INTO usuarios (nome, login, senha, perfil, bloqueado) VALUES (?, ?, ?, ?, ?)",
+                          ((u.nome, u.login, u.senha, u.perfil, int(u.bloqueado)) for u in new_items))
+
+    # ---- Suporte a Deltas ----
+    def remover(self, u: Usuario) -> None:
+        self.delete_by_login(u.login)
+
+    def reinserir(self, u: Usuario) -> None:
+        self.add(u)
+
+# --------- SALAS ----------
+_SQL_SALA = "SELECT sala_id, nome, capacidade, recursos FROM salas"
+
+def _sala(row) -> Sala:
+    return Sala(sala_id=row[0], nome=row[1], capacidade=row[2], recursos=json.loads(row[3]))
+
+def _linha_sala(s: Sala) -> Tuple:
+    return (s.sala_id, s.nome, s.capacidade, json.dumps(s.recursos))
+
+def _gravar_recursos(c: sqlite3.Connection, s: Sala) -> None:
+    c.execute("DELETE FROM sala_recursos WHERE sala_id = ?", (s.sala_id,))
+    c.executemany("INSERT OR IGNORE INTO sala_recursos (recurso, sala_id) VALUES (?, ?)",
+                  ((normalizar_recurso(r), s.sala_id) for r in s.recursos if r.strip()))
+
+class SalaDAOSQLite(SalaDAO):
+    def __init__(self, db: SQLiteDatabase):
+        self._db = db
+
+    def add(self, s: Sala) -> Sala:
+        with self._db.escrita() as c:
+            cur = c.execute("INSERT INTO salas (nome, capacidade, recursos) VALUES (?, ?, ?)",
+                            (s.nome, s.capacidade, json.dumps(s.recursos)))
+            s.sala_id = cur.lastrowid
+            _gravar_recursos(c, s)
+        return s
+
+    def add_many(self, salas: Iterable[Sala]) -> List[Sala]:
+        salas = list(salas)
+        with self._db.escrita() as c:
+            for s in salas:
+                s.sala_id = c.execute("INSERT INTO salas (nome, capacidade, recursos) VALUES (?, ?, ?)",
+                                      (s.nome, s.capacidade, json.dumps(s.recursos))).lastrowid
+            c.executemany("INSERT OR IGNORE INTO sala_recursos (recurso, sala_id) VALUES (?, ?)",
+                          ((normalizar_recurso(r), s.sala_id) for s in salas for r in s.recursos if r.strip()))
+        return salas
+
+    def get_by_id(self, sala_id: int) -> Optional[Sala]:
+        with self._db.leitura() as c:
+            row = c.execute(_SQL_SALA + " WHERE sala_id = ?", (sala_id,)).fetchone()
+        return _sala(row) if row else None
+
+    def list_all(self) -> Iterable[Sala]:
+        with self._db.leitura() as c:
+            return [_sala(row) for row in c.execute(_SQL_SALA + " ORDER BY sala_id")]
+
+    def list_page(self, limite: int, apos: Chave = None) -> Tuple[List[Sala], Chave]:
+        with self._db.leitura() as c:
+            salas = [_sala(row) for row in c.execute(_SQL_SALA + " WHERE sala_id > ? ORDER BY sala_id LIMIT ?",
+                                                     (apos or 0, limite + 1))]
+        return _fatiar(salas, limite, lambda s: s.sala_id)
+
+    def delete(self, sala_id: int) -> bool:
+        with self._db.escrita() as c:
+            c.execute("DELETE FROM sala_recursos WHERE sala_id = ?", (sala_id,))
+            return c.execute("DELETE FROM salas WHERE sala_id = ?", (sala_id,)).rowcount > 0
+
+    def find_by_criterios(self, capacidade_min: int = 0, recursos: Iterable[str] = ()) -> List[Sala]:
+        chaves = sorted({normalizar_recurso(r) for r in recursos if r.strip()})
+        sql, params = _SQL_SALA + " WHERE capacidade >= ?", [capacidade_min]
+        if chaves:
+            sql += (" AND sala_id IN (SELECT sala_id FROM sala_recursos WHERE recurso IN ("
+                    + ", ".join("?" * len(chaves)) + ") GROUP BY sala_id HAVING COUNT(*) = ?)")
+            params += chaves + [len(chaves)]
+        with self._db.leitura() as c:
+            return [_sala(row) for row in c.execute(sql + " ORDER BY capacidade, sala_id", params)]
+
+    # ---- Suporte a Memento ----
+    def all(self) -> List[Sala]:
+        return list(self.list_all())
+
+    def replace_all(self, new_items: List[Sala]) -> None:
+        with self._db.escrita() as c:
+            c.execute("DELETE FROM salas")
+            c.execute("DELETE FROM sala_recursos")
+            c.executemany("INSERT INTO salas (sala_id, nome, capacidade, recursos) VALUES (?, ?, ?, ?)",
+                          (_linha_sala(s) for s in new_items))
+            c.executemany("INSERT OR IGNORE INTO sala_recursos (recurso, sala_id) VALUES (?, ?)",
+                          ((normalizar_recurso(r), s.sala_id) for s in new_items for r in s.recursos if r.strip()))
+
+    # ---- Suporte a Deltas ----
+    def remover(self, s: Sala) -> None:
+        self.delete(s.sala_id)
+
+    def reinserir(self, s: Sala) -> None:
+        with self._db.escrita() as c:
+            c.execute("INSERT OR REPLACE INTO salas (sala_id, nome, capacidade, recursos) VALUES (?, ?, ?, ?)",
+                      _linha_sala(s))
+            _gravar_recursos(c, s)
+
+# --------- RESERVAS ----------
+# a reserva guarda só login e sala_id (sem JOIN): nomes são resolvidos por quem exibe
+_SQL_RESERVA = ("SELECT r.reserva_id, r.usuario_login, r.sala_id, r.data_ord, r.inicio_min, r.fim_min, r.status "
+                "FROM reservas r ")
+
+def _reserva(row) -> Reserva:
+    return Reserva(*row)
+
+def _linha_reserva(r: Reserva) -> Tuple:
+    return (r.reserva_id, r.login, r.sala_id, r.data_ord, r.inicio_min, r.fim_min, r.status)
+
+_SQL_INSERT_RESERVA = ("INSERT INTO reservas (usuario_login, sala_id, data_ord, inicio_min, fim_min, status) "
+                       "VALUES (?, ?, ?, ?, ?, ?)")
+
+class ReservaDAOSQLite(ReservaDAO):
+    def __init__(self, db: SQLiteDatabase):
+        self._db = db
+
+    def _consultar(self, where: str, params: Tuple) -> List[Reserva]:
+        with self._db.leitura() as c:
+            return [_reserva(row) for row in c.execute(_SQL_RESERVA + where, params)]
+
+    def add(self, r: Reserva) -> Reserva:
+        with self._db.escrita() as c:
+            r.reserva_id = c.execute(_SQL_INSERT_RESERVA, _linha_reserva(r)[1:]).lastrowid
+        return r
+
+    def add_many(self, reservas: Iterable[Reserva]) -> List[Reserva]:
+        reservas = list(reservas)
+        with self._db.escrita() as c:
+            for r in reservas:
+                r.reserva_id = c.execute(_SQL_INSERT_RESERVA, _linha_reserva(r)[1:]).lastrowid
+        return reservas
+
+    def get_by_id(self, rid: int) -> Optional[Reserva]:
+        encontradas = self._consultar("WHERE r.reserva_id = ?", (rid,))
+        return encontradas[0] if encontradas else None
+
+    def list_all(self) -> Iterable[Reserva]:
+        return self._consultar("ORDER BY r.reserva_id", ())
+
+    def list_page(self, limite: int, apos: Chave = None) -> Tuple[List[Reserva], Chave]:
+        reservas = self._consultar("WHERE r.reserva_id > ? ORDER BY r.reserva_id LIMIT ?", (apos or 0, limite + 1))
+        return _fatiar(reservas, limite, lambda r: r.reserva_id)
+
+    def list_by_sala_data(self, sala_id: int, data: str) -> List[Reserva]:
+        return self._consultar("WHERE r.sala_id = ? AND r.data_ord = ? AND r.status = 'ativa' ORDER BY r.inicio_min",
+                               (sala_id, data_para_ordinal(data)))
+
+    def list_by_periodo(self, de_ord: int, ate_ord: int, sala_id: Optional[int] = None) -> List[Reserva]:
+        if sala_id is None:
+            return self._consultar("WHERE r.data_ord BETWEEN ? AND ? AND r.status = 'ativa' "
+                                   "ORDER BY r.data_ord, r.inicio_min, r.fim_min, r.sala_id, r.reserva_id",
+                                   (de_ord, ate_ord))
+        return self._consultar("WHERE r.sala_id = ? AND r.data_ord BETWEEN ? AND ? AND r.status = 'ativa' "
+                               "ORDER BY r.data_ord, r.inicio_min, r.fim_min, r.reserva_id", (sala_id, de_ord, ate_ord))
+
+    def find_overlapping(self, sala_id: int, data_ord: int, inicio: int, fim: int) -> List[Reserva]:
+        return self._consultar("WHERE r.sala_id = ? AND r.data_ord = ? AND r.status = 'ativa' "
+                               "AND r.inicio_min < ? AND r.fim_min > ? ORDER BY r.inicio_min",
+                               (sala_id, data_ord, fim, inicio))
+
+    def _intervalos_ativos(self, sala_id: int, data_ord: int) -> List[Tuple[int, int]]:
+        with self._db.leitura() as c:
+            return c.execute("SELECT inicio_min, fim_min FROM reservas "
+                             "WHERE sala_id = ? AND data_ord = ? AND status = 'ativa'", (sala_id, data_ord)).fetchall()
+
+    def sala_livre(self, sala_id: int, data_ord: int, inicio: int, fim: int) -> bool:
+        with self._db.leitura() as c:
+            return c.execute("SELECT 1 FROM reservas WHERE sala_id = ? AND data_ord = ? AND status = 'ativa' "
+                             "AND inicio_min < ? AND fim_min > ? LIMIT 1", (sala_id, data_ord, fim, inicio)).fetchone() is None
+
+    def janelas_livres(self, sala_id: int, data_ord: int, inicio: int, fim: int) -> List[Tuple[int, int]]:
+        return janelas_livres_da_mascara(mascara_de(self._intervalos_ativos(sala_id, data_ord)), inicio, fim)
+
+    def contagem_ativas_por_sala(self) -> Dict[int, int]:
+        with self._db.leitura() as c:
+            return dict(c.execute("SELECT sala_id, COUNT(*) FROM reservas WHERE status = 'ativa' "
+                                  "GROUP BY sala_id ORDER BY sala_id"))
+
+    def contagem_ativas_por_periodo(self, periodo: str) -> Dict[Tuple[int, int], int]:
+        contagem: Dict[Tuple[int, int], int] = {}
+        with self._db.leitura() as c:
+            if periodo == "dia":
+                linhas = c.execute("SELECT sala_id, data_ord, COUNT(*) FROM reservas WHERE status = 'ativa' "
+                                   "GROUP BY sala_id, data_ord")
+                return {(sala_id, d): n for sala_id, d, n in linhas}
+            if periodo == "semana":
+                for sala_id, d, n in c.execute("SELECT sala_id, data_ord, COUNT(*) FROM reservas "
+                                               "WHERE status = 'ativa' GROUP BY sala_id, data_ord"):
+                    chave = (sala_id, inicio_da_semana(d))
+                    contagem[chave] = contagem.get(chave, 0) + n
+                return contagem
+            if periodo == "hora":
+                for sala_id, ini, fim in c.execute("SELECT sala_id, inicio_min, fim_min FROM reservas "
+                                                   "WHERE status = 'ativa'"):
+                    for h in horas_tocadas(ini, fim):
+                        contagem[(sala_id, h)] = contagem.get((sala_id, h), 0) + 1
+                return contagem
+        raise KeyError(periodo)
+
+    def list_by_usuario(self, login: str) -> List[Reserva]:
+        return self._consultar("WHERE r.usuario_login = ? ORDER BY r.reserva_id", (login,))
+
+    def list_page_by_usuario(self, login: str, limite: int, apos: Chave = None) -> Tuple[List[Reserva], Chave]:
+        reservas = self._consultar("WHERE r.usuario_login = ? AND r.reserva_id > ? ORDER BY r.reserva_id LIMIT ?",
+                                   (login, apos or 0, limite + 1))
+        return _fatiar(reservas, limite, lambda r: r.reserva_id)
+
+    def count_ativas_by_usuario(self, login: str) -> int:
+        with self._db.leitura() as c:
+            return c.execute("SELECT COUNT(*) FROM reservas WHERE usuario_login = ? AND status = 'ativa'",
+                             (login,)).fetchone()[0]
+
+    def update(self, r: Reserva) -> None:
+        with self._db.escrita() as c:
+            c.execute("UPDATE reservas SET usuario_login = ?, sala_id = ?, data_ord = ?, inicio_min = ?, "
+                      "fim_min = ?, status = ? WHERE reserva_id = ?", _linha_reserva(r)[1:] + (r.reserva_id,))
+
+    def delete(self, rid: int) -> None:
+        with self._db.escrita() as c:
+            c.execute("DELETE FROM reservas WHERE reserva_id = ?", (rid,))
+
+    def delete_by_usuario(self, login: str) -> int:
+        with self._db.escrita() as c:
+            return c.execute("DELETE FROM reservas WHERE usuario_login = ?", (login,)).rowcount
+
+    # ---- Suporte a Memento ----
+    def all(self) -> List[Reserva]:
+        return list(self.list_all())
+
+    def replace_all(self, new_items: List[Reserva]) -> None:
+        with self._db.escrita() as c:
+            c.execute("DELETE FROM reservas")
+            c.executemany("INSERT INTO reservas (reserva_id, usuario_login, sala_id, data_ord, inicio_min, "
+                          "fim_min, status) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                          (_linha_reserva(r) for r in new_items))
+
+    # ---- Suporte a Deltas ----
+    def remover(self, r: Reserva) -> None:
+        self.delete(r.reserva_id)
+
+    def reinserir(self, r: Reserva) -> None:
+        with self._db.escrita() as c:
+            c.execute("INSERT OR REPLACE INTO reservas (reserva_id, usuario_login, sala_id, data_ord, inicio_min, "
+                      "fim_min, status) VALUES (?, ?, ?, ?, ?, ?, ?)", _linha_reserva(r))
+
+# --------- SÉRIES ----------
+_SQL_SERIE = ("SELECT t.serie_id, t.usuario_login, t.sala_id, t.dias_mascara, t.inicio_ord, t.fim_ord, t.inicio_min, "
+              "t.fim_min, t.excecoes, t.status FROM series t ")
+
+def _serie(row) -> SerieReserva:
+    regra = RegraRecorrencia(dias_semana=tuple(d for d in range(7) if row[3] >> d & 1),
+                             hora_inicio=minutos_para_hora(row[6]), hora_fim=minutos_para_hora(row[7]),
+                             data_inicio=ordinal_para_data(row[4]), data_fim=ordinal_para_data(row[5]),
+                             excecoes=tuple(ordinal_para_data(o) for o in json.loads(row[8])))
+    return SerieReserva(serie_id=row[0], login=row[1], sala_id=row[2], regra=regra, status=row[9])
+
+def _linha_serie(t: SerieReserva) -> Tuple:
+    g = t.regra
+    return (t.serie_id, t.login, t.sala_id, sum(1 << d for d in g.dias_semana), g.inicio_ord,
+            g.fim_ord, g.inicio_min, g.fim_min, json.dumps(sorted(g.excecoes_ord)), t.status)
+
+_COLUNAS_SERIE = ("serie_id, usuario_login, sala_id, dias_mascara, inicio_ord, fim_ord, inicio_min, fim_min, "
+                  "excecoes, status")
+
+class SerieDAOSQLite(SerieDAO):
+    def __init__(self, db: SQLiteDatabase):
+        self._db = db
+
+    def _consultar(self, where: str, params: Tuple) -> List[SerieReserva]:
+        with self._db.leitura() as c:
+            return [_serie(row) for row in c.execute(_SQL_SERIE + where, params)]
+
+    def add(self, t: SerieReserva) -> SerieReserva:
+        with self._db.escrita() as c:
+            t.serie_id = c.execute(f"INSERT INTO series ({_COLUNAS_SERIE}) VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                   _linha_serie(t)[1:]).lastrowid
+        return t
+
+    def get_by_id(self, serie_id: int) -> Optional[SerieReserva]:
+        encontradas = self._consultar("WHERE t.serie_id = ?", (serie_id,))
+        return encontradas[0] if encontradas else None
+
+    def list_all(self) -> Iterable[SerieReserva]:
+        return self._consultar("ORDER BY t.serie_id", ())
+
+    def list_by_usuario(self, login: str) -> List[SerieReserva]:
+        return self._consultar("WHERE t.usuario_login = ? ORDER BY t.serie_id", (login,))
+
+    def count_ativas_by_usuario(self, login: str) -> int:
+        with self._db.leitura() as c:
+            return c.execute("SELECT COUNT(*) FROM series WHERE usuario_login = ? AND status = 'ativa'",
+                             (login,)).fetchone()[0]
+
+    def find_overlapping(self, sala_id: int, data_ord: int, inicio: int, fim: int) -> List[SerieReserva]:
+        # o índice por sala/vigência filtra no banco; exceções são conferidas aqui
+        candidatas = self._consultar(
+            "WHERE t.sala_id = ? AND t.status = 'ativa' AND t.inicio_ord <= ? AND t.fim_ord >= ? "
+            "AND (t.dias_mascara & ?) != 0 AND t.inicio_min < ? AND t.fim_min > ?",
+            (sala_id, data_ord, data_ord, 1 << dia_da_semana(data_ord), fim, inicio))
+        return [t for t in candidatas if data_ord not in t.regra.excecoes_ord]
+
+    def update(self, t: SerieReserva) -> None:
+        with self._db.escrita() as c:
+            c.execute("UPDATE series SET usuario_login = ?, sala_id = ?, dias_mascara = ?, inicio_ord = ?, "
+                      "fim_ord = ?, inicio_min = ?, fim_min = ?, excecoes = ?, status = ? WHERE serie_id = ?",
+                      _linha_serie(t)[1:] + (t.serie_id,))
+
+    def delete(self, serie_id: int) -> None:
+        with self._db.escrita() as c:
+            c.execute("DELETE FROM series WHERE serie_id = ?", (serie_id,))
+
+    def delete_by_usuario(self, login: str) -> int:
+        with self._db.escrita() as c:
+            return c.execute("DELETE FROM series WHERE usuario_login = ?", (login,)).rowcount
+
+    # ---- Suporte a Memento ----
+    def all(self) -> List[SerieReserva]:
+        return list(self.list_all())
+
+    def replace_all(self, new_items: List[SerieReserva]) -> None:
+        with self._db.escrita() as c:
+            c.execute("DELETE FROM series")
+            c.executemany(f"INSERT INTO series ({_COLUNAS_SERIE}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                          (_linha_serie(t) for t in new_items))
+
+    # ---- Suporte a Deltas ----
+    def remover(self, t: SerieReserva) -> None:
+        self.delete(t.serie_id)
+
+    def reinserir(self, t: SerieReserva) -> None:
+        with self._db.escrita() as c:
+            c.execute(f"INSERT OR REPLACE INTO series ({_COLUNAS_SERIE}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                      _linha_serie(t))
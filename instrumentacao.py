@@ -0,0 +1,224 @@
+# instrumentacao.py — contadores, erros por tipo e histogramas de latência (estilo HDR)
+#
+# Desligada por padrão: nada é embrulhado e o custo é zero. Ligada
+# (FacadeSingletonController(instrumentacao=True)), os métodos públicos da fachada,
+# dos managers e dos DAOs são substituídos NA INSTÂNCIA por wrappers que medem
+# tempo e contam chamadas/erros; as classes continuam intactas.
+import functools
+import inspect
+import itertools
+import os
+import pickle
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+class Histograma:
+    """
+    Histograma log-linear (como o HdrHistogram): cada potência de 2 é dividida em
+    2**SUB faixas iguais, então o erro relativo de qualquer percentil é <= 1/2**SUB,
+    com memória proporcional ao número de faixas ocupadas (dicionário esparso).
+    """
+    SUB = 3
+
+    def __init__(self):
+        self._faixas: Dict[int, int] = {}
+        self.contagem = 0
+        self.soma = 0
+        self.maximo = 0
+
+    @classmethod
+    def _indice(cls, v: int) -> int:
+        base = 1 << cls.SUB
+        if v < base:
+            return v
+        exp = v.bit_length() - cls.SUB - 1
+        return (exp + 1) * base + ((v >> exp) - base)
+
+    @classmethod
+    def _limite_superior(cls, indice: int) -> int:
+        base = 1 << cls.SUB
+        if indice < base:
+            return indice
+        exp = indice // base - 1
+        return (((indice % base) + base + 1) << exp) - 1
+
+    def registrar(self, v: int) -> None:
+        i = self._indice(v)
+        self._faixas[i] = self._faixas.get(i, 0) + 1
+        self.contagem += 1
+        self.soma += v
+        if v > self.maximo:
+            self.maximo = v
+
+    def percentil(self, p: float) -> int:
+        if not self.contagem:
+            return 0
+        alvo = max(1, int(round(p / 100 * self.contagem)))
+        acumulado = 0
+        for i in sorted(self._faixas):
+            acumulado += self._faixas[i]
+            if acumulado >= alvo:
+                return min(self._limite_superior(i), self.maximo)
+        return self.maximo
+
+    def resumo(self, escala: float = 1.0) -> Dict[str, float]:
+        return {"n": self.contagem, "soma": self.soma * escala, "max": self.maximo * escala,
+                **{f"p{q:g}": self.percentil(q) * escala for q in (50, 90, 99, 99.9)}}
+
+class Metricas:
+    """Registro thread-safe; coletores são funções chamadas na exportação (ex.: profundidade do histórico)."""
+    QUANTIS = (0.5, 0.9, 0.99)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.chamadas: Dict[str, int] = {}
+        self.erros: Dict[Tuple[str, str], int] = {}
+        self.latencias: Dict[str, Histograma] = {}
+        self.valores: Dict[str, Histograma] = {}     # distribuições que não são tempo (ex.: bytes de snapshot)
+        self._coletores: List[Callable[[], Dict[str, float]]] = []
+
+    def registrar_chamada(self, op: str, ns: int, erro: BaseException | None = None) -> None:
+        with self._lock:
+            self.chamadas[op] = self.chamadas.get(op, 0) + 1
+            h = self.latencias.get(op)
+            if h is None:
+                h = self.latencias[op] = Histograma()
+            h.registrar(ns)
+            if erro is not None:
+                chave = (op, type(erro).__name__)
+                self.erros[chave] = self.erros.get(chave, 0) + 1
+
+    def registrar_valor(self, nome: str, v: int) -> None:
+        with self._lock:
+            h = self.valores.get(nome)
+            if h is None:
+                h = self.valores[nome] = Histograma()
+            h.registrar(v)
+
+    def adicionar_coletor(self, coletor: Callable[[], Dict[str, float]]) -> None:
+        self._coletores.append(coletor)
+
+    def _medidores(self) -> Dict[str, float]:
+        medidas: Dict[str, float] = {}
+        for coletor in self._coletores:
+            medidas.update(coletor())
+        return medidas
+
+    def exportar(self) -> Dict[str, Any]:
+        medidores = self._medidores()
+        with self._lock:
+            return {
+                "operacoes": {op: {"chamadas": n,
+                                   "erros": {t: e for (o, t), e in self.erros.items() if o == op},
+                                   "latencia_us": self.latencias[op].resumo(1e-3)}
+                              for op, n in sorted(self.chamadas.items())},
+                "valores": {nome: h.resumo() for nome, h in sorted(self.valores.items())},
+                "medidores": medidores,
+            }
+
+    # ---- formato texto do Prometheus ----
+    def prometheus(self, prefixo: str = "reservas") -> str:
+        medidores = self._medidores()
+        linhas: List[str] = []
+        with self._lock:
+            linhas += [f"# HELP {prefixo}_operacao_chamadas_total Chamadas por operação.",
+                       f"# TYPE {prefixo}_operacao_chamadas_total counter"]
+            linhas += [f'{prefixo}_operacao_chamadas_total{{op="{_rotulo(op)}"}} {n}'
+                       for op, n in sorted(self.chamadas.items())]
+            linhas += [f"# HELP {prefixo}_operacao_erros_total Exceções por operação e tipo.",
+                       f"# TYPE {prefixo}_operacao_erros_total counter"]
+            linhas += [f'{prefixo}_operacao_erros_total{{op="{_rotulo(op)}",tipo="{_rotulo(t)}"}} {n}'
+                       for (op, t), n in sorted(self.erros.items())]
+            linhas += [f"# HELP {prefixo}_operacao_latencia_segundos Latência por operação.",
+                       f"# TYPE {prefixo}_operacao_latencia_segundos summary"]
+            for op, h in sorted(self.latencias.items()):
+                linhas += _sumario(f"{prefixo}_operacao_latencia_segundos", f'op="{_rotulo(op)}"', h, 1e-9,
+                                   self.QUANTIS)
+            for nome, h in sorted(self.valores.items()):
+                metrica = f"{prefixo}_{nome}"
+                linhas += [f"# TYPE {metrica} summary"] + _sumario(metrica, "", h, 1, self.QUANTIS)
+        for nome, v in sorted(medidores.items()):
+            linhas += [f"# TYPE {prefixo}_{nome} gauge", f"{prefixo}_{nome} {v}"]
+        return "\n".join(linhas) + "\n"
+
+def _rotulo(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _sumario(metrica: str, rotulos: str, h: Histograma, escala: float, quantis: Iterable[float]) -> List[str]:
+    sep = "," if rotulos else ""
+    linhas = [f'{metrica}{{{rotulos}{sep}quantile="{q}"}} {h.percentil(q * 100) * escala:.9g}' for q in quantis]
+    chaves = f"{{{rotulos}}}" if rotulos else ""
+    linhas += [f"{metrica}_sum{chaves} {h.soma * escala:.9g}", f"{metrica}_count{chaves} {h.contagem}"]
+    return linhas
+
+class EscritorPrometheus:
+    """
+    Grava o texto num arquivo de forma atômica (tmp + rename), no formato do
+    textfile collector do node_exporter. iniciar(intervalo) regrava periodicamente.
+    """
+    def __init__(self, metricas: Metricas, caminho: str):
+        self.metricas = metricas
+        self.caminho = caminho
+        self._parar = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def escrever(self) -> str:
+        tmp = f"{self.caminho}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.metricas.prometheus())
+        os.replace(tmp, self.caminho)
+        return self.caminho
+
+    def iniciar(self, intervalo: float = 15.0) -> None:
+        def laco():
+            while not self._parar.wait(intervalo):
+                self.escrever()
+        self._thread = threading.Thread(target=laco, name="prometheus", daemon=True)
+        self._thread.start()
+
+    def parar(self) -> None:
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+
+# ---------- Embrulho de instâncias ----------
+def _embrulhar(metodo: Callable, op: str, metricas: Metricas) -> Callable:
+    relogio = time.perf_counter_ns
+
+    @functools.wraps(metodo)
+    def medido(*args, **kwargs):
+        inicio = relogio()
+        try:
+            resultado = metodo(*args, **kwargs)
+        except Exception as e:
+            metricas.registrar_chamada(op, relogio() - inicio, e)
+            raise
+        metricas.registrar_chamada(op, relogio() - inicio)
+        return resultado
+    return medido
+
+def instrumentar(obj: Any, nome: str, metricas: Metricas, ignorar: Iterable[str] = ()) -> None:
+    """Troca, só nesta instância, cada método público por uma versão medida."""
+    ignorar = set(ignorar)
+    for attr, _ in inspect.getmembers(type(obj), callable):
+        if attr.startswith("_") or attr in ignorar:
+            continue
+        metodo = getattr(obj, attr)
+        if inspect.ismethod(metodo) and metodo.__self__ is obj:
+            setattr(obj, attr, _embrulhar(metodo, f"{nome}.{attr}", metricas))
+
+def instrumentar_snapshot(originator: Any, metricas: Metricas, amostragem: int = 10) -> None:
+    """Mede _snapshot() e, a cada `amostragem` chamadas, o tamanho serializado do snapshot."""
+    original = originator._snapshot
+    medido = _embrulhar(original, "reserva_manager._snapshot", metricas)
+    contador = itertools.count()
+
+    def snapshot():
+        snap = medido()
+        if next(contador) % amostragem == 0:
+            metricas.registrar_valor("snapshot_bytes", len(pickle.dumps(snap, pickle.HIGHEST_PROTOCOL)))
+            metricas.registrar_valor("snapshot_itens", len(snap.users) + len(snap.salas) + len(snap.reservas)
+                                                     + len(snap.series))
+        return snap
+    originator._snapshot = snapshot
@@ -3,6 +3,26 @@ from controller import FacadeSingletonController
 from exceptions import *
 from models import Usuario
 
+TAMANHO_PAGINA = 20
+
+def imprimir_paginas(paginar, formatar, titulo: str, vazio: str):
+    """Mostra uma listagem paginada, pedindo confirmação antes de buscar a próxima página."""
+    pagina = paginar(TAMANHO_PAGINA, None)
+    if not pagina.itens:
+        print(f"\n{vazio}")
+        return
+    print(f"\n{titulo}")
+    while True:
+        for item in pagina.itens:
+            print(formatar(item))
+        if pagina.proximo is None or input("Mostrar mais? (s/N): ").strip().lower() != 's':
+            return
+        pagina = paginar(TAMANHO_PAGINA, pagina.proximo)
+
+def formatar_reserva(controller: FacadeSingletonController, r) -> str:
+    return (f"ID {r.reserva_id} | Sala: {controller.nome_da_sala(r.sala_id)} | {r.data} {r.hora_inicio}-{r.hora_fim} "
+            f"| Status: {r.status}")
+
 def menu_usuario(controller: FacadeSingletonController, usuario_logado: Usuario):
     while True:
         print("\n--- Menu do Usuário ---")
@@ -27,13 +47,8 @@ def menu_usuario(controller: FacadeSingletonController, usuario_logado: Usuario)
                         print(f"- {sala_nome}: {', '.join(blocos) if blocos else 'Livre o dia todo'}")
 
             elif op == '2':
-                reservas = controller.listar_minhas_reservas(usuario_logado)
-                if not reservas:
-                    print("\nVocê não possui reservas.")
-                else:
-                    print("\nMinhas reservas:")
-                    for r in reservas:
-                        print(f"ID {r.reserva_id} | Sala: {r.sala.nome} | {r.data} {r.hora_inicio}-{r.hora_fim} | Status: {r.status}")
+                imprimir_paginas(lambda n, c: controller.paginar_minhas_reservas(usuario_logado, n, c),
+                                 lambda r: formatar_reserva(controller, r), "Minhas reservas:", "Você não possui reservas.")
 
             elif op == '3':
                 sala_id = int(input("ID da sala: ").strip())
@@ -41,7 +56,7 @@ def menu_usuario(controller: FacadeSingletonController, usuario_logado: Usuario)
                 h_ini = input("Hora início (HH:MM): ").strip()
                 h_fim = input("Hora fim (HH:MM): ").strip()
                 r = controller.cadastrar_reserva(usuario_logado, sala_id, data, h_ini, h_fim)
-                print(f"\n✅ Reserva criada! ID {r.reserva_id} | Sala {r.sala.nome} | {r.data} {r.hora_inicio}-{r.hora_fim}")
+                print(f"\n✅ Reserva criada! ID {r.reserva_id} | Sala {controller.nome_da_sala(r.sala_id)} | {r.data} {r.hora_inicio}-{r.hora_fim}")
 
             elif op == '4':
                 rid = int(input("ID da reserva: ").strip())
@@ -76,7 +91,8 @@ def menu_admin(controller: FacadeSingletonController, usuario_logado: Usuario):
         print("9. Desfazer última ação")
         print("10. Refazer última ação")
         print("11. Definir estratégia de conflito (estrito/leniente)")
-        print("12. Sair para o menu principal")
+        print("12. Importar dados (CSV/JSONL)")
+        print("13. Sair para o menu principal")
         op = input("Opção: ").strip()
 
         try:
@@ -94,20 +110,14 @@ def menu_admin(controller: FacadeSingletonController, usuario_logado: Usuario):
                 print("\n✅ Sala excluída.")
 
             elif op == '3':
-                salas = controller.admin_listar_salas(usuario_logado)
-                if not salas:
-                    print("\nNenhuma sala cadastrada.")
-                else:
-                    print("\nSalas cadastradas:")
-                    for s in salas:
-                        print(f"ID {s.sala_id} | {s.nome} | Cap: {s.capacidade} | Recursos: {', '.join(s.recursos) if s.recursos else '—'}")
+                imprimir_paginas(lambda n, c: controller.admin_paginar_salas(usuario_logado, n, c),
+                                 lambda s: f"ID {s.sala_id} | {s.nome} | Cap: {s.capacidade} | Recursos: {', '.join(s.recursos) if s.recursos else '—'}",
+                                 "Salas cadastradas:", "Nenhuma sala cadastrada.")
 
             elif op == '4':
-                usuarios = controller.admin_listar_usuarios(usuario_logado)
-                print("\nUsuários:")
-                for u in usuarios:
-                    status = "BLOQUEADO" if getattr(u, 'bloqueado', False) else "ativo"
-                    print(f"- {u.login} | {u.nome} | perfil={u.perfil} | {status}")
+                imprimir_paginas(lambda n, c: controller.admin_paginar_usuarios(usuario_logado, n, c),
+                                 lambda u: f"- {u.login} | {u.nome} | perfil={u.perfil} | {'BLOQUEADO' if u.bloqueado else 'ativo'}",
+                                 "Usuários:", "Nenhum usuário cadastrado.")
 
             elif op == '5':
                 alvo = input("Login do usuário a bloquear: ").strip()
@@ -119,19 +129,15 @@ def menu_admin(controller: FacadeSingletonController, usuario_logado: Usuario):
                 if not rel:
                     print("\nNenhuma utilização registrada.")
                 else:
+                    nomes = {s.sala_id: s.nome for s in controller.admin_iterar_salas(usuario_logado)}
                     print("\nRelatório de uso (reservas ativas por sala):")
-                    for sala, qtd in rel.items():
-                        print(f"- {sala}: {qtd}")
+                    for sala_id, qtd in rel.items():
+                        print(f"- ID {sala_id} | {nomes.get(sala_id, '?')}: {qtd}")
 
             elif op == '7':
                 login_alvo = input("Login do usuário: ").strip()
-                reservas = controller.admin_listar_reservas_usuario(usuario_logado, login_alvo)
-                if not reservas:
-                    print("\nSem reservas para este usuário.")
-                else:
-                    print("\nReservas do usuário:")
-                    for r in reservas:
-                        print(f"ID {r.reserva_id} | Sala: {r.sala.nome} | {r.data} {r.hora_inicio}-{r.hora_fim} | Status: {r.status}")
+                imprimir_paginas(lambda n, c: controller.admin_paginar_reservas_usuario(usuario_logado, login_alvo, n, c),
+                                 lambda r: formatar_reserva(controller, r), "Reservas do usuário:", "Sem reservas para este usuário.")
 
             elif op == '8':
                 data = input("Data (AAAA-MM-DD): ").strip()
@@ -155,6 +161,14 @@ def menu_admin(controller: FacadeSingletonController, usuario_logado: Usuario):
                 print(f"\n✅ {msg}")
 
             elif op == '12':
+                print("Deixe em branco o que não for importar.")
+                usuarios = input("Arquivo de usuários: ").strip() or None
+                salas = input("Arquivo de salas: ").strip() or None
+                reservas = input("Arquivo de reservas: ").strip() or None
+                resumo = controller.admin_importar_dados(usuario_logado, usuarios, salas, reservas)
+                print(f"\n✅ Importação concluída — {resumo}")
+
+            elif op == '13':
                 break
             else:
                 print("❌ Opção inválida.")
@@ -1,151 +1,664 @@
 # managers.py — negócio com Memento + Strategy + Logger (Adapter)
-from typing import Tuple, Optional, List, Dict
-from datetime import datetime
+import heapq
+from typing import Tuple, Optional, List, Dict, Iterator
 from copy import deepcopy
-from models import Usuario, Reserva, Sala
-from repository import UserDAO, SalaDAO, ReservaDAO
+from models import (Usuario, Reserva, Sala, SerieReserva, RegraRecorrencia, PedidoReserva, ResultadoLote, Pagina,
+                    codificar_cursor, decodificar_cursor, data_para_ordinal, ordinal_para_data, hora_para_minutos,
+                    minutos_para_hora)
+from relatorios import PERIODOS
+from repository import UserDAO, SalaDAO, ReservaDAO, SerieDAO
 from exceptions import *
-from memento import ReservationSnapshot
+from memento import ReservationSnapshot, Delta, InsercaoDelta, RemocaoDelta, AlteracaoDelta, DeltaComposto
 from strategy_conflict import ConflictStrategy, StrictConflictStrategy
 from adapter_logging import AppLogger  # <- NOVO
+from notificacoes import NotificadorAssincrono, Notificacao, CONFIRMACAO, CANCELAMENTO
+from concorrencia import TravasListradas
+from seguranca import VerificadorSenhas
 
 LIMITE_RESERVAS_ATIVAS = 3
 HORA_ABERTURA = 7
 HORA_FECHAMENTO = 22
+PAGINA_MAXIMA = 1000
+
+def _subtrair_intervalo(livres: List[Tuple[int, int]], inicio: int, fim: int) -> List[Tuple[int, int]]:
+    """Remove [inicio, fim) de uma lista ordenada de intervalos livres."""
+    resultado = []
+    for a, b in livres:
+        if b <= inicio or fim <= a:
+            resultado.append((a, b))
+            continue
+        if a < inicio:
+            resultado.append((a, inicio))
+        if fim < b:
+            resultado.append((fim, b))
+    return resultado
+
+def _paginar(tipo: str, list_page, limite: int, cursor: str | None) -> Pagina:
+    """Traduz cursor opaco <-> chave do DAO e valida o tamanho da página."""
+    if not 1 <= limite <= PAGINA_MAXIMA:
+        raise ValidarCamposException(f"O limite da página deve estar entre 1 e {PAGINA_MAXIMA}.")
+    itens, chave = list_page(limite, decodificar_cursor(tipo, cursor))
+    return Pagina(itens, codificar_cursor(tipo, chave))
+
+def _ordem_cronologica(r: Reserva) -> Tuple[int, int, int, int]:
+    return r.data_ord, r.inicio_min, r.fim_min, r.sala_id
 
 # ---------- USER ----------
 class UserManager:
-    def __init__(self, user_dao: UserDAO, logger: AppLogger | None = None):
+    def __init__(self, user_dao: UserDAO, logger: AppLogger | None = None,
+                 verificador: VerificadorSenhas | None = None):
         self.user_dao = user_dao
         self.logger = logger
+        self.verificador = verificador or VerificadorSenhas()
 
-    def cadastrar_usuario(self, nome: str, login: str, senha: str, perfil: str = 'usuario') -> Usuario:
+    def cadastrar_usuario(self, nome: str, login: str, senha: str, perfil: str = 'usuario',
+                          senha_hash: str | None = None) -> Usuario:
+        """senha_hash permite calcular o KDF antes (fora de qualquer lock) e só gravar aqui."""
+        self._validar_novo(nome, login, senha, perfil)
+        novo = Usuario(nome=nome, login=login, senha=senha_hash or self.verificador.gerar(senha), perfil=perfil)
+        self.user_dao.add(novo)
+        if self.logger: self.logger.info("Usuário cadastrado: %s", login)
+        return novo
+
+    def _validar_novo(self, nome: str, login: str, senha: str, perfil: str) -> None:
         if not all([nome, login, senha, perfil]):
             raise ValidarCamposException("Nome, login, senha e perfil não podem ser vazios.")
         if self.user_dao.get_by_login(login):
             raise ValidarCamposException(f"O login '{login}' já está em uso.")
-        novo = Usuario(nome=nome, login=login, senha=senha, perfil=perfil)
-        self.user_dao.add(novo)
-        if self.logger: self.logger.info(f"Usuário cadastrado: {login}")
-        return novo
+
+    def cadastrar_usuarios_em_lote(self, dados: List[Tuple[str, str, str, str]],
+                                   history=None) -> List[Usuario | Exception]:
+        """
+        (nome, login, senha, perfil) por item, validados como em cadastrar_usuario
+        (inclusive logins repetidos dentro do lote). Os hashes são calculados em
+        paralelo no pool do verificador e os aceitos gravados com um add_many.
+        Devolve, na ordem, o Usuario criado ou a exceção que rejeitou o item.
+        """
+        resultados: List[Usuario | Exception] = []
+        aceitos: Dict[str, int] = {}
+        for i, (nome, login, senha, perfil) in enumerate(dados):
+            try:
+                self._validar_novo(nome, login, senha, perfil)
+                if login in aceitos:
+                    raise ValidarCamposException(f"O login '{login}' já está em uso.")
+            except ValidarCamposException as e:
+                resultados.append(e)
+                continue
+            aceitos[login] = i
+            resultados.append(Usuario(nome=nome, login=login, senha=senha, perfil=perfil))
+        novos = [resultados[i] for i in aceitos.values()]
+        for u, h in zip(novos, self.verificador.gerar_varios([u.senha for u in novos])):
+            u.senha = h
+        self.user_dao.add_many(novos)
+        if history is not None and novos:
+            history.registrar(DeltaComposto([InsercaoDelta(self.user_dao, u) for u in novos]))
+        if self.logger: self.logger.info("Lote de usuários: %s criados, %s rejeitados", len(novos), len(dados) - len(novos))
+        return resultados
 
     def autenticar(self, login: str, senha: str) -> Tuple[bool, Optional[Usuario]]:
         if not login or not senha:
             raise ValidarCamposException("Login e senha são obrigatórios.")
         u = self.user_dao.get_by_login(login)
-        ok = bool(u and u.senha == senha)
-        if self.logger: self.logger.info(f"Tentativa de login: {login} -> {'OK' if ok else 'FALHOU'}")
+        ok = self.verificador.verificar(senha, u.senha if u else None)
+        if ok and self.verificador.precisa_rehash(u.senha):
+            # senha legada em texto puro (ou custo antigo): migra no primeiro login bem-sucedido
+            u.senha = self.verificador.gerar(senha)
+            self.user_dao.update(u)
+        if self.logger: self.logger.info("Tentativa de login: %s -> %s", login, 'OK' if ok else 'FALHOU')
         return (True, u) if ok else (False, None)
 
-    def bloquear_usuario(self, login: str):
+    def bloquear_usuario(self, login: str, history=None):
         u = self.user_dao.get_by_login(login)
         if not u:
             raise EntidadeNaoEncontradaException("Usuário não encontrado.")
+        antes = u.bloqueado
         u.bloqueado = True
         self.user_dao.update(u)
-        if self.logger: self.logger.warning(f"Usuário bloqueado: {login}")
+        if history is not None:
+            history.registrar(AlteracaoDelta(self.user_dao, u, 'bloqueado', antes, True))
+        if self.logger: self.logger.warning("Usuário bloqueado: %s", login)
 
     def listar_usuarios(self) -> List[Usuario]:
-        return list(self.user_dao.list_all())
+        return self.user_dao.list_all()   # os DAOs já devolvem uma lista nova
+
+    def paginar_usuarios(self, limite: int = 50, cursor: str | None = None) -> Pagina:
+        return _paginar("usuarios", self.user_dao.list_page, limite, cursor)
+
+    def iterar_usuarios(self) -> Iterator[Usuario]:
+        return self.user_dao.iter_all()
 
 # ---------- SALA ----------
 class SalaManager:
-    def __init__(self, sala_dao: SalaDAO, logger: AppLogger | None = None):
+    def __init__(self, sala_dao: SalaDAO, logger: AppLogger | None = None, reserva_dao: ReservaDAO | None = None,
+                 serie_dao: SerieDAO | None = None):
         self.sala_dao = sala_dao
         self.logger = logger
+        self.reserva_dao = reserva_dao  # necessário só para buscar por horário livre
+        self.serie_dao = serie_dao
+
+    def cadastrar_sala(self, nome: str, capacidade: int, recursos: List[str], history=None) -> Sala:
+        s = self.sala_dao.add(self._nova_sala(nome, capacidade, recursos))
+        if history is not None:
+            history.registrar(InsercaoDelta(self.sala_dao, s))
+        if self.logger: self.logger.info("Sala cadastrada: %s (ID %s)", s.nome, s.sala_id)
+        return s
 
-    def cadastrar_sala(self, nome: str, capacidade: int, recursos: List[str]) -> Sala:
+    @staticmethod
+    def _nova_sala(nome: str, capacidade: int, recursos: List[str]) -> Sala:
         if not nome or capacidade <= 0:
             raise ValidarCamposException("Nome e capacidade (maior que zero) são obrigatórios.")
-        nova = Sala(sala_id=0, nome=nome, capacidade=capacidade, recursos=recursos)
-        s = self.sala_dao.add(nova)
-        if self.logger: self.logger.info(f"Sala cadastrada: {s.nome} (ID {s.sala_id})")
-        return s
+        return Sala(sala_id=0, nome=nome, capacidade=capacidade, recursos=recursos)
+
+    def cadastrar_salas_em_lote(self, dados: List[Tuple[str, int, List[str]]], history=None) -> List[Sala | Exception]:
+        """(nome, capacidade, recursos) por item; os válidos são gravados com um add_many."""
+        resultados: List[Sala | Exception] = []
+        for nome, capacidade, recursos in dados:
+            try:
+                resultados.append(self._nova_sala(nome, capacidade, recursos))
+            except ValidarCamposException as e:
+                resultados.append(e)
+        novas = self.sala_dao.add_many([s for s in resultados if isinstance(s, Sala)])
+        if history is not None and novas:
+            history.registrar(DeltaComposto([InsercaoDelta(self.sala_dao, s) for s in novas]))
+        if self.logger: self.logger.info("Lote de salas: %s criadas, %s rejeitadas", len(novas), len(dados) - len(novas))
+        return resultados
 
-    def excluir_sala(self, sala_id: int):
-        if not self.sala_dao.get_by_id(sala_id):
+    def excluir_sala(self, sala_id: int, history=None):
+        sala = self.sala_dao.get_by_id(sala_id)
+        if not sala:
             raise EntidadeNaoEncontradaException("Sala não encontrada.")
         self.sala_dao.delete(sala_id)
-        if self.logger: self.logger.warning(f"Sala excluída: ID {sala_id}")
+        if history is not None:
+            history.registrar(RemocaoDelta(self.sala_dao, sala))
+        if self.logger: self.logger.warning("Sala excluída: ID %s", sala_id)
 
     def listar_salas(self) -> List[Sala]:
-        return list(self.sala_dao.list_all())
+        return self.sala_dao.list_all()
+
+    def nome_da_sala(self, sala_id: int) -> str:
+        """Nome para exibir junto de reservas, que guardam só o sala_id (a sala pode ter sido excluída)."""
+        s = self.sala_dao.get_by_id(sala_id)
+        return s.nome if s else f"Sala {sala_id} (excluída)"
+
+    def paginar_salas(self, limite: int = 50, cursor: str | None = None) -> Pagina:
+        return _paginar("salas", self.sala_dao.list_page, limite, cursor)
+
+    def iterar_salas(self) -> Iterator[Sala]:
+        return self.sala_dao.iter_all()
+
+    def buscar_salas(self, capacidade_min: int = 0, recursos: List[str] | None = None, data: str | None = None,
+                     hora_inicio: str | None = None, hora_fim: str | None = None) -> List[Sala]:
+        """
+        Salas com capacidade >= capacidade_min, com todos os `recursos` e, se data e
+        horários forem informados, sem reserva ativa sobrepondo [hora_inicio, hora_fim).
+        Os candidatos vêm dos índices de capacidade/recursos; só eles são checados no
+        mapa de ocupação. Resultado em ordem crescente de capacidade.
+        """
+        candidatas = self.sala_dao.find_by_criterios(capacidade_min, recursos or [])
+        if data is None:
+            return candidatas
+        if not (hora_inicio and hora_fim):
+            raise ValidarCamposException("Informe hora de início e fim para buscar por horário livre.")
+        data_ord = data_para_ordinal(data)
+        inicio, fim = hora_para_minutos(hora_inicio), hora_para_minutos(hora_fim)
+        if inicio >= fim:
+            raise ValidarCamposException("A hora de início deve ser anterior à hora de fim.")
+        return self._filtrar_livres(candidatas, data_ord, inicio, fim)
+
+    def _filtrar_livres(self, salas: List[Sala], data_ord: int, inicio: int, fim: int) -> List[Sala]:
+        """Mantém, na ordem recebida, as salas sem reserva nem ocorrência de série em [inicio, fim)."""
+        if self.reserva_dao is None:
+            raise ValidarCamposException("Busca por horário livre indisponível (sem acesso às reservas).")
+        return [s for s in salas if self.reserva_dao.sala_livre(s.sala_id, data_ord, inicio, fim)
+                and not (self.serie_dao and self.serie_dao.find_overlapping(s.sala_id, data_ord, inicio, fim))]
 
 # ---------- RESERVA ----------
 class ReservaManager:
     def __init__(self, reserva_dao: ReservaDAO, user_dao: UserDAO, sala_dao: SalaDAO,
-                 strategy: ConflictStrategy | None = None, logger: AppLogger | None = None):
+                 strategy: ConflictStrategy | None = None, logger: AppLogger | None = None,
+                 notificador: NotificadorAssincrono | None = None, serie_dao: SerieDAO | None = None):
         self.rdao = reserva_dao
         self.udao = user_dao
         self.sdao = sala_dao
+        self.tdao = serie_dao  # séries recorrentes (opcional)
         self.strategy: ConflictStrategy = strategy or StrictConflictStrategy()
         self.logger = logger
+        self.notificador = notificador
+        # None = o limite é conferido por quem chama (ContadorAtivas do modo particionado)
+        self.limite_ativas: Optional[int] = LIMITE_RESERVAS_ATIVAS
+        # check-then-insert atômico por (sala, data) e por usuário (limite de ativas);
+        # reservas de salas/usuários diferentes não disputam o mesmo lock
+        self.travas = TravasListradas()
+
+    @staticmethod
+    def _chaves_trava(r: Reserva) -> List[tuple]:
+        return [("usuario", r.login), ("sala", r.sala_id, r.data_ord)]
+
+    def _notificar(self, r: Reserva, tipo: str):
+        # só depois da gravação; a entrega em si acontece no thread do notificador
+        if self.notificador:
+            self.notificador.publicar(Notificacao.de_reserva(r, tipo, self.udao.get_by_login(r.login),
+                                                             self.sdao.get_by_id(r.sala_id)))
 
     # ------- MEMENTO: Originator -------
     def _snapshot(self) -> ReservationSnapshot:
         return ReservationSnapshot(
             users=deepcopy(list(self.udao.list_all())),
             salas=deepcopy(list(self.sdao.list_all())),
-            reservas=deepcopy(list(self.rdao.list_all()))
+            reservas=deepcopy(list(self.rdao.list_all())),
+            series=deepcopy(list(self.tdao.list_all())) if self.tdao else ()
         )
 
     def restore_from(self, snapshot: ReservationSnapshot):
         self.udao.replace_all(deepcopy(snapshot.users))
         self.sdao.replace_all(deepcopy(snapshot.salas))
         self.rdao.replace_all(deepcopy(snapshot.reservas))
+        if self.tdao:
+            self.tdao.replace_all(deepcopy(list(snapshot.series)))
         if self.logger: self.logger.info("Estado restaurado (Undo/Redo aplicado).")
 
+    # ------- Deltas (modo de histórico incremental) -------
+    def reverter(self, delta: Delta):
+        delta.desfazer()
+        if self.logger: self.logger.info("Operação revertida (Undo incremental aplicado).")
+
+    def reaplicar(self, delta: Delta):
+        delta.refazer()
+        if self.logger: self.logger.info("Operação reaplicada (Redo incremental aplicado).")
+
     # ------- Conflito usando Strategy -------
     def _validar_conflito(self, nova: Reserva):
-        reservas_no_dia = self.rdao.list_by_sala_data(nova.sala.sala_id, nova.data)
-        self.strategy.validar(nova, reservas_no_dia)
+        self.strategy.validar(nova, self._existentes(nova))
 
-    # ------- Regras de reserva -------
-    def cadastrar_reserva(self, usuario: Usuario, sala: Sala, data: str, hora_inicio: str, hora_fim: str, history=None) -> Reserva:
-        if history is not None:
-            history.push(self._snapshot())
+    def _existentes(self, nova: Reserva) -> List[Reserva]:
+        """Reservas avulsas e ocorrências de séries que podem conflitar com `nova` (pela janela da estratégia)."""
+        inicio, fim = self.strategy.janela_busca(nova)
+        return (self.rdao.find_overlapping(nova.sala_id, nova.data_ord, inicio, fim)
+                + self._ocorrencias_sobrepostas(nova.sala_id, nova.data_ord, inicio, fim))
+
+    def _ocorrencias_sobrepostas(self, sala_id: int, data_ord: int, inicio: int, fim: int) -> List[Reserva]:
+        if not self.tdao:
+            return []
+        return [t.ocorrencia(data_ord) for t in self.tdao.find_overlapping(sala_id, data_ord, inicio, fim)]
+
+    def _ativas(self, login: str) -> int:
+        """Reservas ativas do usuário para o limite; cada série ativa conta como uma."""
+        return self.rdao.count_ativas_by_usuario(login) + (self.tdao.count_ativas_by_usuario(login) if self.tdao else 0)
+
+    def _conferir_limite(self, login: str):
+        if self.limite_ativas is not None and self._ativas(login) >= self.limite_ativas:
+            raise LimiteDeReservasException(f"Limite de {self.limite_ativas} reservas ativas por usuário atingido.")
 
+    @staticmethod
+    def _validar_horario(nova: Reserva):
+        if not (HORA_ABERTURA * 60 <= nova.inicio_min < nova.fim_min <= HORA_FECHAMENTO * 60):
+            raise ValidarCamposException(f"Reservas permitidas apenas entre {HORA_ABERTURA}:00 e {HORA_FECHAMENTO}:00.")
+
+    @staticmethod
+    def _validar_usuario(usuario: Usuario):
         if usuario.bloqueado:
             raise UsuarioBloqueadoException("Usuário bloqueado não pode realizar novas reservas.")
-        h_inicio = int(hora_inicio.split(':')[0]); h_fim = int(hora_fim.split(':')[0])
-        if not (HORA_ABERTURA <= h_inicio < HORA_FECHAMENTO and HORA_ABERTURA < h_fim <= HORA_FECHAMENTO):
-            raise ValidarCamposException(f"Reservas permitidas apenas entre {HORA_ABERTURA}:00 e {HORA_FECHAMENTO}:00.")
-        reservas_ativas = [r for r in self.rdao.list_all() if r.usuario.login == usuario.login and r.status == 'ativa']
-        if len(reservas_ativas) >= LIMITE_RESERVAS_ATIVAS:
-            raise LimiteDeReservasException(f"Limite de {LIMITE_RESERVAS_ATIVAS} reservas ativas por usuário atingido.")
 
-        nova = Reserva(reserva_id=0, usuario=usuario, sala=sala, data=data, hora_inicio=hora_inicio, hora_fim=hora_fim)
-        self._validar_conflito(nova)
+    @classmethod
+    def _validar_serie(cls, nova: SerieReserva) -> List[int]:
+        """Ordinais das ocorrências; a série precisa de ao menos uma, dentro do horário de funcionamento."""
+        datas = list(nova.regra.ocorrencias())
+        if not datas:
+            raise ValidarCamposException("A série não tem nenhuma ocorrência no período informado.")
+        cls._validar_horario(nova.ocorrencia(datas[0]))
+        return datas
+
+    @classmethod
+    def _validar_pedidos(cls, resultados: List[ResultadoLote], udao: UserDAO, sdao: SalaDAO,
+                         usuarios: Dict[str, Optional[Usuario]]) -> Dict[int, Reserva]:
+        """Validações por item de um lote (usuário, sala, bloqueio, horário); anota o erro e devolve as candidatas."""
+        candidatas: Dict[int, Reserva] = {}
+        salas: Dict[int, Optional[Sala]] = {}
+        for res in resultados:
+            p = res.pedido
+            try:
+                if p.login not in usuarios:
+                    usuarios[p.login] = udao.get_by_login(p.login)
+                if p.sala_id not in salas:
+                    salas[p.sala_id] = sdao.get_by_id(p.sala_id)
+                usuario, sala = usuarios[p.login], salas[p.sala_id]
+                if not usuario:
+                    raise EntidadeNaoEncontradaException(f"Usuário '{p.login}' não encontrado.")
+                if not sala:
+                    raise EntidadeNaoEncontradaException(f"Sala com ID {p.sala_id} não encontrada.")
+                cls._validar_usuario(usuario)
+                nova = Reserva.nova(0, usuario.login, sala.sala_id, p.data, p.hora_inicio, p.hora_fim)
+                cls._validar_horario(nova)
+                candidatas[res.indice] = nova
+            except (ValidarCamposException, EntidadeNaoEncontradaException, UsuarioBloqueadoException) as e:
+                res.erro = e
+        return candidatas
+
+    def _varrer_lote(self, candidatas: Dict[int, Reserva], indices: List[int], resultados: List[ResultadoLote],
+                     anteriores: Dict[Tuple[int, int], List[Reserva]]) -> List[int]:
+        """
+        Varredura por (sala, data) dos candidatos `indices` contra as reservas existentes,
+        as aceitas em rodadas anteriores e as aceitas antes deles na própria varredura.
+        Devolve os recusados por conflito (com o erro anotado); os demais entram em `anteriores`.
+        """
+        grupos: Dict[Tuple[int, int], List[int]] = {}
+        for i in indices:
+            nova = candidatas[i]
+            grupos.setdefault((nova.sala_id, nova.data_ord), []).append(i)
+        recusadas: List[int] = []
+        for chave, grupo in grupos.items():
+            grupo.sort(key=lambda i: (candidatas[i].inicio_min, i))
+            ja_aceitas = anteriores.setdefault(chave, [])
+            aceitas: List[Reserva] = []
+            maior_fim: Optional[Reserva] = None  # aceita da varredura com maior fim até aqui
+            for i in grupo:
+                nova = candidatas[i]
+                inicio, fim = self.strategy.janela_busca(nova)
+                existentes = self._existentes(nova) + [r for r in ja_aceitas if r.inicio_min < fim and inicio < r.fim_min]
+                try:
+                    self.strategy.validar(nova, existentes + ([maior_fim] if maior_fim else []))
+                except ConflitoDeReservaException as e:
+                    resultados[i].erro = e
+                    recusadas.append(i)
+                    continue
+                aceitas.append(nova)
+                if maior_fim is None or nova.fim_min > maior_fim.fim_min:
+                    maior_fim = nova
+            ja_aceitas.extend(aceitas)
+        return recusadas
+
+    # ------- Regras de reserva -------
+    def cadastrar_reserva(self, usuario: Usuario, sala: Sala, data: str, hora_inicio: str, hora_fim: str, history=None) -> Reserva:
+        self._validar_usuario(usuario)
+        nova = Reserva.nova(0, usuario.login, sala.sala_id, data, hora_inicio, hora_fim)
+        self._validar_horario(nova)
+        with self.travas.travar(self._chaves_trava(nova)):
+            self._conferir_limite(usuario.login)
+
+            self._validar_conflito(nova)
+
+            # snapshot só depois das validações: reserva recusada não entra no histórico
+            if history is not None:
+                history.capturar(self)
+            r = self.rdao.add(nova)
+            if history is not None:
+                history.registrar(InsercaoDelta(self.rdao, r))
+        if self.logger: self.logger.info("Reserva criada: user=%s, sala=%s, %s %s-%s", usuario.login, sala.nome, nova.data, nova.hora_inicio, nova.hora_fim)
+        self._notificar(r, CONFIRMACAO)
+        return r
+
+    def cadastrar_reservas_em_lote(self, pedidos: List[PedidoReserva], history=None,
+                                   tudo_ou_nada: bool = False) -> List[ResultadoLote]:
+        """
+        Valida e grava um lote inteiro de uma vez. O limite por usuário é aplicado
+        no agregado e na ordem do lote; os candidatos que cabem são agrupados por
+        (sala, data) e ordenados pelo início (varredura contra as reservas existentes
+        e entre si). Vaga devolvida por conflito volta a ser oferecida, numa nova
+        rodada, aos pedidos adiados daquele usuário. O que foi aceito é gravado junto,
+        com uma única entrada de histórico. Com tudo_ou_nada=True, qualquer rejeição
+        descarta o lote inteiro.
+        """
+        resultados = [ResultadoLote(indice=i, pedido=p) for i, p in enumerate(pedidos)]
+        # 1) validações por item
+        candidatas = self._validar_pedidos(resultados, self.udao, self.sdao, {})
 
-        if self.logger: self.logger.info(f"Reserva criada: user={usuario.login}, sala={sala.nome}, {data} {hora_inicio}-{hora_fim}")
-        print(f"\n[NOTIFICAÇÃO] Olá, {usuario.nome}! Sua reserva da sala '{sala.nome}' para {data} foi confirmada.")
-        return self.rdao.add(nova)
+        # 2..4 sob os locks de todas as salas/datas e usuários envolvidos
+        chaves = [c for nova in candidatas.values() for c in self._chaves_trava(nova)]
+        with self.travas.travar(chaves):
+            ativas: Dict[str, int] = {}
+            anteriores: Dict[Tuple[int, int], List[Reserva]] = {}   # aceitas em rodadas anteriores
+            pendentes = sorted(candidatas)
+            while pendentes:
+                # 2) limite de reservas ativas, no agregado e na ordem do lote: só entra na rodada quem cabe
+                rodada: List[int] = []
+                adiadas: List[int] = []
+                for i in pendentes:
+                    login = candidatas[i].login
+                    if self.limite_ativas is not None:
+                        if login not in ativas:
+                            ativas[login] = self._ativas(login)
+                        if ativas[login] >= self.limite_ativas:
+                            adiadas.append(i)
+                            continue
+                        ativas[login] += 1
+                    rodada.append(i)
 
-    def cancelar_reserva(self, reserva_id: int, usuario: Usuario) -> Reserva:
+                # 3) varredura; quem perdeu por conflito devolve a vaga aos adiados do mesmo usuário
+                liberaram = set()
+                for i in self._varrer_lote(candidatas, rodada, resultados, anteriores):
+                    login = candidatas.pop(i).login
+                    if self.limite_ativas is not None:
+                        ativas[login] -= 1
+                        liberaram.add(login)
+                pendentes = [i for i in adiadas if candidatas[i].login in liberaram]
+                for i in adiadas:
+                    if candidatas[i].login not in liberaram:
+                        resultados[i].erro = LimiteDeReservasException(
+                            f"Limite de {self.limite_ativas} reservas ativas por usuário atingido.")
+                        del candidatas[i]
+
+            rejeitadas = len(resultados) - len(candidatas)
+            if tudo_ou_nada and rejeitadas:
+                for i in candidatas:
+                    resultados[i].erro = ValidarCamposException("Lote descartado: há pedidos rejeitados.")
+                if self.logger: self.logger.warning("Lote de reservas descartado: %s de %s rejeitadas", rejeitadas, len(resultados))
+                return resultados
+
+            # 4) gravação conjunta; se algo falhar no meio, desfaz o que já entrou
+            aceitas = [candidatas[i] for i in sorted(candidatas)]
+            if history is not None and aceitas:
+                history.capturar(self)
+            try:
+                self.rdao.add_many(aceitas)
+            except Exception:
+                for r in aceitas:
+                    if r.reserva_id:
+                        self.rdao.delete(r.reserva_id)
+                raise
+            for i in candidatas:
+                resultados[i].reserva = candidatas[i]
+            if history is not None and aceitas:
+                history.registrar(DeltaComposto([InsercaoDelta(self.rdao, r) for r in aceitas]))
+        if self.logger: self.logger.info("Lote de reservas: %s criadas, %s rejeitadas", len(aceitas), rejeitadas)
+        for r in aceitas:
+            self._notificar(r, CONFIRMACAO)
+        return resultados
+
+    def cancelar_reserva(self, reserva_id: int, usuario: Usuario, history=None) -> Reserva:
         r = self.rdao.get_by_id(reserva_id)
         if not r:
             raise EntidadeNaoEncontradaException("Reserva não encontrada.")
-        if r.usuario.login != usuario.login and usuario.perfil != 'admin':
+        if r.login != usuario.login and usuario.perfil != 'admin':
             raise PermissaoNegadaException("Você só pode cancelar suas próprias reservas.")
-        r.status = 'cancelada'
-        self.rdao.update(r)
-        if self.logger: self.logger.warning(f"Reserva cancelada: id={r.reserva_id}, por={usuario.login}")
+        with self.travas.travar(self._chaves_trava(r)):
+            antes = r.status
+            r.status = 'cancelada'
+            self.rdao.update(r)
+            if history is not None:
+                history.registrar(AlteracaoDelta(self.rdao, r, 'status', antes, 'cancelada'))
+        if self.logger: self.logger.warning("Reserva cancelada: id=%s, por=%s", r.reserva_id, usuario.login)
+        self._notificar(r, CANCELAMENTO)
         return r
 
+    # ------- Séries recorrentes -------
+    def _serie(self, serie_id: int, usuario: Usuario) -> SerieReserva:
+        if not self.tdao:
+            raise ValidarCamposException("Reservas recorrentes indisponíveis neste backend.")
+        t = self.tdao.get_by_id(serie_id)
+        if not t:
+            raise EntidadeNaoEncontradaException("Série não encontrada.")
+        if t.login != usuario.login and usuario.perfil != 'admin':
+            raise PermissaoNegadaException("Você só pode alterar suas próprias séries.")
+        return t
+
+    def cadastrar_serie(self, usuario: Usuario, sala: Sala, regra: RegraRecorrencia, history=None) -> SerieReserva:
+        """
+        Valida cada ocorrência como uma reserva avulsa (horário de funcionamento e
+        estratégia de conflito contra reservas e outras séries, pelos índices por
+        sala/data) numa única passada pelo gerador de ocorrências; a série ativa
+        conta como uma reserva no limite do usuário.
+        """
+        if not self.tdao:
+            raise ValidarCamposException("Reservas recorrentes indisponíveis neste backend.")
+        self._validar_usuario(usuario)
+        nova = SerieReserva(serie_id=0, login=usuario.login, sala_id=sala.sala_id, regra=regra)
+        datas = self._validar_serie(nova)
+        chaves = [("usuario", usuario.login)] + [("sala", sala.sala_id, d) for d in datas]
+        with self.travas.travar(chaves):
+            self._conferir_limite(usuario.login)
+            conflitos: List[Tuple[str, ConflitoDeReservaException]] = []
+            for d in datas:
+                ocorrencia = nova.ocorrencia(d)
+                try:
+                    self._validar_conflito(ocorrencia)
+                except ConflitoDeReservaException as e:
+                    conflitos.append((ocorrencia.data, e))
+            if conflitos:
+                lista = ", ".join(data for data, _ in conflitos[:5]) + (" ..." if len(conflitos) > 5 else "")
+                raise ConflitoDeReservaException(f"{conflitos[0][1]} Série com conflito em {len(conflitos)} "
+                                                 f"ocorrência(s): {lista}.")
+            if history is not None:
+                history.capturar(self)
+            t = self.tdao.add(nova)
+            if history is not None:
+                history.registrar(InsercaoDelta(self.tdao, t))
+        if self.logger: self.logger.info("Série criada: user=%s, sala=%s, %s ocorrências", usuario.login, sala.nome, len(datas))
+        return t
+
+    def cancelar_serie(self, serie_id: int, usuario: Usuario, history=None) -> SerieReserva:
+        """Cancela todas as ocorrências futuras e passadas: só o status da série muda."""
+        t = self._serie(serie_id, usuario)
+        with self.travas.travar([("usuario", t.login)]):
+            antes = t.status
+            t.status = 'cancelada'
+            self.tdao.update(t)
+            if history is not None:
+                history.registrar(AlteracaoDelta(self.tdao, t, 'status', antes, 'cancelada'))
+        if self.logger: self.logger.warning("Série cancelada: id=%s, por=%s", serie_id, usuario.login)
+        return t
+
+    def cancelar_ocorrencia(self, serie_id: int, data: str, usuario: Usuario, history=None) -> SerieReserva:
+        """Cancela uma única data da série acrescentando-a às exceções da regra."""
+        t = self._serie(serie_id, usuario)
+        data_ord = data_para_ordinal(data)
+        with self.travas.travar([("sala", t.sala_id, data_ord)]):
+            if not t.regra.ocorre_em(data_ord):
+                raise EntidadeNaoEncontradaException(f"A série não tem ocorrência em {ordinal_para_data(data_ord)}.")
+            antes, depois = t.regra, t.sem_ocorrencia(data_ord)
+            t.regra = depois
+            self.tdao.update(t)
+            if history is not None:
+                history.registrar(AlteracaoDelta(self.tdao, t, 'regra', antes, depois))
+        if self.logger: self.logger.warning("Ocorrência cancelada: serie=%s, %s, por=%s", serie_id,
+                                            ordinal_para_data(data_ord), usuario.login)
+        return t
+
+    def ocorrencias_da_serie(self, serie_id: int, usuario: Usuario, data_inicio: str | None = None,
+                             data_fim: str | None = None) -> Iterator[Reserva]:
+        t = self._serie(serie_id, usuario)
+        de = data_para_ordinal(data_inicio) if data_inicio else None
+        ate = data_para_ordinal(data_fim) if data_fim else None
+        return t.ocorrencias(de, ate)
+
+    def listar_series_por_usuario(self, login: str) -> List[SerieReserva]:
+        return self.tdao.list_by_usuario(login) if self.tdao else []
+
     def consultar_disponibilidade(self, data: str) -> Dict[str, List[str]]:
-        salas = list(self.sdao.list_all())
-        disponibilidade = {s.nome: [] for s in salas}
-        for r in self.rdao.list_all():
-            if r.data == data and r.status == 'ativa':
-                disponibilidade[r.sala.nome].append(f"{r.hora_inicio}-{r.hora_fim}")
+        """Blocos ocupados por sala (nome), lidos do índice (sala, data) em ordem de início."""
+        ocupacao = self.ocupacao_por_sala(data)
+        disponibilidade: Dict[str, List[str]] = {}
+        for s in self.sdao.list_all():
+            disponibilidade.setdefault(s.nome, []).extend(ocupacao.get(s.sala_id, ()))
         return disponibilidade
 
+    def ocupacao_por_sala(self, data: str) -> Dict[int, List[str]]:
+        """Mesmos blocos de consultar_disponibilidade, por sala_id (salas homônimas não se misturam)."""
+        data_ord = data_para_ordinal(data)  # valida o formato
+        ocupacao: Dict[int, List[str]] = {}
+        for s in self.sdao.list_all():
+            ocupados = self.rdao.list_by_sala_data(s.sala_id, data)
+            recorrentes = self._ocorrencias_sobrepostas(s.sala_id, data_ord, 0, 24 * 60)
+            if recorrentes:
+                ocupados = sorted(ocupados + recorrentes, key=lambda r: (r.inicio_min, r.fim_min))
+            ocupacao[s.sala_id] = [f"{r.hora_inicio}-{r.hora_fim}" for r in ocupados]
+        return ocupacao
+
+    def consultar_janelas_livres(self, data: str, sala_ids: List[int] | None = None) -> Dict[int, List[str]]:
+        """Janelas livres (HH:MM-HH:MM) dentro do horário de funcionamento, por sala_id."""
+        data_ord = data_para_ordinal(data)
+        if sala_ids is None:
+            sala_ids = [s.sala_id for s in self.sdao.list_all()]
+        abertura, fechamento = HORA_ABERTURA * 60, HORA_FECHAMENTO * 60
+        janelas: Dict[int, List[str]] = {}
+        for sid in sala_ids:
+            livres = self.rdao.janelas_livres(sid, data_ord, abertura, fechamento)
+            for r in self._ocorrencias_sobrepostas(sid, data_ord, abertura, fechamento):
+                livres = _subtrair_intervalo(livres, r.inicio_min, r.fim_min)
+            janelas[sid] = [f"{minutos_para_hora(a)}-{minutos_para_hora(b)}" for a, b in livres]
+        return janelas
+
+    def sala_livre(self, sala_id: int, data: str, hora_inicio: str, hora_fim: str) -> bool:
+        data_ord, inicio, fim = data_para_ordinal(data), hora_para_minutos(hora_inicio), hora_para_minutos(hora_fim)
+        return (self.rdao.sala_livre(sala_id, data_ord, inicio, fim)
+                and not self._ocorrencias_sobrepostas(sala_id, data_ord, inicio, fim))
+
+    def listar_reservas_por_periodo(self, data_inicio: str, data_fim: str, sala_id: int | None = None) -> List[Reserva]:
+        """
+        Reservas ativas e ocorrências de séries ativas entre as datas (inclusive), em
+        ordem cronológica: a lista ordenada do DAO é intercalada (heapq.merge) com os
+        geradores das séries, que já saem em ordem de data.
+        """
+        de, ate = data_para_ordinal(data_inicio), data_para_ordinal(data_fim)
+        if ate < de:
+            raise ValidarCamposException("A data final deve ser igual ou posterior à data inicial.")
+        fontes: List[Iterator[Reserva]] = [iter(self.rdao.list_by_periodo(de, ate, sala_id))]
+        if self.tdao:
+            fontes += [t.ocorrencias(de, ate) for t in self.tdao.list_all()
+                       if t.status == 'ativa' and (sala_id is None or t.sala_id == sala_id)
+                       and t.regra.inicio_ord <= ate and de <= t.regra.fim_ord]
+        return list(heapq.merge(*fontes, key=_ordem_cronologica))
+
     def listar_reservas_por_usuario(self, login: str) -> List[Reserva]:
-        return [r for r in self.rdao.list_all() if r.usuario.login == login]
+        return self.rdao.list_by_usuario(login)
+
+    def paginar_reservas_por_usuario(self, login: str, limite: int = 50, cursor: str | None = None) -> Pagina:
+        return _paginar("reservas", lambda n, apos: self.rdao.list_page_by_usuario(login, n, apos), limite, cursor)
+
+    def iterar_reservas_por_usuario(self, login: str) -> Iterator[Reserva]:
+        return self.rdao.iter_by_usuario(login)
+
+    def excluir_usuario(self, login: str, history=None):
+        """Exclui o usuário e, em cascata, as reservas dele (mantém os índices por login coerentes)."""
+        u = self.udao.get_by_login(login)
+        if not u:
+            raise EntidadeNaoEncontradaException("Usuário não encontrado.")
+        reservas = self.rdao.list_by_usuario(login)
+        series = self.listar_series_por_usuario(login)
+        removidas = self.rdao.delete_by_usuario(login)
+        if self.tdao:
+            self.tdao.delete_by_usuario(login)
+        self.udao.delete_by_login(login)
+        if history is not None:
+            history.registrar(DeltaComposto([RemocaoDelta(self.rdao, r) for r in reservas]
+                                            + [RemocaoDelta(self.tdao, t) for t in series]
+                                            + [RemocaoDelta(self.udao, u)]))
+        if self.logger: self.logger.warning("Usuário excluído: %s (%s reservas removidas)", login, removidas)
+
+    def gerar_relatorio_uso_salas(self) -> Dict[int, int]:
+        """Reservas ativas por sala_id (salas existentes), lidas da visão materializada do DAO."""
+        return {sid: n for sid, n in sorted(self.rdao.contagem_ativas_por_sala().items())
+                if self.sdao.get_by_id(sid)}
 
-    def gerar_relatorio_uso_salas(self) -> Dict[str, int]:
-        rel: Dict[str, int] = {}
-        for r in self.rdao.list_all():
-            if r.status == 'ativa':
-                rel[r.sala.nome] = rel.get(r.sala.nome, 0) + 1
+    def gerar_relatorio_uso_por_periodo(self, periodo: str) -> Dict[int, Dict[str, int]]:
+        """
+        Reservas ativas por sala_id e balde de tempo: "dia" (AAAA-MM-DD),
+        "semana" (AAAA-MM-DD da segunda-feira) ou "hora" (HHh, hora do dia).
+        """
+        if periodo not in PERIODOS:
+            raise ValidarCamposException(f"Período inválido: '{periodo}'. Use {', '.join(PERIODOS)}.")
+        rotulo = (lambda h: f"{h:02d}h") if periodo == "hora" else ordinal_para_data
+        rel: Dict[int, Dict[str, int]] = {}
+        for (sid, balde), n in sorted(self.rdao.contagem_ativas_por_periodo(periodo).items()):
+            if self.sdao.get_by_id(sid):
+                rel.setdefault(sid, {})[rotulo(balde)] = n
         return rel
@@ -1,36 +1,261 @@
 # memento.py — Caretaker + Memento p/ estado do sistema
+import pickle
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass
 from copy import deepcopy
-from typing import Any, List
+from typing import Any, Deque, Dict, List, Optional
 
 @dataclass(frozen=True)
 class ReservationSnapshot:
     users: Any
     salas: Any
     reservas: Any
+    series: Any = ()   # SerieReserva (reservas recorrentes)
+
+class _EntradaHistorico:
+    """
+    Snapshot guardado no histórico. "Quente": objeto vivo; "fria": serializado
+    com pickle e comprimido com zlib, só reconstruído quando o undo chega nela.
+    """
+    __slots__ = ("snapshot", "blob", "bruto", "armazenado")
+
+    def __init__(self, snapshot: ReservationSnapshot, bruto: int = 0):
+        self.snapshot: Optional[ReservationSnapshot] = snapshot
+        self.blob: Optional[bytes] = None
+        self.bruto = bruto          # tamanho serializado (sem compressão)
+        self.armazenado = bruto     # tamanho efetivamente contabilizado no orçamento
+
+    def congelar(self) -> int:
+        """Comprime a entrada; retorna a variação de bytes armazenados."""
+        if self.blob is not None:
+            return 0
+        self.blob = zlib.compress(pickle.dumps(self.snapshot, pickle.HIGHEST_PROTOCOL))
+        self.snapshot = None
+        antes, self.armazenado = self.armazenado, len(self.blob)
+        return self.armazenado - antes
+
+    def abrir(self) -> ReservationSnapshot:
+        if self.snapshot is not None:
+            return self.snapshot
+        return pickle.loads(zlib.decompress(self.blob))
 
 class HistoryService:
-    def __init__(self, capacity: int = 50):
-        self._undo_stack: List[ReservationSnapshot] = []
-        self._redo_stack: List[ReservationSnapshot] = []
+    """
+    Caretaker por snapshots. Sem max_bytes, limita apenas pelo número de entradas.
+    Com max_bytes, mede o tamanho serializado de cada snapshot, mantém só as
+    `quentes` entradas mais novas de cada pilha como objetos vivos (as demais
+    ficam comprimidas) e descarta as mais antigas quando o orçamento estoura.
+    """
+    def __init__(self, capacity: int = 50, max_bytes: int | None = None, quentes: int = 2):
+        self._undo_stack: Deque[_EntradaHistorico] = deque()
+        self._redo_stack: Deque[_EntradaHistorico] = deque()
         self._capacity = capacity
+        self._max_bytes = max_bytes
+        self._quentes = quentes
+        self._bytes = 0
+        self._descartadas = 0
+        self._pendente: Optional[ReservationSnapshot] = None   # tirado em capturar(), aguardando registrar()
+        self._lock = threading.RLock()
+
+    # ---- Orçamento de memória ----
+    def _embrulhar(self, snapshot: ReservationSnapshot) -> _EntradaHistorico:
+        if self._max_bytes is None:
+            return _EntradaHistorico(snapshot)
+        bruto = len(pickle.dumps(snapshot, pickle.HIGHEST_PROTOCOL))
+        self._bytes += bruto
+        return _EntradaHistorico(snapshot, bruto)
+
+    def _empilhar(self, pilha: Deque[_EntradaHistorico], entrada: _EntradaHistorico):
+        pilha.append(entrada)
+        if self._max_bytes is None:
+            return
+        if len(pilha) > self._quentes:
+            self._bytes += pilha[-1 - self._quentes].congelar()
+        # descarta primeiro o undo mais antigo, depois o redo mais distante; a entrada nova (pilha[-1]) fica
+        while self._bytes > self._max_bytes:
+            fila = next((p for p in (self._undo_stack, self._redo_stack) if len(p) > (1 if p is pilha else 0)), None)
+            if fila is None:
+                break
+            velha = fila.popleft()
+            self._bytes -= velha.armazenado
+            self._descartadas += 1
+
+    def _desempilhar(self, pilha: Deque[_EntradaHistorico]) -> ReservationSnapshot:
+        entrada = pilha.pop()
+        self._bytes -= entrada.armazenado
+        return entrada.abrir()
+
+    def _limpar_redo(self):
+        for e in self._redo_stack:
+            self._bytes -= e.armazenado
+        self._redo_stack.clear()
 
     def push(self, snapshot: ReservationSnapshot):
+        with self._lock:
+            self._push(snapshot)
+
+    def _push(self, snapshot: ReservationSnapshot):
         if len(self._undo_stack) >= self._capacity:
-            self._undo_stack.pop(0)
-        self._undo_stack.append(snapshot)
-        self._redo_stack.clear()
+            self._bytes -= self._undo_stack.popleft().armazenado
+            self._descartadas += 1
+        self._limpar_redo()
+        self._empilhar(self._undo_stack, self._embrulhar(snapshot))
 
     def undo(self, current: ReservationSnapshot) -> ReservationSnapshot | None:
-        if not self._undo_stack:
-            return None
-        snap = self._undo_stack.pop()
-        self._redo_stack.append(current)
-        return snap
+        with self._lock:
+            if not self._undo_stack:
+                return None
+            snap = self._desempilhar(self._undo_stack)
+            self._empilhar(self._redo_stack, self._embrulhar(current))
+            return snap
 
     def redo(self, current: ReservationSnapshot) -> ReservationSnapshot | None:
-        if not self._redo_stack:
-            return None
-        snap = self._redo_stack.pop()
-        self._undo_stack.append(current)
-        return snap
+        with self._lock:
+            if not self._redo_stack:
+                return None
+            snap = self._desempilhar(self._redo_stack)
+            self._empilhar(self._undo_stack, self._embrulhar(current))
+            return snap
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entradas = list(self._undo_stack) + list(self._redo_stack)
+        bruto = sum(e.bruto for e in entradas)
+        frias = sum(1 for e in entradas if e.blob is not None)
+        return {
+            "entradas_desfazer": len(self._undo_stack),
+            "entradas_refazer": len(self._redo_stack),
+            "entradas_comprimidas": frias,
+            "bytes_armazenados": self._bytes,
+            "bytes_brutos": bruto,
+            "taxa_compressao": (bruto / self._bytes) if self._bytes else 1.0,
+            "orcamento_bytes": self._max_bytes,
+            "descartadas": self._descartadas,
+        }
+
+    # ---- Interface comum com DeltaHistoryService (usada pela fachada/managers) ----
+    def capturar(self, originator):
+        """
+        Chamado ANTES de uma operação mutável: tira o snapshot, que só entra no
+        histórico quando a operação se concluir (registrar). Operação que falha na
+        validação não deixa entrada vazia nem apaga o refazer, como no modo delta.
+        """
+        snap = originator._snapshot()
+        with self._lock:
+            self._pendente = snap
+
+    def registrar(self, delta: "Delta"):
+        """A operação gravou: empilha o snapshot de capturar(); o delta em si é ignorado neste modo."""
+        with self._lock:
+            snap, self._pendente = self._pendente, None
+            if snap is not None:
+                self._push(snap)
+
+    def desfazer(self, originator) -> bool:
+        snap = self.undo(originator._snapshot())
+        if not snap:
+            return False
+        originator.restore_from(snap)
+        return True
+
+    def refazer(self, originator) -> bool:
+        snap = self.redo(originator._snapshot())
+        if not snap:
+            return False
+        originator.restore_from(snap)
+        return True
+
+# ---------- Deltas (Command reversível) ----------
+class Delta(ABC):
+    """Mudança reversível de uma única operação; custa O(tamanho da mudança)."""
+    @abstractmethod
+    def desfazer(self): ...
+    @abstractmethod
+    def refazer(self): ...
+
+class InsercaoDelta(Delta):
+    def __init__(self, dao, item):
+        self.dao = dao
+        self.item = item
+
+    def desfazer(self): self.dao.remover(self.item)
+    def refazer(self): self.dao.reinserir(self.item)
+
+class RemocaoDelta(Delta):
+    def __init__(self, dao, item):
+        self.dao = dao
+        self.item = item
+
+    def desfazer(self): self.dao.reinserir(self.item)
+    def refazer(self): self.dao.remover(self.item)
+
+class AlteracaoDelta(Delta):
+    """Troca de valor de um atributo (ex.: status da reserva, bloqueio do usuário)."""
+    def __init__(self, dao, item, campo: str, antes: Any, depois: Any):
+        self.dao = dao
+        self.item = item
+        self.campo = campo
+        self.antes = antes
+        self.depois = depois
+
+    def _aplicar(self, valor: Any):
+        setattr(self.item, self.campo, valor)
+        self.dao.update(self.item)
+
+    def desfazer(self): self._aplicar(self.antes)
+    def refazer(self): self._aplicar(self.depois)
+
+class DeltaComposto(Delta):
+    def __init__(self, deltas: List[Delta]):
+        self.deltas = list(deltas)
+
+    def desfazer(self):
+        for d in reversed(self.deltas):
+            d.desfazer()
+
+    def refazer(self):
+        for d in self.deltas:
+            d.refazer()
+
+class DeltaHistoryService:
+    """
+    Caretaker alternativo: guarda comandos inversos por operação em vez de
+    cópias completas do estado. Mesma interface capturar/registrar/desfazer/refazer.
+    """
+    def __init__(self, capacity: int = 50):
+        self._undo_stack: Deque[Delta] = deque(maxlen=capacity)
+        self._redo_stack: List[Delta] = []
+        self._lock = threading.RLock()   # registrar() pode vir de vários threads de reserva
+
+    def capturar(self, originator):
+        pass
+
+    def registrar(self, delta: Delta):
+        with self._lock:
+            self._undo_stack.append(delta)
+            self._redo_stack.clear()
+
+    def desfazer(self, originator) -> bool:
+        with self._lock:
+            if not self._undo_stack:
+                return False
+            delta = self._undo_stack.pop()
+            originator.reverter(delta)
+            self._redo_stack.append(delta)
+            return True
+
+    def refazer(self, originator) -> bool:
+        with self._lock:
+            if not self._redo_stack:
+                return False
+            delta = self._redo_stack.pop()
+            originator.reaplicar(delta)
+            self._undo_stack.append(delta)
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entradas_desfazer": len(self._undo_stack), "entradas_refazer": len(self._redo_stack)}
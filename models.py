@@ -1,9 +1,57 @@
 # models.py
 
-from dataclasses import dataclass, field
-from typing import List
+import base64
+import sys
+from dataclasses import dataclass, field, replace
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple
+from exceptions import ValidarCamposException
 
-@dataclass
+def hora_para_minutos(hora: str) -> int:
+    """Converte 'HH:MM' em minutos desde 00:00."""
+    try:
+        h, m = hora.strip().split(':')
+        h, m = int(h), int(m)
+    except (AttributeError, ValueError):
+        raise ValidarCamposException(f"Horário inválido: '{hora}'. Use o formato HH:MM.")
+    if not (0 <= h <= 24 and 0 <= m < 60) or (h == 24 and m):
+        raise ValidarCamposException(f"Horário inválido: '{hora}'. Use o formato HH:MM.")
+    return h * 60 + m
+
+@lru_cache(maxsize=2048)
+def minutos_para_hora(minutos: int) -> str:
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+def data_para_ordinal(data: str) -> int:
+    """Converte 'AAAA-MM-DD' no ordinal do dia (date.toordinal)."""
+    try:
+        return date.fromisoformat(data.strip()).toordinal()
+    except (AttributeError, ValueError):
+        raise ValidarCamposException(f"Data inválida: '{data}'. Use o formato AAAA-MM-DD.")
+
+@lru_cache(maxsize=4096)
+def ordinal_para_data(ordinal: int) -> str:
+    return date.fromordinal(ordinal).isoformat()
+
+# Um único objeto int por valor de ordinal/minuto: com milhões de reservas os
+# mesmos poucos milhares de valores se repetem (ints acima de 256 não são cacheados).
+_INTEIROS: Dict[int, int] = {}
+
+def _compartilhado(n: int) -> int:
+    return _INTEIROS.setdefault(n, n)
+
+DIAS_SEMANA = ("seg", "ter", "qua", "qui", "sex", "sáb", "dom")
+
+def dia_da_semana(ordinal: int) -> int:
+    """0 = segunda ... 6 = domingo (o ordinal 1, 0001-01-01, é uma segunda)."""
+    return (ordinal - 1) % 7
+
+def normalizar_recurso(recurso: str) -> str:
+    """Chave de busca de um recurso ('Projetor ' e 'projetor' são o mesmo recurso)."""
+    return recurso.strip().casefold()
+
+@dataclass(slots=True)
 class Usuario:
     """Representa o modelo de um usuário no sistema."""
     nome: str
@@ -12,11 +60,15 @@ class Usuario:
     perfil: str = 'usuario'  # Pode ser 'usuario' ou 'admin'
     bloqueado: bool = False
 
+    def __post_init__(self):
+        self.login = sys.intern(self.login)
+        self.perfil = sys.intern(self.perfil)
+
     def __str__(self):
         status = "Bloqueado" if self.bloqueado else "Ativo"
         return f"Usuário(nome='{self.nome}', login='{self.login}', perfil='{self.perfil}', status='{status}')"
 
-@dataclass
+@dataclass(slots=True)
 class Sala:
     """Representa o modelo de uma sala de estudos."""
     sala_id: int
@@ -24,21 +76,195 @@ class Sala:
     capacidade: int
     recursos: List[str] = field(default_factory=list)
 
+    def __post_init__(self):
+        self.nome = sys.intern(self.nome)
+        self.recursos = [sys.intern(r) for r in self.recursos]
+
     def __str__(self):
         return f"Sala ID: {self.sala_id} | Nome: {self.nome} | Capacidade: {self.capacidade} | Recursos: {', '.join(self.recursos)}"
 
-@dataclass
+@dataclass(slots=True)
 class Reserva:
-    """Representa o modelo de uma reserva de sala."""
+    """
+    Representa o modelo de uma reserva de sala, em tamanho fixo: referências ao
+    usuário (login) e à sala (sala_id), resolvidas pelos DAOs quando é preciso
+    exibir nomes, e inteiros para data (ordinal do dia) e horários (minutos desde
+    00:00). Os textos data/hora_inicio/hora_fim são derivados sob demanda; para
+    criar a partir de texto, use Reserva.nova(...), que valida e converte.
+    """
     reserva_id: int
-    usuario: Usuario
-    sala: Sala
+    login: str
+    sala_id: int
+    data_ord: int
+    inicio_min: int
+    fim_min: int
+    status: str = 'ativa' # Pode ser 'ativa', 'cancelada'
+    serie_id: Optional[int] = None  # ocorrência gerada por uma SerieReserva (não gravada)
+
+    def __post_init__(self):
+        self.login = sys.intern(self.login)
+        self.status = sys.intern(self.status)
+        self.data_ord = _compartilhado(self.data_ord)
+        self.inicio_min = _compartilhado(self.inicio_min)
+        self.fim_min = _compartilhado(self.fim_min)
+
+    @classmethod
+    def nova(cls, reserva_id: int, login: str, sala_id: int, data: str, hora_inicio: str, hora_fim: str,
+             status: str = 'ativa', serie_id: Optional[int] = None) -> "Reserva":
+        return cls(reserva_id, login, sala_id, data_para_ordinal(data), hora_para_minutos(hora_inicio),
+                   hora_para_minutos(hora_fim), status, serie_id)
+
+    @property
+    def data(self) -> str:
+        return ordinal_para_data(self.data_ord)
+
+    @property
+    def hora_inicio(self) -> str:
+        return minutos_para_hora(self.inicio_min)
+
+    @property
+    def hora_fim(self) -> str:
+        return minutos_para_hora(self.fim_min)
+
+    def __str__(self):
+        return (f"Reserva ID: {self.reserva_id} | Sala ID: {self.sala_id} | "
+                f"Data: {self.data} | Horário: {self.hora_inicio}-{self.hora_fim} | "
+                f"Usuário: {self.login} | Status: {self.status.upper()}")
+
+@dataclass(frozen=True, slots=True)
+class RegraRecorrencia:
+    """
+    Repetição semanal: nos `dias_semana` (0 = segunda ... 6 = domingo), de
+    hora_inicio a hora_fim, entre data_inicio e data_fim (inclusive), exceto nas
+    datas em `excecoes`. Imutável: cancelar uma ocorrência troca a regra inteira
+    (ver SerieReserva.sem_ocorrencia). Como em Reserva, datas e horários viram
+    inteiros uma única vez, na criação.
+    """
+    dias_semana: Tuple[int, ...]
+    hora_inicio: str
+    hora_fim: str
+    data_inicio: str
+    data_fim: str
+    excecoes: Tuple[str, ...] = ()
+    inicio_min: int = field(init=False, repr=False, compare=False)
+    fim_min: int = field(init=False, repr=False, compare=False)
+    inicio_ord: int = field(init=False, repr=False, compare=False)
+    fim_ord: int = field(init=False, repr=False, compare=False)
+    excecoes_ord: FrozenSet[int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        dias = tuple(sorted(set(self.dias_semana)))
+        if not dias or any(not isinstance(d, int) or not 0 <= d <= 6 for d in dias):
+            raise ValidarCamposException("Informe os dias da semana da série (0 = segunda ... 6 = domingo).")
+        inicio_ord, fim_ord = data_para_ordinal(self.data_inicio), data_para_ordinal(self.data_fim)
+        if fim_ord < inicio_ord:
+            raise ValidarCamposException("A data final da série deve ser igual ou posterior à inicial.")
+        excecoes = frozenset(data_para_ordinal(d) for d in self.excecoes)
+        inicio_min, fim_min = hora_para_minutos(self.hora_inicio), hora_para_minutos(self.hora_fim)
+        definir = object.__setattr__
+        definir(self, "dias_semana", dias)
+        definir(self, "inicio_min", inicio_min)
+        definir(self, "fim_min", fim_min)
+        definir(self, "inicio_ord", inicio_ord)
+        definir(self, "fim_ord", fim_ord)
+        definir(self, "excecoes_ord", excecoes)
+        definir(self, "hora_inicio", minutos_para_hora(inicio_min))
+        definir(self, "hora_fim", minutos_para_hora(fim_min))
+        definir(self, "data_inicio", ordinal_para_data(inicio_ord))
+        definir(self, "data_fim", ordinal_para_data(fim_ord))
+        definir(self, "excecoes", tuple(ordinal_para_data(o) for o in sorted(excecoes)))
+
+    def ocorre_em(self, data_ord: int) -> bool:
+        return (self.inicio_ord <= data_ord <= self.fim_ord and dia_da_semana(data_ord) in self.dias_semana
+                and data_ord not in self.excecoes_ord)
+
+    def ocorrencias(self, de_ord: int | None = None, ate_ord: int | None = None) -> Iterator[int]:
+        """Gera os ordinais das ocorrências em [de_ord, ate_ord], em ordem, semana a semana."""
+        inicio = self.inicio_ord if de_ord is None else max(self.inicio_ord, de_ord)
+        fim = self.fim_ord if ate_ord is None else min(self.fim_ord, ate_ord)
+        segunda = inicio - dia_da_semana(inicio)
+        while segunda <= fim:
+            for d in self.dias_semana:
+                o = segunda + d
+                if inicio <= o <= fim and o not in self.excecoes_ord:
+                    yield o
+            segunda += 7
+
+@dataclass(slots=True)
+class SerieReserva:
+    """Reserva recorrente: só a regra é gravada; as ocorrências são geradas sob demanda."""
+    serie_id: int
+    login: str
+    sala_id: int
+    regra: RegraRecorrencia
+    status: str = 'ativa'  # 'ativa' ou 'cancelada' (a série inteira)
+
+    def __post_init__(self):
+        self.login = sys.intern(self.login)
+
+    def ocorrencia(self, data_ord: int) -> Reserva:
+        return Reserva(0, self.login, self.sala_id, data_ord, self.regra.inicio_min, self.regra.fim_min,
+                       self.status, self.serie_id)
+
+    def ocorrencias(self, de_ord: int | None = None, ate_ord: int | None = None) -> Iterator[Reserva]:
+        return (self.ocorrencia(o) for o in self.regra.ocorrencias(de_ord, ate_ord))
+
+    def sem_ocorrencia(self, data_ord: int) -> RegraRecorrencia:
+        """Nova regra com a data acrescentada às exceções."""
+        return replace(self.regra, excecoes=self.regra.excecoes + (ordinal_para_data(data_ord),))
+
+    def __str__(self):
+        dias = ", ".join(DIAS_SEMANA[d] for d in self.regra.dias_semana)
+        return (f"Série ID: {self.serie_id} | Sala ID: {self.sala_id} | {dias} {self.regra.hora_inicio}-"
+                f"{self.regra.hora_fim} | {self.regra.data_inicio} a {self.regra.data_fim} | "
+                f"Usuário: {self.login} | Status: {self.status.upper()}")
+
+@dataclass(slots=True)
+class PedidoReserva:
+    """Item de um lote de reservas (ex.: importação da grade do semestre)."""
+    sala_id: int
     data: str
     hora_inicio: str
     hora_fim: str
-    status: str = 'ativa' # Pode ser 'ativa', 'cancelada'
+    login: Optional[str] = None  # None = usuário logado
+
+@dataclass(slots=True)
+class ResultadoLote:
+    """Resultado de um item do lote: a reserva criada ou a exceção que o rejeitou."""
+    indice: int
+    pedido: PedidoReserva
+    reserva: Optional[Reserva] = None
+    erro: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.reserva is not None
 
     def __str__(self):
-        return (f"Reserva ID: {self.reserva_id} | Sala: {self.sala.nome} | "
-                f"Data: {self.data} | Horário: {self.hora_inicio}-{self.hora_fim} | "
-                f"Usuário: {self.usuario.nome} | Status: {self.status.upper()}")
\ No newline at end of file
+        if self.ok:
+            return f"#{self.indice}: OK (reserva {self.reserva.reserva_id})"
+        return f"#{self.indice}: ERRO ({type(self.erro).__name__}) {self.erro}"
+
+@dataclass(slots=True)
+class Pagina:
+    """Uma página de listagem; `proximo` é o cursor da página seguinte (None = última)."""
+    itens: List[Any]
+    proximo: Optional[str] = None
+
+def codificar_cursor(tipo: str, chave: Optional[int]) -> Optional[str]:
+    """Cursor opaco: o tipo da listagem e a chave do último item, em base64 url-safe."""
+    if chave is None:
+        return None
+    return base64.urlsafe_b64encode(f"{tipo}:{chave}".encode("ascii")).decode("ascii").rstrip("=")
+
+def decodificar_cursor(tipo: str, cursor: Optional[str]) -> Optional[int]:
+    if not cursor:
+        return None
+    try:
+        bruto = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        prefixo, chave = bruto.split(":")
+        if prefixo == tipo:
+            return int(chave)
+    except (ValueError, UnicodeDecodeError):
+        pass
+    raise ValidarCamposException("Cursor de paginação inválido.")
@@ -0,0 +1,204 @@
+# notificacoes.py — caixa de saída (outbox) assíncrona para avisos de reserva
+#
+# O manager só publica a notificação DEPOIS que a gravação deu certo; publicar() é
+# um append numa fila em memória. Um thread de trabalho esvazia a fila em lotes para
+# cada remetente (console, arquivo, SMTP local), com nova tentativa e espera
+# exponencial em caso de falha. Uma notificação igual (mesma reserva e mesmo tipo) a
+# outra ainda na fila ou em envio é descartada na publicação; depois de entregue, a
+# mesma chave pode voltar (ids são reutilizados após desfazer).
+import atexit
+import heapq
+import smtplib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from email.message import EmailMessage
+from typing import Deque, Dict, List, Tuple
+from models import Reserva, Sala, Usuario
+
+CONFIRMACAO = "confirmacao"
+CANCELAMENTO = "cancelamento"
+
+@dataclass(frozen=True)
+class Notificacao:
+    reserva_id: int
+    tipo: str
+    login: str
+    nome: str
+    sala: str
+    data: str
+
+    @classmethod
+    def de_reserva(cls, r: Reserva, tipo: str, usuario: Usuario | None, sala: Sala | None) -> "Notificacao":
+        """A reserva só guarda login e sala_id; quem publica resolve os nomes (usuário/sala podem ter sido excluídos)."""
+        return cls(r.reserva_id, tipo, r.login, usuario.nome if usuario else r.login,
+                   sala.nome if sala else f"#{r.sala_id}", r.data)
+
+    @property
+    def chave(self) -> Tuple[int, str]:
+        return self.reserva_id, self.tipo
+
+    @property
+    def mensagem(self) -> str:
+        acao = "confirmada" if self.tipo == CONFIRMACAO else "cancelada"
+        return f"Olá, {self.nome}! Sua reserva da sala '{self.sala}' para {self.data} foi {acao}."
+
+# ---------- Remetentes (plugáveis) ----------
+class Remetente(ABC):
+    @abstractmethod
+    def enviar(self, lote: List[Notificacao]):
+        """Entrega o lote inteiro; qualquer exceção faz o lote ser reenviado mais tarde."""
+        ...
+
+class ConsoleRemetente(Remetente):
+    def enviar(self, lote: List[Notificacao]):
+        print("".join(f"\n[NOTIFICAÇÃO] {n.mensagem}\n" for n in lote), end="", flush=True)
+
+class ArquivoRemetente(Remetente):
+    def __init__(self, caminho: str = "notificacoes.log"):
+        self.caminho = caminho
+
+    def enviar(self, lote: List[Notificacao]):
+        with open(self.caminho, "a", encoding="utf-8") as f:
+            f.writelines(f"{n.login}\t{n.tipo}\t{n.reserva_id}\t{n.mensagem}\n" for n in lote)
+
+class SMTPLocalRemetente(Remetente):
+    """
+    SMTP local de testes (ex.: `python -m aiosmtpd -n -l localhost:1025`); o lote vai
+    numa única conexão. O endereço do usuário é <login>@<dominio>.
+    """
+    def __init__(self, host: str = "localhost", porta: int = 1025, de: str = "reservas@localhost",
+                 dominio: str = "localhost", timeout: float = 10.0):
+        self.host, self.porta, self.de, self.dominio, self.timeout = host, porta, de, dominio, timeout
+
+    def enviar(self, lote: List[Notificacao]):
+        with smtplib.SMTP(self.host, self.porta, timeout=self.timeout) as smtp:
+            for n in lote:
+                msg = EmailMessage()
+                msg["From"] = self.de
+                msg["To"] = f"{n.login}@{self.dominio}"
+                msg["Subject"] = f"Reserva {n.reserva_id} {'confirmada' if n.tipo == CONFIRMACAO else 'cancelada'}"
+                msg.set_content(n.mensagem)
+                smtp.send_message(msg)
+
+# ---------- Outbox + worker ----------
+class NotificadorAssincrono:
+    """
+    Cada notificação vira um item por remetente, para que a falha de um não reenvie
+    o que os outros já entregaram. Itens com falha voltam após
+    espera_base * 2**tentativa segundos (até espera_max); depois de `tentativas`
+    falhas são descartados e contados em stats()["falhas"].
+    """
+    def __init__(self, remetentes: List[Remetente], lote: int = 50, tentativas: int = 5,
+                 espera_base: float = 0.5, espera_max: float = 30.0):
+        self.remetentes = list(remetentes)
+        self.lote = lote
+        self.tentativas = tentativas
+        self.espera_base = espera_base
+        self.espera_max = espera_max
+        self._pendentes: Dict[Tuple[int, str], int] = {}   # chave -> itens ainda na fila ou em envio
+        self._prontas: Deque[Tuple[int, Notificacao, int]] = deque()       # (remetente, notificação, tentativa)
+        self._adiadas: List[Tuple[float, int, int, Notificacao, int]] = []  # heap por horário de reenvio
+        self._seq = 0
+        self._em_envio = 0
+        self._cond = threading.Condition()
+        self._fechando = False
+        self._stats = {"publicadas": 0, "duplicadas": 0, "entregues": 0, "reenvios": 0, "falhas": 0}
+        self._thread = threading.Thread(target=self._trabalhar, name="notificacoes", daemon=True)
+        self._thread.start()
+        atexit.register(self.fechar)
+
+    def publicar(self, n: Notificacao) -> bool:
+        """Enfileira sem bloquear; False se a mesma (reserva, tipo) ainda está pendente."""
+        with self._cond:
+            if n.chave in self._pendentes:
+                self._stats["duplicadas"] += 1
+                return False
+            if self.remetentes:
+                self._pendentes[n.chave] = len(self.remetentes)
+            self._stats["publicadas"] += 1
+            self._prontas.extend((i, n, 0) for i in range(len(self.remetentes)))
+            self._cond.notify()
+        return True
+
+    def _trabalhar(self):
+        while True:
+            with self._cond:
+                while True:
+                    agora = time.monotonic()
+                    while self._adiadas and self._adiadas[0][0] <= agora:
+                        _, _, i, n, tentativa = heapq.heappop(self._adiadas)
+                        self._prontas.append((i, n, tentativa))
+                    if self._prontas:
+                        break
+                    if self._fechando:
+                        return
+                    espera = self._adiadas[0][0] - agora if self._adiadas else None
+                    self._cond.wait(espera)
+                itens = [self._prontas.popleft() for _ in range(min(self.lote, len(self._prontas)))]
+                self._em_envio = len(itens)
+            self._entregar(itens)
+            with self._cond:
+                self._em_envio = 0
+                self._cond.notify_all()
+
+    def _concluir(self, n: Notificacao):
+        """Um item da notificação saiu da fila (entregue ou abandonado); chamado com o lock."""
+        restantes = self._pendentes.get(n.chave, 0) - 1
+        if restantes > 0:
+            self._pendentes[n.chave] = restantes
+        else:
+            self._pendentes.pop(n.chave, None)
+
+    def _entregar(self, itens: List[Tuple[int, Notificacao, int]]):
+        por_remetente: Dict[int, List[Tuple[Notificacao, int]]] = {}
+        for i, n, tentativa in itens:
+            por_remetente.setdefault(i, []).append((n, tentativa))
+        for i, grupo in por_remetente.items():
+            try:
+                self.remetentes[i].enviar([n for n, _ in grupo])
+                ok = True
+            except Exception:
+                ok = False
+            with self._cond:
+                if ok:
+                    self._stats["entregues"] += len(grupo)
+                    for n, _ in grupo:
+                        self._concluir(n)
+                    continue
+                for n, tentativa in grupo:
+                    if tentativa + 1 >= self.tentativas:
+                        self._stats["falhas"] += 1
+                        self._concluir(n)
+                        continue
+                    self._stats["reenvios"] += 1
+                    quando = time.monotonic() + min(self.espera_max, self.espera_base * 2 ** tentativa)
+                    self._seq += 1
+                    heapq.heappush(self._adiadas, (quando, self._seq, i, n, tentativa + 1))
+
+    def esvaziar(self, timeout: float | None = None) -> bool:
+        """Espera até não haver nada pendente (inclusive reenvios agendados)."""
+        limite = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._prontas or self._adiadas or self._em_envio:
+                restante = None if limite is None else limite - time.monotonic()
+                if restante is not None and restante <= 0:
+                    return False
+                self._cond.wait(restante)
+        return True
+
+    def fechar(self, timeout: float = 5.0):
+        """Entrega o que já está pronto e encerra o thread (reenvios ainda agendados são abandonados)."""
+        with self._cond:
+            self._fechando = True
+            for _, _, _, n, _ in self._adiadas:
+                self._concluir(n)
+            self._adiadas.clear()
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return dict(self._stats, pendentes=len(self._prontas) + len(self._adiadas) + self._em_envio)
@@ -0,0 +1,80 @@
+# ocupacao.py — mapa de ocupação por (sala, data) em bitmaps
+#
+# Cada dia de cada sala é um inteiro Python usado como bitmap: o bit i indica que o
+# slot [i*slot, (i+1)*slot) minutos está ocupado. Inteiros grandes fazem AND/OR/NOT
+# palavra a palavra em C, então "a sala está livre?" e a extração de janelas livres
+# viram poucas operações de bits em vez de laços sobre reservas.
+from typing import Dict, Iterable, List, Tuple
+from repository import EntradaReserva, ObservadorReservas
+
+def mascara_intervalo(inicio: int, fim: int, slot: int = 1) -> int:
+    """Bits dos slots tocados por [inicio, fim) minutos."""
+    primeiro = inicio // slot
+    ultimo = -(-fim // slot)  # teto
+    if ultimo <= primeiro:
+        return 0
+    return ((1 << (ultimo - primeiro)) - 1) << primeiro
+
+def mascara_de(intervalos: Iterable[Tuple[int, int]], slot: int = 1) -> int:
+    m = 0
+    for inicio, fim in intervalos:
+        m |= mascara_intervalo(inicio, fim, slot)
+    return m
+
+def janelas_livres_da_mascara(mascara: int, inicio: int, fim: int, slot: int = 1) -> List[Tuple[int, int]]:
+    """Sequências de bits zerados de `mascara` dentro de [inicio, fim), em minutos."""
+    # só slots inteiramente dentro da janela contam como livres
+    primeiro = -(-inicio // slot)
+    ultimo = fim // slot
+    if ultimo <= primeiro:
+        return []
+    livres = ~mascara & (((1 << (ultimo - primeiro)) - 1) << primeiro)
+    janelas = []
+    while livres:
+        baixo = (livres & -livres).bit_length() - 1
+        x = livres >> baixo
+        tamanho = (x ^ (x + 1)).bit_length() - 1
+        janelas.append((baixo * slot, (baixo + tamanho) * slot))
+        livres &= ~(((1 << tamanho) - 1) << baixo)
+    return janelas
+
+class MapaOcupacao(ObservadorReservas):
+    """Bitmaps por (sala_id, data_ord) atualizados a cada reserva criada/cancelada."""
+    def __init__(self, slot_minutos: int = 1):
+        self.slot = slot_minutos
+        self._mascaras: Dict[Tuple[int, int], int] = {}
+        # intervalos ativos por chave, para recompor a máscara quando uma reserva sai
+        self._intervalos: Dict[Tuple[int, int], Dict[int, Tuple[int, int]]] = {}
+
+    # ---- ObservadorReservas ----
+    def reserva_indexada(self, e: EntradaReserva) -> None:
+        if not e.ativa:
+            return
+        self._intervalos.setdefault(e.chave, {})[e.reserva_id] = (e.inicio_min, e.fim_min)
+        self._mascaras[e.chave] = self._mascaras.get(e.chave, 0) | mascara_intervalo(e.inicio_min, e.fim_min, self.slot)
+
+    def reserva_desindexada(self, e: EntradaReserva) -> None:
+        if not e.ativa:
+            return
+        do_dia = self._intervalos[e.chave]
+        del do_dia[e.reserva_id]
+        if do_dia:
+            # recompõe a partir das demais (poucas por dia): correto mesmo se houver sobreposição
+            self._mascaras[e.chave] = mascara_de(do_dia.values(), self.slot)
+        else:
+            del self._intervalos[e.chave]
+            del self._mascaras[e.chave]
+
+    def limpar(self) -> None:
+        self._mascaras.clear()
+        self._intervalos.clear()
+
+    # ---- Consultas ----
+    def mascara(self, sala_id: int, data_ord: int) -> int:
+        return self._mascaras.get((sala_id, data_ord), 0)
+
+    def livre(self, sala_id: int, data_ord: int, inicio: int, fim: int) -> bool:
+        return not (self.mascara(sala_id, data_ord) & mascara_intervalo(inicio, fim, self.slot))
+
+    def janelas_livres(self, sala_id: int, data_ord: int, inicio: int, fim: int) -> List[Tuple[int, int]]:
+        return janelas_livres_da_mascara(self.mascara(sala_id, data_ord), inicio, fim, self.slot)
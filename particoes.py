@@ -0,0 +1,641 @@
+# particoes.py — modo particionado: salas distribuídas por hash entre processos
+#
+# Conflitos de reserva só acontecem dentro de uma sala, então o estado das reservas
+# se divide sem coordenação entre salas. Cada partição é um processo com seus
+# próprios DAOs (salas dela, reservas e séries) e seu ReservaManager; o processo
+# principal guarda usuários e o catálogo de salas e roteia:
+#   - operações de uma sala vão para particao_da_sala(sala_id);
+#   - ids de reservas/séries são globais (id local * partições + índice), então o
+#     próprio id diz onde a reserva mora;
+#   - consultas entre salas (disponibilidade, períodos, relatórios) vão a todas as
+#     partições em paralelo e os resultados são intercalados aqui.
+# O limite de reservas ativas por usuário atravessa partições: ContadorAtivas, no
+# processo principal, reserva a vaga antes do envio e a devolve se a partição recusar.
+# Desfazer/refazer não é suportado neste modo (SemHistorico).
+import atexit
+import heapq
+import itertools
+import multiprocessing
+import os
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from dataclasses import replace
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from models import (Usuario, Sala, Reserva, SerieReserva, RegraRecorrencia, PedidoReserva, ResultadoLote, Pagina,
+                    data_para_ordinal)
+from managers import (SalaManager, ReservaManager, LIMITE_RESERVAS_ATIVAS, HORA_ABERTURA, HORA_FECHAMENTO, _paginar,
+                      _ordem_cronologica)
+from relatorios import PERIODOS
+from repository import Chave, iterar_paginas, UserDAO, SalaDAO
+from exceptions import *
+from dao_factory import criar_dao_factory
+from strategy_conflict import ConflictStrategy, StrictConflictStrategy
+from adapter_logging import AppLogger
+from notificacoes import NotificadorAssincrono, Notificacao, CONFIRMACAO, CANCELAMENTO
+
+def particao_da_sala(sala_id: int, total: int) -> int:
+    """Hash multiplicativo (Fibonacci): ids sequenciais se espalham entre as partições."""
+    return (sala_id * 0x9E3779B1 & 0xFFFFFFFF) % total
+
+def opcoes_da_particao(backend: str, opcoes: Dict[str, Any], indice: int) -> Dict[str, Any]:
+    """
+    Cada partição persiste à parte: reservas.db -> reservas.p0.db, dados/ -> dados/p0/.
+    Com backends persistentes o número de partições não pode mudar entre execuções.
+    """
+    opcoes = dict(opcoes)
+    if backend == "sqlite":
+        raiz, ext = os.path.splitext(opcoes.get("caminho", "reservas.db"))
+        opcoes["caminho"] = f"{raiz}.p{indice}{ext}"
+    elif backend == "ram-journal":
+        opcoes["diretorio"] = os.path.join(opcoes.get("diretorio", "dados"), f"p{indice}")
+    return opcoes
+
+# ---------- Lado da partição (processo filho) ----------
+class _UsuariosDoPedido:
+    """Faz o papel do UserDAO na partição: os usuários de um lote chegam junto com o pedido."""
+    def __init__(self):
+        self.atual: Dict[str, Optional[Usuario]] = {}
+
+    def get_by_login(self, login: str) -> Optional[Usuario]:
+        return self.atual.get(login)
+
+class _Trabalho:
+    """Estado de uma partição. Recebe e devolve ids globais; os DAOs usam os locais."""
+    def __init__(self, indice: int, total: int, backend: str, opcoes: Dict[str, Any]):
+        self.indice = indice
+        self.total = total
+        self.factory = criar_dao_factory(backend, **opcoes)
+        self.usuarios = _UsuariosDoPedido()
+        self.sm = SalaManager(self.factory.salas(), reserva_dao=self.factory.reservas(),
+                              serie_dao=self.factory.series())
+        self.rm = ReservaManager(self.factory.reservas(), self.usuarios, self.factory.salas(),
+                                 serie_dao=self.factory.series())
+        self.rm.limite_ativas = None   # conferido pelo ContadorAtivas do processo principal
+        self._analise = None
+
+    # ---- ids ----
+    def _global(self, local: Optional[int]) -> Optional[int]:
+        return local * self.total + self.indice if local else local
+
+    def _local(self, global_: int) -> int:
+        return global_ // self.total
+
+    def _reserva(self, r: Reserva) -> Reserva:
+        return replace(r, reserva_id=self._global(r.reserva_id), serie_id=self._global(r.serie_id))
+
+    def _serie(self, t: SerieReserva) -> SerieReserva:
+        return replace(t, serie_id=self._global(t.serie_id))
+
+    # ---- salas ----
+    def adicionar_salas(self, salas: List[Sala]) -> None:
+        for s in salas:
+            self.sm.sala_dao.reinserir(s)   # mesmo id do catálogo
+
+    def excluir_sala(self, sala_id: int) -> None:
+        self.sm.sala_dao.delete(sala_id)
+
+    def salas_livres(self, salas: List[Sala], data_ord: int, inicio: int, fim: int) -> List[int]:
+        return [s.sala_id for s in self.sm._filtrar_livres(salas, data_ord, inicio, fim)]
+
+    # ---- reservas ----
+    def cadastrar_reserva(self, usuario: Usuario, sala: Sala, data: str, hora_inicio: str, hora_fim: str) -> Reserva:
+        return self._reserva(self.rm.cadastrar_reserva(usuario, sala, data, hora_inicio, hora_fim))
+
+    def cadastrar_reservas_em_lote(self, pedidos: List[PedidoReserva], usuarios: Dict[str, Optional[Usuario]]
+                                   ) -> List[Tuple[Optional[Reserva], Optional[Exception]]]:
+        self.usuarios.atual = usuarios
+        try:
+            return [(self._reserva(res.reserva) if res.ok else None, res.erro)
+                    for res in self.rm.cadastrar_reservas_em_lote(pedidos)]
+        finally:
+            self.usuarios.atual = {}
+
+    def descartar_reservas(self, ids: List[int]) -> None:
+        for rid in ids:
+            self.rm.rdao.delete(self._local(rid))
+
+    def cancelar_reserva(self, reserva_id: int, usuario: Usuario) -> Tuple[Reserva, bool]:
+        """Devolve também se a reserva estava ativa (só então o contador libera a vaga)."""
+        r = self.rm.rdao.get_by_id(self._local(reserva_id))
+        estava_ativa = r is not None and r.status == 'ativa'
+        return self._reserva(self.rm.cancelar_reserva(self._local(reserva_id), usuario)), estava_ativa
+
+    def reservas_por_usuario(self, login: str) -> List[Reserva]:
+        return sorted((self._reserva(r) for r in self.rm.listar_reservas_por_usuario(login)),
+                      key=attrgetter("reserva_id"))
+
+    def pagina_por_usuario(self, login: str, limite: int, apos: Chave) -> Tuple[List[Reserva], bool]:
+        # id global g = local * total + indice > apos  <=>  local > (apos - indice) // total
+        local = None if apos is None else (apos - self.indice) // self.total
+        itens, proxima = self.rm.rdao.list_page_by_usuario(login, limite, local)
+        return [self._reserva(r) for r in itens], proxima is not None
+
+    def reservas_por_periodo(self, data_inicio: str, data_fim: str, sala_id: Optional[int]) -> List[Reserva]:
+        return [self._reserva(r) for r in self.rm.listar_reservas_por_periodo(data_inicio, data_fim, sala_id)]
+
+    def excluir_reservas_do_usuario(self, login: str) -> int:
+        removidas = self.rm.rdao.delete_by_usuario(login)
+        self.rm.tdao.delete_by_usuario(login)
+        return removidas
+
+    def ativas_por_usuario(self) -> Counter:
+        return Counter(x.login for x in itertools.chain(self.rm.rdao.list_all(), self.rm.tdao.list_all())
+                       if x.status == 'ativa')
+
+    # ---- séries ----
+    def cadastrar_serie(self, usuario: Usuario, sala: Sala, regra: RegraRecorrencia) -> SerieReserva:
+        return self._serie(self.rm.cadastrar_serie(usuario, sala, regra))
+
+    def cancelar_serie(self, serie_id: int, usuario: Usuario) -> Tuple[SerieReserva, bool]:
+        t = self.rm.tdao.get_by_id(self._local(serie_id))
+        estava_ativa = t is not None and t.status == 'ativa'
+        return self._serie(self.rm.cancelar_serie(self._local(serie_id), usuario)), estava_ativa
+
+    def cancelar_ocorrencia(self, serie_id: int, data: str, usuario: Usuario) -> SerieReserva:
+        return self._serie(self.rm.cancelar_ocorrencia(self._local(serie_id), data, usuario))
+
+    def ocorrencias_da_serie(self, serie_id: int, usuario: Usuario, data_inicio: str | None,
+                             data_fim: str | None) -> List[Reserva]:
+        return [self._reserva(r) for r in
+                self.rm.ocorrencias_da_serie(self._local(serie_id), usuario, data_inicio, data_fim)]
+
+    def series_por_usuario(self, login: str) -> List[SerieReserva]:
+        return [self._serie(t) for t in self.rm.listar_series_por_usuario(login)]
+
+    # ---- consultas por sala e relatórios ----
+    def ocupacao_por_sala(self, data: str) -> Dict[int, List[str]]:
+        return self.rm.ocupacao_por_sala(data)
+
+    def janelas_livres(self, sala_ids: List[int], data: str) -> Dict[int, List[str]]:
+        return self.rm.consultar_janelas_livres(data, sala_ids)
+
+    def sala_livre(self, sala_id: int, data: str, hora_inicio: str, hora_fim: str) -> bool:
+        return self.rm.sala_livre(sala_id, data, hora_inicio, hora_fim)
+
+    def relatorio_uso(self) -> Dict[int, int]:
+        return self.rm.gerar_relatorio_uso_salas()
+
+    def relatorio_uso_por_periodo(self, periodo: str) -> Dict[int, Dict[str, int]]:
+        return self.rm.gerar_relatorio_uso_por_periodo(periodo)
+
+    def relatorio_analitico(self, data_inicio: int, data_fim: int) -> Dict[str, object]:
+        if self._analise is None:
+            from analytics import AnaliseReservas  # NumPy só é exigido por este relatório
+            self._analise = AnaliseReservas(self.rm.rdao, HORA_ABERTURA, HORA_FECHAMENTO)
+        return self._analise.relatorio(data_inicio, data_fim)
+
+    def definir_estrategia(self, strategy: ConflictStrategy) -> None:
+        self.rm.strategy = strategy
+
+    def fechar(self) -> None:
+        if hasattr(self.factory, "fechar"):
+            self.factory.fechar()
+
+def _servir(conexao, indice: int, total: int, backend: str, opcoes: Dict[str, Any]) -> None:
+    """Laço do processo filho: (id, operação, argumentos) -> (id, ok, resultado ou exceção); None encerra."""
+    trabalho = _Trabalho(indice, total, backend, opcoes)
+    try:
+        while (pedido := conexao.recv()) is not None:
+            pid, op, args = pedido
+            try:
+                resposta = (pid, True, getattr(trabalho, op)(*args))
+            except Exception as e:
+                resposta = (pid, False, e)
+            try:
+                conexao.send(resposta)
+            except Exception as e:   # resultado ou exceção que não serializa
+                conexao.send((pid, False, ParticaoIndisponivelException(f"Resposta inválida da partição: {e!r}")))
+    except (EOFError, OSError):
+        pass   # processo principal saiu sem encerrar
+    finally:
+        trabalho.fechar()
+
+# ---------- Lado do processo principal ----------
+class Particao:
+    """
+    Conexão com o processo de uma partição. chamar() devolve um Future e não
+    espera a resposta: vários threads mantêm pedidos em voo na mesma conexão e
+    um thread leitor entrega cada resposta ao Future correspondente.
+    """
+    def __init__(self, indice: int, total: int, backend: str, opcoes: Dict[str, Any], contexto):
+        self.indice = indice
+        self.conexao, remota = contexto.Pipe()
+        self.processo = contexto.Process(target=_servir, args=(remota, indice, total, backend, opcoes),
+                                         name=f"particao-{indice}", daemon=True)
+        self.processo.start()
+        remota.close()
+        self._envio = threading.Lock()
+        self._pendentes: Dict[int, Future] = {}
+        self._ids = itertools.count()
+        self._leitor = threading.Thread(target=self._receber, name=f"particao-{indice}-leitor", daemon=True)
+        self._leitor.start()
+
+    def chamar(self, op: str, *args) -> Future:
+        f: Future = Future()
+        with self._envio:
+            if self.conexao.closed:
+                raise ParticaoIndisponivelException(f"Partição {self.indice} encerrada.")
+            pid = next(self._ids)
+            self._pendentes[pid] = f
+            try:
+                self.conexao.send((pid, op, args))
+            except OSError:
+                self._pendentes.pop(pid, None)
+                raise ParticaoIndisponivelException(f"Partição {self.indice} não responde.")
+        return f
+
+    def _receber(self) -> None:
+        while True:
+            try:
+                pid, ok, valor = self.conexao.recv()
+            except (EOFError, OSError):
+                break
+            f = self._pendentes.pop(pid)
+            if ok:
+                f.set_result(valor)
+            else:
+                f.set_exception(valor)
+        erro = ParticaoIndisponivelException(f"Partição {self.indice} não responde.")
+        for pid in list(self._pendentes):
+            self._pendentes.pop(pid).set_exception(erro)
+
+    def encerrar(self) -> None:
+        with self._envio:
+            if self.conexao.closed:
+                return
+            try:
+                self.conexao.send(None)
+            except OSError:
+                pass
+        self.processo.join()
+        self._leitor.join()
+        self.conexao.close()
+
+class GrupoParticoes:
+    """Os `total` processos de partição; os processos são iniciados com "spawn" (seguro com threads)."""
+    def __init__(self, total: int, backend: str = "ram", opcoes: Dict[str, Any] | None = None,
+                 metodo_inicio: str = "spawn"):
+        if total < 1:
+            raise ValidarCamposException("O número de partições deve ser pelo menos 1.")
+        contexto = multiprocessing.get_context(metodo_inicio)
+        self.particoes = [Particao(i, total, backend, opcoes_da_particao(backend, opcoes or {}, i), contexto)
+                          for i in range(total)]
+        atexit.register(self.encerrar)   # antes do término forçado dos filhos daemon: fecha journals/bancos
+
+    def __len__(self) -> int:
+        return len(self.particoes)
+
+    def da_sala(self, sala_id: int) -> Particao:
+        return self.particoes[particao_da_sala(sala_id, len(self.particoes))]
+
+    def do_id(self, id_global: int) -> Particao:
+        """Partição dona de uma reserva ou série pelo id global."""
+        return self.particoes[id_global % len(self.particoes)]
+
+    def todas(self, op: str, *args) -> List[Any]:
+        """Envia a todas as partições ao mesmo tempo e espera as respostas (na ordem das partições)."""
+        futuros = [p.chamar(op, *args) for p in self.particoes]
+        return [f.result() for f in futuros]
+
+    def espalhar(self, op: str, itens: Iterable[Any], sala_de: Callable[[Any], int], *args) -> List[Any]:
+        """Agrupa os itens pela partição da sala e chama op(grupo, *args) em cada partição envolvida."""
+        grupos: Dict[int, List[Any]] = {}
+        for item in itens:
+            grupos.setdefault(particao_da_sala(sala_de(item), len(self.particoes)), []).append(item)
+        futuros = [self.particoes[k].chamar(op, grupo, *args) for k, grupo in grupos.items()]
+        return [f.result() for f in futuros]
+
+    def encerrar(self) -> None:
+        for p in self.particoes:
+            p.encerrar()
+        atexit.unregister(self.encerrar)
+
+class ContadorAtivas:
+    """
+    Reservas ativas por usuário somando todas as partições (cada série ativa conta
+    uma). reservar() ocupa a vaga antes da gravação; quem chama devolve com liberar()
+    se a partição recusar, então o limite nunca é ultrapassado.
+    """
+    def __init__(self, limite: int = LIMITE_RESERVAS_ATIVAS):
+        self.limite = limite
+        self._ativas: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def carregar(self, contagem: Dict[str, int]) -> None:
+        with self._lock:
+            self._ativas = {login: n for login, n in contagem.items() if n}
+
+    def reservar(self, login: str) -> None:
+        with self._lock:
+            n = self._ativas.get(login, 0)
+            if n >= self.limite:
+                raise LimiteDeReservasException(f"Limite de {self.limite} reservas ativas por usuário atingido.")
+            self._ativas[login] = n + 1
+
+    def liberar(self, login: str) -> None:
+        with self._lock:
+            n = self._ativas.get(login, 0) - 1
+            if n > 0:
+                self._ativas[login] = n
+            else:
+                self._ativas.pop(login, None)
+
+    def zerar(self, login: str) -> None:
+        with self._lock:
+            self._ativas.pop(login, None)
+
+class SemHistorico:
+    """Caretaker do modo particionado: as operações não são registradas e desfazer/refazer recusam."""
+    def capturar(self, originator):
+        pass
+
+    def registrar(self, delta):
+        pass
+
+    def desfazer(self, originator) -> bool:
+        raise ValidarCamposException("Desfazer/refazer não é suportado no modo particionado.")
+
+    def refazer(self, originator) -> bool:
+        raise ValidarCamposException("Desfazer/refazer não é suportado no modo particionado.")
+
+class SalaManagerParticionado(SalaManager):
+    """Catálogo de salas no processo principal, replicado para a partição dona de cada sala."""
+    def __init__(self, sala_dao: SalaDAO, particoes: GrupoParticoes, logger: AppLogger | None = None):
+        super().__init__(sala_dao, logger=logger)
+        self.particoes = particoes
+
+    def cadastrar_sala(self, nome: str, capacidade: int, recursos: List[str], history=None) -> Sala:
+        s = super().cadastrar_sala(nome, capacidade, recursos, history)
+        try:
+            self.particoes.da_sala(s.sala_id).chamar("adicionar_salas", [s]).result()
+        except Exception:
+            self.sala_dao.delete(s.sala_id)
+            raise
+        return s
+
+    def cadastrar_salas_em_lote(self, dados: List[Tuple[str, int, List[str]]], history=None) -> List[Sala | Exception]:
+        resultados = super().cadastrar_salas_em_lote(dados, history)
+        self.particoes.espalhar("adicionar_salas", [s for s in resultados if isinstance(s, Sala)],
+                                attrgetter("sala_id"))
+        return resultados
+
+    def excluir_sala(self, sala_id: int, history=None):
+        super().excluir_sala(sala_id, history)
+        self.particoes.da_sala(sala_id).chamar("excluir_sala", sala_id).result()
+
+    def _filtrar_livres(self, salas: List[Sala], data_ord: int, inicio: int, fim: int) -> List[Sala]:
+        livres = set().union(*self.particoes.espalhar("salas_livres", salas, attrgetter("sala_id"),
+                                                      data_ord, inicio, fim))
+        return [s for s in salas if s.sala_id in livres]
+
+class ReservaManagerParticionado:
+    """
+    Roteador com a interface do ReservaManager usada pela fachada e pelo importador.
+    O argumento history é aceito por compatibilidade e ignorado (sem desfazer neste
+    modo); logs e notificações saem daqui, não das partições.
+    """
+    def __init__(self, particoes: GrupoParticoes, user_dao: UserDAO, sala_dao: SalaDAO,
+                 logger: AppLogger | None = None, notificador: NotificadorAssincrono | None = None):
+        self.particoes = particoes
+        self.udao = user_dao
+        self.sdao = sala_dao
+        self.logger = logger
+        self.notificador = notificador
+        self._strategy: ConflictStrategy = StrictConflictStrategy()
+        self.contador = ContadorAtivas()
+        self.contador.carregar(sum(self.particoes.todas("ativas_por_usuario"), Counter()))
+
+    @property
+    def strategy(self) -> ConflictStrategy:
+        return self._strategy
+
+    @strategy.setter
+    def strategy(self, strategy: ConflictStrategy) -> None:
+        self.particoes.todas("definir_estrategia", strategy)
+        self._strategy = strategy
+
+    def _notificar(self, r: Reserva, tipo: str):
+        if self.notificador:
+            self.notificador.publicar(Notificacao.de_reserva(r, tipo, self.udao.get_by_login(r.login),
+                                                             self.sdao.get_by_id(r.sala_id)))
+
+    def _com_vaga(self, login: str, particao: Particao, op: str, *args):
+        """Ocupa a vaga do usuário no contador, executa na partição e devolve a vaga se ela recusar."""
+        self.contador.reservar(login)
+        try:
+            return particao.chamar(op, *args).result()
+        except BaseException:
+            self.contador.liberar(login)
+            raise
+
+    def _descartar(self, reservas: List[Reserva]) -> None:
+        por_particao: Dict[Particao, List[int]] = {}
+        for r in reservas:
+            por_particao.setdefault(self.particoes.do_id(r.reserva_id), []).append(r.reserva_id)
+        futuros = [p.chamar("descartar_reservas", ids) for p, ids in por_particao.items()]
+        for f in futuros:
+            f.result()
+
+    # ------- Reservas -------
+    def cadastrar_reserva(self, usuario: Usuario, sala: Sala, data: str, hora_inicio: str, hora_fim: str,
+                          history=None) -> Reserva:
+        # validações locais antes de ocupar a vaga: os erros saem na mesma ordem do ReservaManager
+        ReservaManager._validar_usuario(usuario)
+        ReservaManager._validar_horario(Reserva.nova(0, usuario.login, sala.sala_id, data, hora_inicio, hora_fim))
+        r = self._com_vaga(usuario.login, self.particoes.da_sala(sala.sala_id), "cadastrar_reserva",
+                           usuario, sala, data, hora_inicio, hora_fim)
+        if self.logger: self.logger.info("Reserva criada: user=%s, sala=%s, %s %s-%s", usuario.login, sala.nome, r.data, r.hora_inicio, r.hora_fim)
+        self._notificar(r, CONFIRMACAO)
+        return r
+
+    def cadastrar_reservas_em_lote(self, pedidos: List[PedidoReserva], history=None,
+                                   tudo_ou_nada: bool = False) -> List[ResultadoLote]:
+        """
+        Em rodadas, como no ReservaManager: as vagas do contador são ocupadas na ordem
+        do lote e cada partição recebe só os pedidos que couberam (ela valida conflitos
+        e grava). Vaga devolvida por conflito volta aos pedidos adiados do mesmo usuário
+        na rodada seguinte. Com tudo_ou_nada, qualquer rejeição descarta o que foi gravado.
+        """
+        resultados = [ResultadoLote(indice=i, pedido=p) for i, p in enumerate(pedidos)]
+        usuarios: Dict[str, Optional[Usuario]] = {}
+        # validações locais antes de ocupar vagas: só pedidos válidos disputam o limite
+        candidatas = ReservaManager._validar_pedidos(resultados, self.udao, self.sdao, usuarios)
+        aceitas: List[ResultadoLote] = []
+        pendentes = sorted(candidatas)
+        while pendentes:
+            rodada: List[int] = []
+            adiadas: Dict[int, LimiteDeReservasException] = {}
+            for i in pendentes:
+                try:
+                    self.contador.reservar(candidatas[i].login)
+                    rodada.append(i)
+                except LimiteDeReservasException as e:
+                    adiadas[i] = e
+            try:
+                self._gravar_rodada(rodada, resultados, usuarios)
+            except Exception:   # partição fora do ar: nada do lote fica gravado
+                ocupadas = aceitas + [resultados[i] for i in rodada]
+                for res in ocupadas:
+                    self.contador.liberar(res.pedido.login)
+                self._descartar([res.reserva for res in ocupadas if res.ok])
+                raise
+            liberaram = set()
+            for i in rodada:
+                if resultados[i].ok:
+                    aceitas.append(resultados[i])
+                else:
+                    self.contador.liberar(candidatas[i].login)
+                    liberaram.add(candidatas[i].login)
+            pendentes = [i for i in adiadas if candidatas[i].login in liberaram]
+            for i, e in adiadas.items():
+                if candidatas[i].login not in liberaram:
+                    resultados[i].erro = e
+
+        rejeitadas = len(resultados) - len(aceitas)
+        if tudo_ou_nada and rejeitadas:
+            for res in aceitas:
+                self.contador.liberar(res.reserva.login)
+            self._descartar([res.reserva for res in aceitas])
+            for res in aceitas:
+                res.reserva, res.erro = None, ValidarCamposException("Lote descartado: há pedidos rejeitados.")
+            if self.logger: self.logger.warning("Lote de reservas descartado: %s de %s rejeitadas", rejeitadas, len(resultados))
+            return resultados
+        aceitas.sort(key=lambda res: res.indice)
+        if self.logger: self.logger.info("Lote de reservas: %s criadas, %s rejeitadas", len(aceitas), rejeitadas)
+        for res in aceitas:
+            self._notificar(res.reserva, CONFIRMACAO)
+        return resultados
+
+    def _gravar_rodada(self, indices: List[int], resultados: List[ResultadoLote],
+                       usuarios: Dict[str, Optional[Usuario]]) -> None:
+        """Envia os pedidos a suas partições ao mesmo tempo e anota reserva/erro de cada um."""
+        grupos: Dict[Particao, List[int]] = {}
+        for i in indices:
+            grupos.setdefault(self.particoes.da_sala(resultados[i].pedido.sala_id), []).append(i)
+        futuros = {particao: particao.chamar("cadastrar_reservas_em_lote", [resultados[i].pedido for i in grupo],
+                                             {resultados[i].pedido.login: usuarios[resultados[i].pedido.login]
+                                              for i in grupo})
+                   for particao, grupo in grupos.items()}
+        falha: Optional[BaseException] = None
+        for particao, grupo in grupos.items():
+            try:
+                for i, (reserva, erro) in zip(grupo, futuros[particao].result()):
+                    resultados[i].reserva, resultados[i].erro = reserva, erro
+            except Exception as e:
+                falha = falha or e
+        if falha is not None:
+            raise falha
+
+    def cancelar_reserva(self, reserva_id: int, usuario: Usuario, history=None) -> Reserva:
+        r, estava_ativa = self.particoes.do_id(reserva_id).chamar("cancelar_reserva", reserva_id, usuario).result()
+        if estava_ativa:
+            self.contador.liberar(r.login)
+        if self.logger: self.logger.warning("Reserva cancelada: id=%s, por=%s", r.reserva_id, usuario.login)
+        self._notificar(r, CANCELAMENTO)
+        return r
+
+    # ------- Séries recorrentes -------
+    def cadastrar_serie(self, usuario: Usuario, sala: Sala, regra: RegraRecorrencia, history=None) -> SerieReserva:
+        ReservaManager._validar_usuario(usuario)
+        datas = ReservaManager._validar_serie(SerieReserva(serie_id=0, login=usuario.login, sala_id=sala.sala_id,
+                                                           regra=regra))
+        t = self._com_vaga(usuario.login, self.particoes.da_sala(sala.sala_id), "cadastrar_serie", usuario, sala, regra)
+        if self.logger: self.logger.info("Série criada: user=%s, sala=%s, %s ocorrências", usuario.login, sala.nome, len(datas))
+        return t
+
+    def cancelar_serie(self, serie_id: int, usuario: Usuario, history=None) -> SerieReserva:
+        t, estava_ativa = self.particoes.do_id(serie_id).chamar("cancelar_serie", serie_id, usuario).result()
+        if estava_ativa:
+            self.contador.liberar(t.login)
+        if self.logger: self.logger.warning("Série cancelada: id=%s, por=%s", serie_id, usuario.login)
+        return t
+
+    def cancelar_ocorrencia(self, serie_id: int, data: str, usuario: Usuario, history=None) -> SerieReserva:
+        t = self.particoes.do_id(serie_id).chamar("cancelar_ocorrencia", serie_id, data, usuario).result()
+        if self.logger: self.logger.warning("Ocorrência cancelada: serie=%s, %s, por=%s", serie_id, data, usuario.login)
+        return t
+
+    def ocorrencias_da_serie(self, serie_id: int, usuario: Usuario, data_inicio: str | None = None,
+                             data_fim: str | None = None) -> Iterator[Reserva]:
+        return iter(self.particoes.do_id(serie_id).chamar("ocorrencias_da_serie", serie_id, usuario,
+                                                          data_inicio, data_fim).result())
+
+    def listar_series_por_usuario(self, login: str) -> List[SerieReserva]:
+        return list(heapq.merge(*self.particoes.todas("series_por_usuario", login), key=attrgetter("serie_id")))
+
+    # ------- Consultas -------
+    def consultar_disponibilidade(self, data: str) -> Dict[str, List[str]]:
+        data_para_ordinal(data)  # valida o formato uma vez, antes de consultar as partições
+        ocupacao: Dict[int, List[str]] = {}
+        for parte in self.particoes.todas("ocupacao_por_sala", data):
+            ocupacao.update(parte)
+        disponibilidade: Dict[str, List[str]] = {}
+        for s in self.sdao.list_all():
+            disponibilidade.setdefault(s.nome, []).extend(ocupacao.get(s.sala_id, ()))
+        return disponibilidade
+
+    def consultar_janelas_livres(self, data: str, sala_ids: List[int] | None = None) -> Dict[int, List[str]]:
+        data_para_ordinal(data)
+        if sala_ids is None:
+            sala_ids = [s.sala_id for s in self.sdao.list_all()]
+        janelas: Dict[int, List[str]] = {}
+        for parte in self.particoes.espalhar("janelas_livres", sala_ids, lambda sid: sid, data):
+            janelas.update(parte)
+        return {sid: janelas[sid] for sid in sala_ids}
+
+    def sala_livre(self, sala_id: int, data: str, hora_inicio: str, hora_fim: str) -> bool:
+        return self.particoes.da_sala(sala_id).chamar("sala_livre", sala_id, data, hora_inicio, hora_fim).result()
+
+    def listar_reservas_por_periodo(self, data_inicio: str, data_fim: str, sala_id: int | None = None) -> List[Reserva]:
+        if sala_id is not None:
+            return self.particoes.da_sala(sala_id).chamar("reservas_por_periodo", data_inicio, data_fim,
+                                                          sala_id).result()
+        partes = self.particoes.todas("reservas_por_periodo", data_inicio, data_fim, None)
+        return list(heapq.merge(*partes, key=_ordem_cronologica))
+
+    def listar_reservas_por_usuario(self, login: str) -> List[Reserva]:
+        return list(heapq.merge(*self.particoes.todas("reservas_por_usuario", login), key=attrgetter("reserva_id")))
+
+    def _pagina_por_usuario(self, login: str, limite: int, apos: Chave) -> Tuple[List[Reserva], Chave]:
+        """Cada partição devolve suas `limite` primeiras após a chave; as menores do todo estão entre elas."""
+        partes = self.particoes.todas("pagina_por_usuario", login, limite, apos)
+        itens = list(heapq.merge(*(itens for itens, _ in partes), key=attrgetter("reserva_id")))
+        mais = len(itens) > limite or any(mais for _, mais in partes)
+        itens = itens[:limite]
+        return itens, (itens[-1].reserva_id if mais and itens else None)
+
+    def paginar_reservas_por_usuario(self, login: str, limite: int = 50, cursor: str | None = None) -> Pagina:
+        return _paginar("reservas", lambda n, apos: self._pagina_por_usuario(login, n, apos), limite, cursor)
+
+    def iterar_reservas_por_usuario(self, login: str) -> Iterator[Reserva]:
+        return iterar_paginas(lambda n, apos: self._pagina_por_usuario(login, n, apos))
+
+    def excluir_usuario(self, login: str, history=None):
+        """Exclui o usuário e, em cascata, as reservas e séries dele em todas as partições."""
+        if not self.udao.get_by_login(login):
+            raise EntidadeNaoEncontradaException("Usuário não encontrado.")
+        removidas = sum(self.particoes.todas("excluir_reservas_do_usuario", login))
+        self.udao.delete_by_login(login)
+        self.contador.zerar(login)
+        if self.logger: self.logger.warning("Usuário excluído: %s (%s reservas removidas)", login, removidas)
+
+    # ------- Relatórios -------
+    def gerar_relatorio_uso_salas(self) -> Dict[int, int]:
+        rel: Dict[int, int] = {}
+        for parte in self.particoes.todas("relatorio_uso"):
+            rel.update(parte)
+        return dict(sorted(rel.items()))
+
+    def gerar_relatorio_uso_por_periodo(self, periodo: str) -> Dict[int, Dict[str, int]]:
+        if periodo not in PERIODOS:
+            raise ValidarCamposException(f"Período inválido: '{periodo}'. Use {', '.join(PERIODOS)}.")
+        rel: Dict[int, Dict[str, int]] = {}
+        for parte in self.particoes.todas("relatorio_uso_por_periodo", periodo):
+            rel.update(parte)
+        return dict(sorted(rel.items()))
+
+    def gerar_relatorio_analitico(self, data_inicio: int, data_fim: int) -> Dict[str, object]:
+        from analytics import combinar_relatorios
+        return combinar_relatorios(self.particoes.todas("relatorio_analitico", data_inicio, data_fim))
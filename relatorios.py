@@ -0,0 +1,50 @@
+# relatorios.py — relatório de uso das salas como visão materializada
+#
+# As contagens são atualizadas pelo DAO de reservas (ObservadorReservas) a cada
+# reserva criada/cancelada/removida, em O(1) (ou O(horas) no recorte por hora),
+# e reconstruídas junto com os índices após undo/redo. Gerar o relatório é só ler.
+from typing import Dict, Tuple
+from repository import EntradaReserva, ObservadorReservas
+
+PERIODOS = ("dia", "semana", "hora")
+
+def inicio_da_semana(data_ord: int) -> int:
+    """Ordinal da segunda-feira da semana (o ordinal 1 é uma segunda-feira)."""
+    return data_ord - (data_ord - 1) % 7
+
+def horas_tocadas(inicio_min: int, fim_min: int) -> range:
+    return range(inicio_min // 60, (fim_min - 1) // 60 + 1)
+
+def _somar(contagem: Dict, chave, delta: int) -> None:
+    n = contagem.get(chave, 0) + delta
+    if n:
+        contagem[chave] = n
+    else:
+        del contagem[chave]
+
+class RelatorioUso(ObservadorReservas):
+    """Reservas ativas por sala_id, e por (sala_id, dia|semana|hora do dia)."""
+    def __init__(self):
+        self.por_sala: Dict[int, int] = {}
+        self.por_periodo: Dict[str, Dict[Tuple[int, int], int]] = {p: {} for p in PERIODOS}
+
+    def _aplicar(self, e: EntradaReserva, delta: int) -> None:
+        if not e.ativa:
+            return
+        _somar(self.por_sala, e.sala_id, delta)
+        _somar(self.por_periodo["dia"], (e.sala_id, e.data_ord), delta)
+        _somar(self.por_periodo["semana"], (e.sala_id, inicio_da_semana(e.data_ord)), delta)
+        for h in horas_tocadas(e.inicio_min, e.fim_min):
+            _somar(self.por_periodo["hora"], (e.sala_id, h), delta)
+
+    # ---- ObservadorReservas ----
+    def reserva_indexada(self, e: EntradaReserva) -> None:
+        self._aplicar(e, 1)
+
+    def reserva_desindexada(self, e: EntradaReserva) -> None:
+        self._aplicar(e, -1)
+
+    def limpar(self) -> None:
+        self.por_sala.clear()
+        for contagem in self.por_periodo.values():
+            contagem.clear()
@@ -1,12 +1,29 @@
 # repository.py (PORTAS / interfaces DAO)
 from abc import ABC, abstractmethod
-from typing import Iterable, Optional, List
-from models import Usuario, Sala, Reserva
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, List, NamedTuple, Tuple
+from models import Usuario, Sala, Reserva, SerieReserva
+
+# Paginação por chave: list_page(limite, apos) devolve (itens, chave do último item
+# ou None se não há mais). A chave é o id interno, crescente na ordem de cadastro.
+Chave = Optional[int]
+
+def iterar_paginas(pagina: Callable[[int, Chave], Tuple[List[Any], Chave]], lote: int = 500) -> Iterator[Any]:
+    """Percorre uma consulta paginada sob demanda, `lote` itens por vez (nunca a tabela inteira)."""
+    apos: Chave = None
+    while True:
+        itens, apos = pagina(lote, apos)
+        yield from itens
+        if apos is None:
+            return
 
 # ---------- USER ----------
 class UserDAO(ABC):
     @abstractmethod
     def add(self, u: Usuario) -> None: ...
+    def add_many(self, usuarios: Iterable[Usuario]) -> None:
+        """Inserção em lote; implementações podem sobrescrever com uma operação única."""
+        for u in usuarios:
+            self.add(u)
     @abstractmethod
     def get_by_login(self, login: str) -> Optional[Usuario]: ...
     @abstractmethod
@@ -14,32 +31,146 @@ class UserDAO(ABC):
     @abstractmethod
     def list_all(self) -> Iterable[Usuario]: ...
     @abstractmethod
+    def list_page(self, limite: int, apos: Chave = None) -> Tuple[List[Usuario], Chave]:
+        """Até `limite` usuários em ordem de cadastro, depois da chave `apos`."""
+        ...
+    def iter_all(self, lote: int = 500) -> Iterator[Usuario]:
+        return iterar_paginas(self.list_page, lote)
+    @abstractmethod
     def update(self, u: Usuario) -> None: ...
     @abstractmethod
     def delete(self, uid: int) -> None: ...
+    @abstractmethod
+    def delete_by_login(self, login: str) -> bool: ...
 
 # ---------- SALA ----------
 class SalaDAO(ABC):
     @abstractmethod
     def add(self, s: Sala) -> Sala: ...
+    def add_many(self, salas: Iterable[Sala]) -> List[Sala]:
+        return [self.add(s) for s in salas]
     @abstractmethod
     def get_by_id(self, sala_id: int) -> Optional[Sala]: ...
     @abstractmethod
     def list_all(self) -> Iterable[Sala]: ...
     @abstractmethod
+    def list_page(self, limite: int, apos: Chave = None) -> Tuple[List[Sala], Chave]:
+        """Até `limite` salas com sala_id > apos, em ordem de id."""
+        ...
+    def iter_all(self, lote: int = 500) -> Iterator[Sala]:
+        return iterar_paginas(self.list_page, lote)
+    @abstractmethod
     def delete(self, sala_id: int) -> bool: ...
+    @abstractmethod
+    def find_by_criterios(self, capacidade_min: int = 0, recursos: Iterable[str] = ()) -> List[Sala]:
+        """Salas com capacidade >= capacidade_min e TODOS os recursos, em ordem de capacidade."""
+        ...
 
 # ---------- RESERVA ----------
 class ReservaDAO(ABC):
     @abstractmethod
     def add(self, r: Reserva) -> Reserva: ...
+    def add_many(self, reservas: Iterable[Reserva]) -> List[Reserva]:
+        return [self.add(r) for r in reservas]
     @abstractmethod
     def get_by_id(self, rid: int) -> Optional[Reserva]: ...
     @abstractmethod
     def list_all(self) -> Iterable[Reserva]: ...
     @abstractmethod
+    def list_page(self, limite: int, apos: Chave = None) -> Tuple[List[Reserva], Chave]:
+        """Até `limite` reservas com reserva_id > apos, em ordem de id."""
+        ...
+    def iter_all(self, lote: int = 500) -> Iterator[Reserva]:
+        return iterar_paginas(self.list_page, lote)
+    @abstractmethod
     def list_by_sala_data(self, sala_id: int, data: str) -> List[Reserva]: ...
     @abstractmethod
+    def list_by_periodo(self, de_ord: int, ate_ord: int, sala_id: Optional[int] = None) -> List[Reserva]:
+        """Reservas ativas com data em [de_ord, ate_ord] (ordinais), em ordem cronológica; sala_id restringe a uma sala."""
+        ...
+    @abstractmethod
+    def find_overlapping(self, sala_id: int, data_ord: int, inicio: int, fim: int) -> List[Reserva]:
+        """Reservas ativas da sala no dia (ordinal) que intersectam [inicio, fim) em minutos."""
+        ...
+    @abstractmethod
+    def sala_livre(self, sala_id: int, data_ord: int, inicio: int, fim: int) -> bool: ...
+    @abstractmethod
+    def janelas_livres(self, sala_id: int, data_ord: int, inicio: int, fim: int) -> List[Tuple[int, int]]:
+        """Intervalos livres (em minutos) da sala no dia, recortados a [inicio, fim)."""
+        ...
+    @abstractmethod
+    def contagem_ativas_por_sala(self) -> Dict[int, int]: ...
+    @abstractmethod
+    def contagem_ativas_por_periodo(self, periodo: str) -> Dict[Tuple[int, int], int]:
+        """
+        Reservas ativas por (sala_id, balde): periodo "dia" (ordinal da data),
+        "semana" (ordinal da segunda-feira) ou "hora" (hora do dia tocada pela reserva).
+        """
+        ...
+    @abstractmethod
+    def list_by_usuario(self, login: str) -> List[Reserva]: ...
+    @abstractmethod
+    def list_page_by_usuario(self, login: str, limite: int, apos: Chave = None) -> Tuple[List[Reserva], Chave]: ...
+    def iter_by_usuario(self, login: str, lote: int = 500) -> Iterator[Reserva]:
+        return iterar_paginas(lambda limite, apos: self.list_page_by_usuario(login, limite, apos), lote)
+    @abstractmethod
+    def count_ativas_by_usuario(self, login: str) -> int: ...
+    @abstractmethod
     def update(self, r: Reserva) -> None: ...
     @abstractmethod
     def delete(self, rid: int) -> None: ...
+    @abstractmethod
+    def delete_by_usuario(self, login: str) -> int:
+        """Remove todas as reservas do usuário; retorna quantas foram removidas."""
+        ...
+
+# ---------- Observadores de índice (visões derivadas mantidas incrementalmente) ----------
+class EntradaReserva(NamedTuple):
+    """Estado de uma reserva no momento em que foi indexada pelo DAO."""
+    reserva_id: int
+    login: str
+    sala_id: int
+    data_ord: int
+    inicio_min: int
+    fim_min: int
+    ativa: bool
+
+    @property
+    def chave(self) -> Tuple[int, int]:
+        return (self.sala_id, self.data_ord)
+
+    @property
+    def intervalo(self) -> Tuple[int, int, int]:
+        return (self.inicio_min, self.fim_min, self.reserva_id)
+
+class ObservadorReservas(ABC):
+    """Recebe as mudanças de índice de um DAO de reservas (ex.: mapa de ocupação)."""
+    @abstractmethod
+    def reserva_indexada(self, e: EntradaReserva) -> None: ...
+    @abstractmethod
+    def reserva_desindexada(self, e: EntradaReserva) -> None: ...
+    @abstractmethod
+    def limpar(self) -> None: ...
+
+# ---------- SÉRIES (reservas recorrentes) ----------
+class SerieDAO(ABC):
+    @abstractmethod
+    def add(self, s: SerieReserva) -> SerieReserva: ...
+    @abstractmethod
+    def get_by_id(self, serie_id: int) -> Optional[SerieReserva]: ...
+    @abstractmethod
+    def list_all(self) -> Iterable[SerieReserva]: ...
+    @abstractmethod
+    def list_by_usuario(self, login: str) -> List[SerieReserva]: ...
+    @abstractmethod
+    def count_ativas_by_usuario(self, login: str) -> int: ...
+    @abstractmethod
+    def find_overlapping(self, sala_id: int, data_ord: int, inicio: int, fim: int) -> List[SerieReserva]:
+        """Séries ativas da sala com ocorrência no dia (ordinal) cujo horário intersecta [inicio, fim)."""
+        ...
+    @abstractmethod
+    def update(self, s: SerieReserva) -> None: ...
+    @abstractmethod
+    def delete(self, serie_id: int) -> None: ...
+    @abstractmethod
+    def delete_by_usuario(self, login: str) -> int: ...
@@ -0,0 +1,121 @@
+# seguranca.py — hash de senhas (scrypt), verificação num pool limitado e cache de sessões
+#
+# As senhas são guardadas como "scrypt$n$r$p$sal$hash" (base64). O KDF é lento de
+# propósito, então roda num ThreadPoolExecutor de tamanho fixo: hashlib.scrypt
+# libera o GIL, o pool limita quantos cálculos (CPU e ~128*n*r bytes de memória
+# cada) acontecem ao mesmo tempo e um pico de logins não trava os demais threads.
+# Depois do login o cliente usa um token opaco: CacheSessoes resolve token -> login
+# em O(1), sem tocar no KDF.
+import base64
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+PREFIXO = "scrypt"
+
+def _b64(b: bytes) -> str:
+    return base64.b64encode(b).decode("ascii")
+
+def gerar_hash(senha: str, n: int = 2 ** 14, r: int = 8, p: int = 1) -> str:
+    sal = secrets.token_bytes(16)
+    dk = hashlib.scrypt(senha.encode("utf-8"), salt=sal, n=n, r=r, p=p, maxmem=256 * n * r * p, dklen=32)
+    return f"{PREFIXO}${n}${r}${p}${_b64(sal)}${_b64(dk)}"
+
+def _decompor(armazenado: str) -> Optional[Tuple[int, int, int, bytes, bytes]]:
+    partes = armazenado.split("$")
+    if len(partes) != 6 or partes[0] != PREFIXO:
+        return None
+    return int(partes[1]), int(partes[2]), int(partes[3]), base64.b64decode(partes[4]), base64.b64decode(partes[5])
+
+def conferir_hash(senha: str, armazenado: str) -> bool:
+    """Compara em tempo constante; valores sem o prefixo são senhas legadas em texto puro."""
+    partes = _decompor(armazenado)
+    if partes is None:
+        return hmac.compare_digest(senha.encode("utf-8"), armazenado.encode("utf-8"))
+    n, r, p, sal, esperado = partes
+    dk = hashlib.scrypt(senha.encode("utf-8"), salt=sal, n=n, r=r, p=p, maxmem=256 * n * r * p, dklen=len(esperado))
+    return hmac.compare_digest(dk, esperado)
+
+class VerificadorSenhas:
+    """Gera e confere hashes num pool de `trabalhadores` threads; quem chama espera o resultado."""
+    def __init__(self, trabalhadores: int = 4, n: int = 2 ** 14, r: int = 8, p: int = 1):
+        self.parametros = (n, r, p)
+        self._pool = ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix="kdf")
+        self._ficticio: str | None = None
+
+    def gerar(self, senha: str) -> str:
+        return self._pool.submit(gerar_hash, senha, *self.parametros).result()
+
+    def gerar_varios(self, senhas: List[str]) -> List[str]:
+        """Hashes de um lote em paralelo (importação), na ordem recebida."""
+        return list(self._pool.map(lambda senha: gerar_hash(senha, *self.parametros), senhas))
+
+    def verificar(self, senha: str, armazenado: str | None) -> bool:
+        """Sem hash (login inexistente) confere contra um hash fictício: o tempo não revela se o login existe."""
+        if armazenado is None:
+            if self._ficticio is None:
+                self._ficticio = self.gerar(secrets.token_hex(8))
+            self._pool.submit(conferir_hash, senha, self._ficticio).result()
+            return False
+        return self._pool.submit(conferir_hash, senha, armazenado).result()
+
+    def precisa_rehash(self, armazenado: str) -> bool:
+        """Texto puro ou hash com parâmetros diferentes dos atuais."""
+        partes = _decompor(armazenado)
+        return partes is None or partes[:3] != self.parametros
+
+    def fechar(self) -> None:
+        self._pool.shutdown(wait=True)
+
+class CacheSessoes:
+    """
+    token -> login com expiração por inatividade (ttl_s) e no máximo `capacidade`
+    sessões; acima disso a usada há mais tempo é descartada (LRU).
+    """
+    def __init__(self, ttl_s: float = 30 * 60, capacidade: int = 10000):
+        self.ttl_s = ttl_s
+        self.capacidade = capacidade
+        self._sessoes: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def criar(self, login: str) -> str:
+        token = secrets.token_urlsafe(24)
+        with self._lock:
+            self._sessoes[token] = (login, time.monotonic() + self.ttl_s)
+            while len(self._sessoes) > self.capacidade:
+                self._sessoes.popitem(last=False)
+        return token
+
+    def obter(self, token: str) -> Optional[str]:
+        agora = time.monotonic()
+        with self._lock:
+            item = self._sessoes.get(token)
+            if item is None:
+                return None
+            login, expira = item
+            if expira <= agora:
+                del self._sessoes[token]
+                return None
+            self._sessoes[token] = (login, agora + self.ttl_s)
+            self._sessoes.move_to_end(token)
+            return login
+
+    def remover(self, token: str) -> None:
+        with self._lock:
+            self._sessoes.pop(token, None)
+
+    def remover_login(self, login: str) -> int:
+        """Derruba todas as sessões do login (bloqueio/exclusão); devolve quantas eram."""
+        with self._lock:
+            tokens = [t for t, (l, _) in self._sessoes.items() if l == login]
+            for t in tokens:
+                del self._sessoes[t]
+            return len(tokens)
+
+    def __len__(self) -> int:
+        return len(self._sessoes)
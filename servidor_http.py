@@ -0,0 +1,446 @@
+# servidor_http.py — front-end HTTP/JSON (asyncio, só stdlib) sobre a fachada
+#
+#   python servidor_http.py --porta 8080 [--backend sqlite --caminho reservas.db]
+#
+# HTTP/1.1 com keep-alive e pipelining: cada conexão lê pedidos em sequência do
+# mesmo stream e responde na ordem em que chegaram. As chamadas à fachada (que
+# podem bloquear em SQLite, journal ou locks) rodam num ThreadPoolExecutor, então
+# o event loop continua atendendo as outras conexões.
+#
+# Autenticação: POST /login devolve um token (sessão da fachada, com expiração por
+# inatividade); as demais rotas exigem "Authorization: Bearer <token>". Rotas /admin,
+# /desfazer e /refazer exigem ainda perfil admin.
+import argparse
+import asyncio
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs, unquote
+from controller import FacadeSingletonController
+from instrumentacao import EscritorPrometheus
+from exceptions import *
+from models import Usuario, Sala, Reserva, PedidoReserva, ResultadoLote, Pagina
+
+LIMITE_CABECALHO = 16 * 1024
+LIMITE_CORPO = 1024 * 1024
+
+# ---------- Serialização explícita (nunca expõe a senha) ----------
+def usuario_json(u: Usuario) -> Dict[str, Any]:
+    return {"nome": u.nome, "login": u.login, "perfil": u.perfil, "bloqueado": u.bloqueado}
+
+def sala_json(s: Sala) -> Dict[str, Any]:
+    return {"sala_id": s.sala_id, "nome": s.nome, "capacidade": s.capacidade, "recursos": list(s.recursos)}
+
+def reserva_json(r: Reserva, sala_nome: str) -> Dict[str, Any]:
+    return {"reserva_id": r.reserva_id, "login": r.login, "sala_id": r.sala_id, "sala": sala_nome,
+            "data": r.data, "hora_inicio": r.hora_inicio, "hora_fim": r.hora_fim, "status": r.status,
+            "serie_id": r.serie_id}
+
+def pagina_json(p: Pagina, conversor: Callable[[Any], Dict[str, Any]]) -> Dict[str, Any]:
+    return {"itens": [conversor(i) for i in p.itens], "proximo": p.proximo}
+
+def resultado_lote_json(res: ResultadoLote, conversor: Callable[[Reserva], Dict[str, Any]]) -> Dict[str, Any]:
+    if res.ok:
+        return {"indice": res.indice, "ok": True, "reserva": conversor(res.reserva)}
+    return {"indice": res.indice, "ok": False, "erro": str(res.erro), "tipo": type(res.erro).__name__}
+
+# exceção de negócio -> status HTTP
+STATUS_POR_EXCECAO = {
+    ValidarCamposException: HTTPStatus.BAD_REQUEST,
+    PermissaoNegadaException: HTTPStatus.FORBIDDEN,
+    UsuarioBloqueadoException: HTTPStatus.FORBIDDEN,
+    EntidadeNaoEncontradaException: HTTPStatus.NOT_FOUND,
+    ConflitoDeReservaException: HTTPStatus.CONFLICT,
+    LimiteDeReservasException: HTTPStatus.CONFLICT,
+    ParticaoIndisponivelException: HTTPStatus.SERVICE_UNAVAILABLE,
+}
+
+class ErroHTTP(Exception):
+    def __init__(self, status: HTTPStatus, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+
+class Requisicao:
+    __slots__ = ("metodo", "caminho", "query", "cabecalhos", "corpo", "params", "usuario")
+
+    def __init__(self, metodo: str, alvo: str, cabecalhos: Dict[str, str], corpo: bytes):
+        partes = urlsplit(alvo)
+        self.metodo = metodo
+        self.caminho = partes.path
+        self.query = {k: v[-1] for k, v in parse_qs(partes.query).items()}
+        self.cabecalhos = cabecalhos
+        self.corpo = corpo
+        self.params: Tuple[str, ...] = ()
+        self.usuario: Optional[Usuario] = None
+
+    def json(self) -> Dict[str, Any]:
+        if not self.corpo:
+            return {}
+        try:
+            dados = json.loads(self.corpo)
+        except ValueError:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, "Corpo JSON inválido.")
+        if not isinstance(dados, dict):
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, "O corpo deve ser um objeto JSON.")
+        return dados
+
+def _campo(dados: Dict[str, Any], nome: str) -> Any:
+    if nome not in dados:
+        raise ErroHTTP(HTTPStatus.BAD_REQUEST, f"Campo obrigatório ausente: {nome}")
+    return dados[nome]
+
+def _inteiro(valor: Any, nome: str) -> int:
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        raise ErroHTTP(HTTPStatus.BAD_REQUEST, f"'{nome}' deve ser um número inteiro.")
+
+def _paginacao(req: Requisicao) -> Optional[Tuple[int, Optional[str]]]:
+    """(limite, cursor) se a listagem pediu paginação (?limite=&cursor=); None = lista completa."""
+    q = req.query
+    if "limite" not in q and "cursor" not in q:
+        return None
+    return _inteiro(q.get("limite", 50), "limite"), q.get("cursor")
+
+def _lista(valor: Optional[str]) -> Optional[List[str]]:
+    return [v for v in valor.split(",") if v] if valor else None
+
+class ServicoReservas:
+    """Rotas -> chamadas da fachada. Cada handler roda no executor e devolve (status, corpo)."""
+    def __init__(self, controller: FacadeSingletonController):
+        self.c = controller
+        R = self._rota
+        self._rotas: List[Tuple[str, re.Pattern, Callable, bool]] = [
+            R("POST", r"/login", self.login, publica=True),
+            R("POST", r"/logout", self.logout),
+            R("POST", r"/usuarios", self.cadastrar_usuario, publica=True),
+            R("GET", r"/disponibilidade", self.disponibilidade),
+            R("GET", r"/janelas", self.janelas_livres),
+            R("GET", r"/salas", self.buscar_salas),
+            R("GET", r"/reservas", self.minhas_reservas),
+            R("POST", r"/reservas", self.criar_reserva),
+            R("POST", r"/reservas/lote", self.criar_reservas_em_lote),
+            R("DELETE", r"/reservas/(\d+)", self.cancelar_reserva),
+            R("POST", r"/desfazer", self.desfazer),
+            R("POST", r"/refazer", self.refazer),
+            R("GET", r"/admin/salas", self.admin_listar_salas),
+            R("POST", r"/admin/salas", self.admin_cadastrar_sala),
+            R("DELETE", r"/admin/salas/(\d+)", self.admin_excluir_sala),
+            R("GET", r"/admin/usuarios", self.admin_listar_usuarios),
+            R("POST", r"/admin/usuarios/([^/]+)/bloquear", self.admin_bloquear_usuario),
+            R("DELETE", r"/admin/usuarios/([^/]+)", self.admin_excluir_usuario),
+            R("GET", r"/admin/usuarios/([^/]+)/reservas", self.admin_reservas_usuario),
+            R("GET", r"/admin/reservas", self.admin_reservas_periodo),
+            R("GET", r"/admin/relatorios/uso", self.admin_relatorio_uso),
+            R("GET", r"/admin/relatorios/analitico", self.admin_relatorio_analitico),
+            R("GET", r"/admin/historico", self.admin_historico),
+            R("GET", r"/admin/metricas", self.admin_metricas),
+            R("PUT", r"/admin/estrategia", self.admin_estrategia),
+        ]
+
+    def _reserva_json(self, r: Reserva) -> Dict[str, Any]:
+        return reserva_json(r, self.c.nome_da_sala(r.sala_id))
+
+    @staticmethod
+    def _rota(metodo: str, padrao: str, handler: Callable, publica: bool = False):
+        return metodo, re.compile(padrao), handler, publica
+
+    # ---- despacho ----
+    def atender(self, req: Requisicao) -> Tuple[int, Any]:
+        caminho_existe = False
+        for metodo, padrao, handler, publica in self._rotas:
+            m = padrao.fullmatch(req.caminho)
+            if not m:
+                continue
+            caminho_existe = True
+            if metodo != req.metodo:
+                continue
+            req.params = tuple(unquote(g) for g in m.groups())   # casa no caminho cru: "%2F" não vira separador
+            try:
+                if not publica:
+                    req.usuario = self._autenticar(req)
+                return handler(req)
+            except ErroHTTP as e:
+                return e.status, {"erro": str(e)}
+            except tuple(STATUS_POR_EXCECAO) as e:
+                return STATUS_POR_EXCECAO[type(e)], {"erro": str(e), "tipo": type(e).__name__}
+        if caminho_existe:
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"erro": "Método não permitido."}
+        return HTTPStatus.NOT_FOUND, {"erro": "Rota não encontrada."}
+
+    def _autenticar(self, req: Requisicao) -> Usuario:
+        tipo, _, token = req.cabecalhos.get("authorization", "").partition(" ")
+        usuario = self.c.usuario_por_token(token) if tipo.lower() == "bearer" else None
+        if not usuario:
+            raise ErroHTTP(HTTPStatus.UNAUTHORIZED, "Sessão inválida ou expirada.")
+        return usuario
+
+    # ---- sessão / usuário ----
+    def login(self, req: Requisicao):
+        d = req.json()
+        token, u = self.c.iniciar_sessao(str(d.get("login", "")), str(d.get("senha", "")))
+        if token is None:
+            raise ErroHTTP(HTTPStatus.UNAUTHORIZED, "Login ou senha incorretos.")
+        return HTTPStatus.OK, {"token": token, "usuario": usuario_json(u)}
+
+    def logout(self, req: Requisicao):
+        _, _, token = req.cabecalhos.get("authorization", "").partition(" ")
+        self.c.encerrar_sessao(token)
+        return HTTPStatus.NO_CONTENT, None
+
+    def cadastrar_usuario(self, req: Requisicao):
+        d = req.json()
+        u = self.c.cadastrar_usuario(_campo(d, "nome"), _campo(d, "login"), _campo(d, "senha"))
+        return HTTPStatus.CREATED, usuario_json(u)
+
+    # ---- consultas ----
+    def disponibilidade(self, req: Requisicao):
+        return HTTPStatus.OK, self.c.consultar_disponibilidade(_campo(req.query, "data"))
+
+    def janelas_livres(self, req: Requisicao):
+        ids = _lista(req.query.get("salas"))
+        salas = [_inteiro(i, "salas") for i in ids] if ids else None
+        return HTTPStatus.OK, self.c.consultar_janelas_livres(_campo(req.query, "data"), salas)
+
+    def buscar_salas(self, req: Requisicao):
+        q = req.query
+        salas = self.c.buscar_salas_disponiveis(_inteiro(q.get("capacidade_min", 0), "capacidade_min"),
+                                                _lista(q.get("recursos")), q.get("data"),
+                                                q.get("hora_inicio"), q.get("hora_fim"))
+        return HTTPStatus.OK, [sala_json(s) for s in salas]
+
+    def minhas_reservas(self, req: Requisicao):
+        pag = _paginacao(req)
+        if pag:
+            return HTTPStatus.OK, pagina_json(self.c.paginar_minhas_reservas(req.usuario, *pag), self._reserva_json)
+        return HTTPStatus.OK, [self._reserva_json(r) for r in self.c.listar_minhas_reservas(req.usuario)]
+
+    # ---- reservas ----
+    def criar_reserva(self, req: Requisicao):
+        d = req.json()
+        r = self.c.cadastrar_reserva(req.usuario, _inteiro(_campo(d, "sala_id"), "sala_id"), _campo(d, "data"),
+                                     _campo(d, "hora_inicio"), _campo(d, "hora_fim"))
+        return HTTPStatus.CREATED, self._reserva_json(r)
+
+    def criar_reservas_em_lote(self, req: Requisicao):
+        d = req.json()
+        try:
+            pedidos = [PedidoReserva(int(p["sala_id"]), p["data"], p["hora_inicio"], p["hora_fim"], p.get("login"))
+                       for p in _campo(d, "pedidos")]
+        except (KeyError, TypeError, ValueError):
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, "Pedidos devem ter sala_id, data, hora_inicio e hora_fim.")
+        resultados = self.c.cadastrar_reservas_em_lote(req.usuario, pedidos, bool(d.get("tudo_ou_nada", False)))
+        return HTTPStatus.OK, [resultado_lote_json(res, self._reserva_json) for res in resultados]
+
+    def cancelar_reserva(self, req: Requisicao):
+        r = self.c.cancelar_reserva(int(req.params[0]), req.usuario)
+        return HTTPStatus.OK, self._reserva_json(r)
+
+    # o histórico é global (operações de todos os usuários): só o admin desfaz/refaz pela rede
+    def desfazer(self, req: Requisicao):
+        self.c._check_admin(req.usuario)
+        return HTTPStatus.OK, {"mensagem": self.c.desfazer()}
+
+    def refazer(self, req: Requisicao):
+        self.c._check_admin(req.usuario)
+        return HTTPStatus.OK, {"mensagem": self.c.refazer()}
+
+    # ---- admin ----
+    def admin_listar_salas(self, req: Requisicao):
+        pag = _paginacao(req)
+        if pag:
+            return HTTPStatus.OK, pagina_json(self.c.admin_paginar_salas(req.usuario, *pag), sala_json)
+        return HTTPStatus.OK, [sala_json(s) for s in self.c.admin_listar_salas(req.usuario)]
+
+    def admin_cadastrar_sala(self, req: Requisicao):
+        d = req.json()
+        recursos = d.get("recursos", [])
+        if not isinstance(recursos, list):
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, "'recursos' deve ser uma lista.")
+        s = self.c.admin_cadastrar_sala(req.usuario, str(_campo(d, "nome")),
+                                        _inteiro(_campo(d, "capacidade"), "capacidade"), [str(r) for r in recursos])
+        return HTTPStatus.CREATED, sala_json(s)
+
+    def admin_excluir_sala(self, req: Requisicao):
+        self.c.admin_excluir_sala(req.usuario, int(req.params[0]))
+        return HTTPStatus.NO_CONTENT, None
+
+    def admin_listar_usuarios(self, req: Requisicao):
+        pag = _paginacao(req)
+        if pag:
+            return HTTPStatus.OK, pagina_json(self.c.admin_paginar_usuarios(req.usuario, *pag), usuario_json)
+        return HTTPStatus.OK, [usuario_json(u) for u in self.c.admin_listar_usuarios(req.usuario)]
+
+    def admin_bloquear_usuario(self, req: Requisicao):
+        self.c.admin_bloquear_usuario(req.usuario, req.params[0])
+        return HTTPStatus.NO_CONTENT, None
+
+    def admin_excluir_usuario(self, req: Requisicao):
+        self.c.admin_excluir_usuario(req.usuario, req.params[0])
+        return HTTPStatus.NO_CONTENT, None
+
+    def admin_reservas_usuario(self, req: Requisicao):
+        pag = _paginacao(req)
+        if pag:
+            pagina = self.c.admin_paginar_reservas_usuario(req.usuario, req.params[0], *pag)
+            return HTTPStatus.OK, pagina_json(pagina, self._reserva_json)
+        return HTTPStatus.OK, [self._reserva_json(r) for r in self.c.admin_listar_reservas_usuario(req.usuario, req.params[0])]
+
+    def admin_reservas_periodo(self, req: Requisicao):
+        q = req.query
+        sala_id = _inteiro(q["sala_id"], "sala_id") if q.get("sala_id") else None
+        reservas = self.c.admin_listar_reservas_por_periodo(req.usuario, _campo(q, "inicio"), _campo(q, "fim"), sala_id)
+        return HTTPStatus.OK, [self._reserva_json(r) for r in reservas]
+
+    def admin_relatorio_uso(self, req: Requisicao):
+        periodo = req.query.get("periodo")
+        if periodo:
+            rel = self.c.admin_gerar_relatorio_uso_por_periodo(req.usuario, periodo)
+        else:
+            rel = self.c.admin_gerar_relatorio_uso(req.usuario)
+        return HTTPStatus.OK, rel
+
+    def admin_relatorio_analitico(self, req: Requisicao):
+        rel = self.c.admin_gerar_relatorio_analitico(req.usuario, _campo(req.query, "inicio"), _campo(req.query, "fim"))
+        return HTTPStatus.OK, rel
+
+    def admin_historico(self, req: Requisicao):
+        return HTTPStatus.OK, self.c.admin_estatisticas_historico(req.usuario)
+
+    def admin_metricas(self, req: Requisicao):
+        return HTTPStatus.OK, self.c.admin_metricas(req.usuario)
+
+    def admin_estrategia(self, req: Requisicao):
+        self.c._check_admin(req.usuario)
+        return HTTPStatus.OK, {"mensagem": self.c.definir_estrategia_conflito(str(_campo(req.json(), "modo")))}
+
+# ---------- Protocolo HTTP/1.1 ----------
+def _chaves_json(obj: Any) -> Any:
+    """JSON só aceita chaves string; sala_id (int) e tuplas viram texto."""
+    if isinstance(obj, dict):
+        return {(k if isinstance(k, str) else str(k)): _chaves_json(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_chaves_json(v) for v in obj]
+    return obj
+
+def montar_resposta(status: int, corpo: Any, manter: bool) -> bytes:
+    status = HTTPStatus(status)
+    dados = b"" if corpo is None else json.dumps(_chaves_json(corpo), ensure_ascii=False).encode("utf-8")
+    cabecalho = [f"HTTP/1.1 {status.value} {status.phrase}", f"Content-Length: {len(dados)}",
+                 "Connection: keep-alive" if manter else "Connection: close"]
+    if dados:
+        cabecalho.append("Content-Type: application/json; charset=utf-8")
+    return ("\r\n".join(cabecalho) + "\r\n\r\n").encode("latin-1") + dados
+
+async def ler_requisicao(reader: asyncio.StreamReader) -> Optional[Tuple[Requisicao, bool]]:
+    """Lê um pedido completo do stream; None quando o cliente fechou a conexão."""
+    try:
+        bruto = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise ErroHTTP(HTTPStatus.BAD_REQUEST, "Cabeçalho incompleto.")
+    except asyncio.LimitOverrunError:
+        raise ErroHTTP(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Cabeçalho grande demais.")
+    linhas = bruto.decode("latin-1").split("\r\n")
+    try:
+        metodo, alvo, versao = linhas[0].split(" ")
+    except ValueError:
+        raise ErroHTTP(HTTPStatus.BAD_REQUEST, "Linha de requisição inválida.")
+    cabecalhos: Dict[str, str] = {}
+    for linha in linhas[1:]:
+        if linha:
+            nome, _, valor = linha.partition(":")
+            cabecalhos[nome.strip().lower()] = valor.strip()
+    valor = cabecalhos.get("content-length", "") or "0"
+    if not (valor.isascii() and valor.isdigit()):
+        raise ErroHTTP(HTTPStatus.BAD_REQUEST, "Content-Length inválido.")
+    tamanho = int(valor)
+    if tamanho > LIMITE_CORPO:
+        raise ErroHTTP(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Corpo grande demais.")
+    corpo = await reader.readexactly(tamanho) if tamanho else b""
+    conexao = cabecalhos.get("connection", "").lower()
+    manter = conexao != "close" if versao == "HTTP/1.1" else conexao == "keep-alive"
+    return Requisicao(metodo.upper(), alvo, cabecalhos, corpo), manter
+
+class ServidorHTTP:
+    def __init__(self, controller: FacadeSingletonController, host: str = "127.0.0.1", porta: int = 8080,
+                 trabalhadores: int = 16, ocioso_s: float = 30.0):
+        self.servico = ServicoReservas(controller)
+        self.host, self.porta = host, porta
+        self.executor = ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix="http")
+        self.ocioso_s = ocioso_s
+        self._servidor: Optional[asyncio.AbstractServer] = None
+
+    async def _conexao(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    lido = await asyncio.wait_for(ler_requisicao(reader), self.ocioso_s)
+                except ErroHTTP as e:
+                    writer.write(montar_resposta(e.status, {"erro": str(e)}, False))
+                    break
+                if lido is None:
+                    break
+                req, manter = lido
+                try:
+                    status, corpo = await loop.run_in_executor(self.executor, self.servico.atender, req)
+                except Exception as e:   # erro inesperado não derruba a conexão dos outros pedidos
+                    status, corpo = HTTPStatus.INTERNAL_SERVER_ERROR, {"erro": f"{type(e).__name__}: {e}"}
+                writer.write(montar_resposta(status, corpo, manter))
+                await writer.drain()
+                if not manter:
+                    break
+        except (asyncio.TimeoutError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def iniciar(self) -> "ServidorHTTP":
+        self._servidor = await asyncio.start_server(self._conexao, self.host, self.porta, limit=LIMITE_CABECALHO)
+        self.porta = self._servidor.sockets[0].getsockname()[1]   # porta 0 -> efêmera escolhida pelo SO
+        return self
+
+    async def servir(self):
+        if self._servidor is None:
+            await self.iniciar()
+        async with self._servidor:
+            await self._servidor.serve_forever()
+
+    async def parar(self):
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        self.executor.shutdown(wait=False)
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Servidor HTTP/JSON do sistema de reservas.")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--porta", type=int, default=8080)
+    p.add_argument("--trabalhadores", type=int, default=16)
+    p.add_argument("--backend", default="ram", choices=["ram", "ram-journal", "sqlite"])
+    p.add_argument("--caminho", help="arquivo (sqlite) ou diretório (ram-journal)")
+    p.add_argument("--historico", default="delta", choices=["delta", "snapshot"])
+    p.add_argument("--metricas", help="liga a instrumentação e regrava este arquivo .prom a cada 15 s")
+    p.add_argument("--particoes", type=int, default=0, help="processos de reservas (salas por hash); 0 = um só")
+    a = p.parse_args(argv)
+    opcoes = {}
+    if a.caminho:
+        opcoes["caminho" if a.backend == "sqlite" else "diretorio"] = a.caminho
+    controller = FacadeSingletonController.get_instance(modo_historico=a.historico, backend=a.backend,
+                                                        backend_opcoes=opcoes, instrumentacao=bool(a.metricas),
+                                                        particoes=a.particoes)
+    if a.metricas:
+        EscritorPrometheus(controller.metricas, a.metricas).iniciar()
+    servidor = ServidorHTTP(controller, a.host, a.porta, a.trabalhadores)
+    print(f"Servindo em http://{a.host}:{a.porta}")
+    try:
+        asyncio.run(servidor.servir())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
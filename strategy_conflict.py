@@ -1,13 +1,18 @@
 # strategy_conflict.py
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import List
+from typing import List, Tuple
 from models import Reserva
 from exceptions import ConflitoDeReservaException
 
 class ConflictStrategy(ABC):
     """Interface da Strategy: diferentes políticas de detecção de conflito."""
+    margem: int = 0
+
+    def janela_busca(self, nova: Reserva) -> Tuple[int, int]:
+        """Intervalo [inicio, fim) em minutos onde uma reserva existente pode conflitar com a nova."""
+        return nova.inicio_min - self.margem, nova.fim_min + self.margem
+
     @abstractmethod
     def validar(self, nova: Reserva, reservas_existentes: List[Reserva]) -> None:
         ...
@@ -15,12 +20,8 @@ class ConflictStrategy(ABC):
 class StrictConflictStrategy(ConflictStrategy):
     """Não permite qualquer sobreposição entre [inicio, fim)."""
     def validar(self, nova: Reserva, reservas_existentes: List[Reserva]) -> None:
-        novo_ini = datetime.strptime(nova.hora_inicio, "%H:%M").time()
-        novo_fim = datetime.strptime(nova.hora_fim, "%H:%M").time()
         for r in reservas_existentes:
-            ini = datetime.strptime(r.hora_inicio, "%H:%M").time()
-            fim = datetime.strptime(r.hora_fim, "%H:%M").time()
-            if max(novo_ini, ini) < min(novo_fim, fim):
+            if max(nova.inicio_min, r.inicio_min) < min(nova.fim_min, r.fim_min):
                 raise ConflitoDeReservaException(
                     f"Conflito! Sala já reservada de {r.hora_inicio} a {r.hora_fim}."
                 )
@@ -34,15 +35,10 @@ class LenientConflictStrategy(ConflictStrategy):
         self.margem = margem_minutos
 
     def validar(self, nova: Reserva, reservas_existentes: List[Reserva]) -> None:
-        novo_ini_dt = datetime.strptime(nova.hora_inicio, "%H:%M")
-        novo_fim_dt = datetime.strptime(nova.hora_fim, "%H:%M")
         for r in reservas_existentes:
-            ini_dt = datetime.strptime(r.hora_inicio, "%H:%M")
-            fim_dt = datetime.strptime(r.hora_fim, "%H:%M")
-
             # Se a distância entre os intervalos for menor que a margem, considera conflito
-            dist_apos = (novo_ini_dt - fim_dt).total_seconds() / 60.0  # nova começa após fim existente
-            dist_antes = (ini_dt - novo_fim_dt).total_seconds() / 60.0  # existente começa após fim nova
+            dist_apos = nova.inicio_min - r.fim_min  # nova começa após fim existente
+            dist_antes = r.inicio_min - nova.fim_min  # existente começa após fim nova
             sobrepoe = not (dist_apos >= self.margem or dist_antes >= self.margem)
             if sobrepoe:
                 raise ConflitoDeReservaException(